@@ -0,0 +1,42 @@
+"""Add officials and the issue status change audit log
+
+Revision ID: 1621dd4c4243
+Revises: 238f23c0dc5c
+Create Date: 2026-10-19 17:10:32.604418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1621dd4c4243'
+down_revision: Union[str, Sequence[str], None] = '238f23c0dc5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('is_official', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_table('issue_status_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('issue_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', postgresql.ENUM('reported', 'pradhan_check', 'started_working', 'finished_work', name='issuestatus', create_type=False), nullable=False),
+    sa.Column('to_status', postgresql.ENUM('reported', 'pradhan_check', 'started_working', 'finished_work', name='issuestatus', create_type=False), nullable=False),
+    sa.Column('changed_by', sa.Integer(), nullable=True),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['changed_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_issue_status_changes_issue_id'), 'issue_status_changes', ['issue_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_issue_status_changes_issue_id'), table_name='issue_status_changes')
+    op.drop_table('issue_status_changes')
+    op.drop_column('users', 'is_official')
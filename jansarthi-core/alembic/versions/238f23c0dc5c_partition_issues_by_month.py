@@ -0,0 +1,143 @@
+"""Partition issues and issue photos by month, add archive tables
+
+Revision ID: 238f23c0dc5c
+Revises: b7e2c4d81a6f
+Create Date: 2026-10-19 16:02:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '238f23c0dc5c'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c4d81a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created up front, beyond the current month; the
+# issue-tables job keeps creating them after that
+MONTHS_AHEAD = 3
+
+
+def _partition(table: str) -> None:
+    """Recreate a table as range partitioned on created_at and copy its rows over"""
+    old = f"{table}_unpartitioned"
+    # Keep the id sequence when the old table is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+    # One partition per month from the oldest row to MONTHS_AHEAD out,
+    # plus a default partition for anything outside that range
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamp;
+        BEGIN
+            FOR month IN SELECT generate_series(
+                date_trunc('month', COALESCE((SELECT min(created_at) FROM {old}), now()) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months',
+                interval '1 month'
+            )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_' || to_char(month, '"y"YYYY"m"MM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    # The partition key has to be part of the primary key
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)")
+
+
+def _unpartition(table: str) -> None:
+    """Recreate a partitioned table as a plain one"""
+    old = f"{table}_partitioned"
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    # Drops the partitions with it
+    op.execute(f"DROP TABLE {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Foreign keys can't reference a partitioned table by id alone
+    op.drop_constraint('issue_photos_issue_id_fkey', 'issue_photos', type_='foreignkey')
+
+    _partition('issues')
+    op.create_index(op.f('ix_issues_issue_type'), 'issues', ['issue_type'], unique=False)
+    op.create_index(op.f('ix_issues_status'), 'issues', ['status'], unique=False)
+    op.create_index(op.f('ix_issues_user_id'), 'issues', ['user_id'], unique=False)
+    op.create_foreign_key('issues_user_id_fkey', 'issues', 'users', ['user_id'], ['id'])
+
+    _partition('issue_photos')
+    op.create_index(op.f('ix_issue_photos_issue_id'), 'issue_photos', ['issue_id'], unique=False)
+
+    op.create_table('issues_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('issue_type', postgresql.ENUM('water', 'electricity', 'road', 'garbage', name='issuetype', create_type=False), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('status', postgresql.ENUM('reported', 'pradhan_check', 'started_working', 'finished_work', name='issuestatus', create_type=False), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_issues_archive_created_at'), 'issues_archive', ['created_at'], unique=False)
+    op.create_index(op.f('ix_issues_archive_user_id'), 'issues_archive', ['user_id'], unique=False)
+    op.create_table('issue_photos_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('issue_id', sa.Integer(), nullable=False),
+    sa.Column('photo_url', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('filename', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['issue_id'], ['issues_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_issue_photos_archive_issue_id'), 'issue_photos_archive', ['issue_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _unpartition('issues')
+    op.create_index(op.f('ix_issues_issue_type'), 'issues', ['issue_type'], unique=False)
+    op.create_index(op.f('ix_issues_status'), 'issues', ['status'], unique=False)
+    op.create_index(op.f('ix_issues_user_id'), 'issues', ['user_id'], unique=False)
+    op.create_foreign_key('issues_user_id_fkey', 'issues', 'users', ['user_id'], ['id'])
+
+    _unpartition('issue_photos')
+    op.create_index(op.f('ix_issue_photos_issue_id'), 'issue_photos', ['issue_id'], unique=False)
+
+    # Move archived issues back into the live tables
+    op.execute("INSERT INTO issues SELECT id, issue_type, description, latitude, longitude, status, user_id, created_at, updated_at FROM issues_archive")
+    op.execute("INSERT INTO issue_photos SELECT id, issue_id, photo_url, filename, file_size, content_type, created_at FROM issue_photos_archive")
+    op.create_foreign_key('issue_photos_issue_id_fkey', 'issue_photos', 'issues', ['issue_id'], ['id'])
+
+    op.drop_index(op.f('ix_issue_photos_archive_issue_id'), table_name='issue_photos_archive')
+    op.drop_table('issue_photos_archive')
+    op.drop_index(op.f('ix_issues_archive_user_id'), table_name='issues_archive')
+    op.drop_index(op.f('ix_issues_archive_created_at'), table_name='issues_archive')
+    op.drop_table('issues_archive')
@@ -0,0 +1,40 @@
+"""Add issue event log
+
+Revision ID: ef39e2b384ba
+Revises: 1621dd4c4243
+Create Date: 2026-10-19 17:48:05.271936
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ef39e2b384ba'
+down_revision: Union[str, Sequence[str], None] = '1621dd4c4243'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('issue_events',
+    sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('issue_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.Enum('created', 'status_changed', 'archived', name='issueeventtype'), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index(op.f('ix_issue_events_issue_id'), 'issue_events', ['issue_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_issue_events_issue_id'), table_name='issue_events')
+    op.drop_table('issue_events')
+    sa.Enum(name='issueeventtype').drop(op.get_bind(), checkfirst=True)
@@ -1,19 +1,74 @@
-from sqlalchemy import create_engine
+import os
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.services.db_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
 from app.settings.config import get_settings
 
 settings = get_settings()
 
-# Create database engine
+
+def _pool_options(name: str) -> dict:
+    """Pool settings shared by every engine"""
+    return {
+        "echo": settings.debug,
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_logging_name": name,
+    }
+
+
+def make_async_engine(url, name: str) -> AsyncEngine:
+    """
+    Create an instrumented asyncpg engine
+
+    Args:
+        url: Database URL (postgresql+asyncpg)
+        name: Pool name used in metrics and logs
+
+    Returns:
+        AsyncEngine: The engine
+    """
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.db_statement_timeout_ms)
+        }
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=connect_args,
+        **_pool_options(name),
+    )
+    instrument_engine(name, engine.sync_engine, settings.slow_query_threshold_ms / 1000)
+    return engine
+
+
+# Create database engine (psycopg2). Used by Alembic, startup and
+# background jobs, which run outside the event loop.
 engine = create_engine(
     settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=InstrumentedQueuePool,
+    connect_args=(
+        {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+        if settings.db_statement_timeout_ms
+        else {}
+    ),
+    **_pool_options("sync"),
 )
+instrument_engine("sync", engine, settings.slow_query_threshold_ms / 1000)
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -23,16 +78,76 @@ SessionLocal = sessionmaker(
     class_=Session,
 )
 
+# Create async database engine (asyncpg) for request handlers
+async_engine = make_async_engine(settings.async_database_url, "primary")
+
+# Objects stay loaded after commit: lazy refreshes can't run implicitly
+# under asyncio
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def create_db_and_tables():
     """Create all database tables"""
     SQLModel.metadata.create_all(engine)
 
 
-def get_session():
-    """Dependency for getting database session"""
-    session = SessionLocal()
-    try:
+_ALEMBIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic"
+)
+
+# Revision the database was at when first checked; the schema doesn't
+# change under a running process, so it's read once
+_schema_revision: Optional[str] = None
+
+
+def get_schema_revision() -> Optional[str]:
+    """
+    Current Alembic revision of the database, read once and cached
+
+    Returns:
+        Optional[str]: The revision, or None if migrations have never run
+    """
+    global _schema_revision
+    if _schema_revision is None:
+        with engine.connect() as connection:
+            try:
+                _schema_revision = connection.scalar(
+                    text("SELECT version_num FROM alembic_version")
+                )
+            except Exception:
+                _schema_revision = None
+    return _schema_revision
+
+
+def check_schema_revision() -> str:
+    """
+    Fail fast unless the database is at the latest Alembic revision
+
+    Returns:
+        str: The current revision
+
+    Raises:
+        RuntimeError: If the database is missing migrations
+    """
+    # Only the migration scripts are read here, not the models
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory(_ALEMBIC_DIR).get_heads())
+    revision = get_schema_revision()
+    if revision not in heads:
+        raise RuntimeError(
+            f"Database schema is at revision {revision or '(none)'}, expected "
+            f"{', '.join(sorted(heads))}; run `alembic upgrade head` before starting"
+        )
+    return revision
+
+
+async def get_session():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        session.close()
@@ -1,11 +1,27 @@
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import create_db_and_tables
+from app.database import async_engine, check_schema_revision, create_db_and_tables
 from app.routes.auth import auth_router
+from app.routes.events import events_router
 from app.routes.reports import reports_router
+from app.services.archive import maintain_issue_tables
+from app.services.background import get_periodic_jobs
+from app.services.compression import CompressionMiddleware
+from app.services.db_metrics import RouteContextMiddleware
+from app.services.keys import get_key_ring
+from app.services.live_updates import get_live_updates
+from app.services.loop_monitor import get_loop_monitor
+from app.services.metrics import get_registry
+from app.services.notifications import flush_status_notifications, get_status_notifier
+from app.services.otp_store import purge_expired_otps
+from app.services.read_replicas import get_read_replicas
+from app.services.sms_queue import get_sms_dispatcher, purge_outbox
+from app.services.tokens import get_refresh_token_store, sync_refresh_token_store
 from app.settings.config import get_settings
 
 settings = get_settings()
@@ -14,13 +30,92 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
-    # Startup: Create database tables
-    print("Creating database tables...")
-    create_db_and_tables()
-    print("Database tables created successfully!")
+    # Startup: create tables in development; elsewhere the schema is owned
+    # by Alembic and only its revision is checked
+    if settings.startup_mode == "create":
+        print("Creating database tables...")
+        create_db_and_tables()
+        print("Database tables created successfully!")
+    else:
+        revision = check_schema_revision()
+        print(f"Database schema at revision {revision}")
+    
+    # Load revoked refresh token families before serving requests, after
+    # starting to follow the ones other workers revoke from now on
+    refresh_token_store = get_refresh_token_store()
+    await refresh_token_store.listen()
+    await asyncio.to_thread(sync_refresh_token_store)
+    
+    # Measure event loop lag and sample stalls
+    if settings.loop_monitor_enabled:
+        get_loop_monitor().start(app)
+    
+    # Health check read replicas before routing reads to them
+    read_replicas = get_read_replicas()
+    if read_replicas.enabled:
+        await read_replicas.check_health()
+    
+    # Start SMS workers
+    sms_dispatcher = get_sms_dispatcher()
+    await sms_dispatcher.start()
+    
+    periodic_jobs = get_periodic_jobs()
+    periodic_jobs.add(
+        "refresh-token-sync",
+        settings.refresh_token_sync_seconds,
+        sync_refresh_token_store,
+    )
+    periodic_jobs.add(
+        "refresh-token-listener",
+        settings.refresh_token_sync_seconds,
+        refresh_token_store.listen,
+    )
+    periodic_jobs.add(
+        "otp-purge",
+        settings.otp_purge_interval_seconds,
+        purge_expired_otps,
+    )
+    periodic_jobs.add(
+        "sms-outbox-recovery",
+        settings.sms_outbox_poll_seconds,
+        sms_dispatcher.recover_due_messages,
+    )
+    periodic_jobs.add("sms-outbox-purge", 3600, purge_outbox)
+    periodic_jobs.add(
+        "status-notifications",
+        settings.notification_flush_seconds,
+        flush_status_notifications,
+    )
+    periodic_jobs.add(
+        "issue-tables",
+        settings.archive_interval_seconds,
+        maintain_issue_tables,
+    )
+    if read_replicas.enabled:
+        periodic_jobs.add(
+            "replica-health",
+            settings.replica_health_check_seconds,
+            read_replicas.check_health,
+        )
+    periodic_jobs.start()
+    
+    # Follow the issue event log for live map subscribers
+    if settings.live_updates_enabled:
+        await get_live_updates().start()
     yield
     # Shutdown: Cleanup if needed
     print("Shutting down application...")
+    await periodic_jobs.stop()
+    await refresh_token_store.stop_listening()
+    if settings.live_updates_enabled:
+        await get_live_updates().stop()
+    if settings.loop_monitor_enabled:
+        await get_loop_monitor().stop()
+    # Queue pending digests to the outbox so they survive the restart
+    await get_status_notifier().flush(force=True)
+    await sms_dispatcher.stop()
+    await async_engine.dispose()
+    await read_replicas.dispose()
 
 
 # Create FastAPI application
@@ -40,9 +135,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Attribute slow queries to the route that ran them
+app.add_middleware(RouteContextMiddleware)
+
+# Compress large JSON responses for slow mobile links
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        content_types=settings.compression_content_types,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality if settings.brotli_quality >= 0 else None,
+    )
+
 # Include routers
 app.include_router(reports_router)
 app.include_router(auth_router)
+app.include_router(events_router)
 
 
 @app.get("/", tags=["Root"])
@@ -63,3 +172,16 @@ async def health_check():
         "app": settings.app_name,
         "version": settings.app_version,
     }
+
+
+@app.get("/.well-known/jwks.json", tags=["Authentication"])
+async def jwks(response: Response):
+    """Public keys for verifying access tokens (empty when signing with HS256)"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_ring().jwks()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Process metrics in the Prometheus text format"""
+    return PlainTextResponse(get_registry().render())
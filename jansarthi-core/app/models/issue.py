@@ -2,7 +2,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Enum as SQLAEnum, func
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Enum as SQLAEnum, Index, Integer, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -24,10 +25,36 @@ class IssueStatus(str, Enum):
     FINISHED_WORK = "finished_work"
 
 
+class IssueEventType(str, Enum):
+    """Enum for issue event log entries"""
+
+    CREATED = "created"
+    STATUS_CHANGED = "status_changed"
+    ARCHIVED = "archived"
+
+
+class MessageStatus(str, Enum):
+    """Enum for outbound message delivery status"""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class Issue(SQLModel, table=True):
-    """Main issue/report model"""
+    """
+    Main issue/report model
+
+    In Postgres the table is partitioned by month on created_at, so its
+    primary key there is (id, created_at); ids still come from one
+    sequence and stay unique.
+    """
 
     __tablename__ = "issues"
+    __table_args__ = (
+        # A user's issues, and delta sync of those changed since a time
+        Index("ix_issues_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     issue_type: IssueType = Field(
@@ -55,7 +82,7 @@ class Issue(SQLModel, table=True):
     )
 
     # User ID (for future auth implementation)
-    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=True)
+    user_id: Optional[int] = Field(default=None, foreign_key="users.id")
 
     # Timestamps
     created_at: datetime = Field(
@@ -79,7 +106,13 @@ class Issue(SQLModel, table=True):
 
 
 class IssuePhoto(SQLModel, table=True):
-    """Model for issue photos"""
+    """
+    Model for issue photos
+
+    Partitioned by month on created_at like issues. Partitioned tables
+    can't be referenced by foreign keys, so issue_id isn't enforced by
+    Postgres there.
+    """
 
     __tablename__ = "issue_photos"
 
@@ -107,6 +140,74 @@ class IssuePhoto(SQLModel, table=True):
     issue: Optional[Issue] = Relationship(back_populates="photos")
 
 
+class ArchivedIssue(SQLModel, table=True):
+    """Finished issues moved out of the live table by the archive job"""
+
+    __tablename__ = "issues_archive"
+
+    # Keeps the id it had in the live table
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    issue_type: IssueType = Field(
+        sa_column=Column(
+            SQLAEnum(IssueType, values_callable=lambda x: [e.value for e in x]),
+            nullable=False
+        )
+    )
+    description: str = Field(max_length=2000)
+
+    # Location data
+    latitude: float
+    longitude: float
+
+    # Status
+    status: IssueStatus = Field(
+        sa_column=Column(
+            SQLAEnum(IssueStatus, values_callable=lambda x: [e.value for e in x]),
+            nullable=False
+        )
+    )
+
+    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=True)
+
+    # Timestamps, as they were in the live table
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    # Relationships
+    photos: list["ArchivedIssuePhoto"] = Relationship(
+        back_populates="issue", cascade_delete=True
+    )
+
+
+class ArchivedIssuePhoto(SQLModel, table=True):
+    """Photos of archived issues"""
+
+    __tablename__ = "issue_photos_archive"
+
+    # Keeps the id it had in the live table
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    issue_id: int = Field(foreign_key="issues_archive.id", index=True)
+
+    # MinIO/S3 path
+    photo_url: str = Field(max_length=500)
+    filename: str = Field(max_length=255)
+
+    # File metadata
+    file_size: int
+    content_type: str
+
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    # Relationships
+    issue: Optional[ArchivedIssue] = Relationship(back_populates="photos")
+
+
 class User(SQLModel, table=True):
     """User model for authentication"""
 
@@ -120,6 +221,9 @@ class User(SQLModel, table=True):
     is_active: bool = Field(default=True)
     is_verified: bool = Field(default=False)
 
+    # Officials can move issues through the status workflow
+    is_official: bool = Field(default=False)
+
     # Timestamps
     created_at: datetime = Field(
         sa_column=Column(
@@ -136,13 +240,87 @@ class User(SQLModel, table=True):
     )
 
 
+class IssueStatusChange(SQLModel, table=True):
+    """Audit log of issue status changes made by officials"""
+
+    __tablename__ = "issue_status_changes"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Not a foreign key: issues is partitioned (see Issue)
+    issue_id: int = Field(index=True)
+
+    from_status: IssueStatus = Field(
+        sa_column=Column(
+            SQLAEnum(IssueStatus, values_callable=lambda x: [e.value for e in x]),
+            nullable=False
+        )
+    )
+    to_status: IssueStatus = Field(
+        sa_column=Column(
+            SQLAEnum(IssueStatus, values_callable=lambda x: [e.value for e in x]),
+            nullable=False
+        )
+    )
+    changed_by: Optional[int] = Field(default=None, foreign_key="users.id")
+
+    # Timestamps
+    changed_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=False
+        )
+    )
+
+
+class IssueEvent(SQLModel, table=True):
+    """
+    Append-only log of changes to issues, read by the change feed
+
+    Events are written in the transaction that makes the change, and
+    their seq numbers become visible in order (see issue_events service),
+    so consumers can resume from the last seq they saw.
+    """
+
+    __tablename__ = "issue_events"
+
+    seq: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+        ),
+    )
+    issue_id: int = Field(index=True)
+    event_type: IssueEventType = Field(
+        sa_column=Column(
+            SQLAEnum(IssueEventType, values_callable=lambda x: [e.value for e in x]),
+            nullable=False
+        )
+    )
+    # User who made the change; None for background jobs
+    actor_id: Optional[int] = Field(default=None)
+    data: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+    )
+
+    # Timestamps
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=False
+        )
+    )
+
+
 class OTP(SQLModel, table=True):
     """OTP model for phone verification"""
     
     __tablename__ = "otps"
+    __table_args__ = (
+        # Active OTP lookup: latest unused code for a number
+        Index("ix_otps_mobile_number_is_used_created_at", "mobile_number", "is_used", "created_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    mobile_number: str = Field(index=True, max_length=15)
+    mobile_number: str = Field(max_length=15)
     otp_code: str = Field(max_length=6)
     
     # OTP metadata
@@ -151,7 +329,7 @@ class OTP(SQLModel, table=True):
     
     # Timestamps
     expires_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), nullable=False)
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
     )
     created_at: datetime = Field(
         sa_column=Column(
@@ -161,3 +339,75 @@ class OTP(SQLModel, table=True):
     used_at: Optional[datetime] = Field(
         sa_column=Column(DateTime(timezone=True), nullable=True)
     )
+
+
+class RefreshToken(SQLModel, table=True):
+    """Issued refresh tokens, grouped into rotation families"""
+
+    __tablename__ = "refresh_tokens"
+
+    # Token ID (the "jti" claim)
+    jti: str = Field(primary_key=True, max_length=36)
+
+    # All tokens rotated from the same login share a family
+    family_id: str = Field(index=True, max_length=36)
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    # Timestamps
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=False
+        )
+    )
+    # Set when the token is exchanged for a new one
+    used_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    # Set on every token of the family when it is revoked
+    revoked_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class OutboundMessage(SQLModel, table=True):
+    """Outbox of SMS messages, persisted before they are handed to the provider"""
+
+    __tablename__ = "outbound_messages"
+    __table_args__ = (
+        # Pickup of due messages by the outbox poller
+        Index("ix_outbound_messages_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    to_number: str = Field(max_length=15)
+    body: str = Field(max_length=1600)
+    kind: str = Field(max_length=20)  # "otp", "welcome", ...
+
+    # Delivery state
+    status: MessageStatus = Field(
+        default=MessageStatus.PENDING,
+        sa_column=Column(
+            SQLAEnum(MessageStatus, values_callable=lambda x: [e.value for e in x]),
+            nullable=False,
+            default=MessageStatus.PENDING
+        )
+    )
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None, max_length=500)
+    provider_message_id: Optional[str] = Field(default=None, max_length=64)
+
+    # Timestamps
+    next_attempt_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=False
+        )
+    )
+    sent_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
@@ -1,10 +1,11 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
-from app.models.issue import OTP, User
+from app.models.issue import User
 from app.schemas.auth import (
     LoginRequest,
     OTPResponse,
@@ -15,7 +16,12 @@ from app.schemas.auth import (
     VerifyOTPRequest,
 )
 from app.services.auth import AuthService, get_current_user
-from app.services.twilio import get_twilio_service, normalize_phone_number
+from app.services.otp_store import get_otp_store
+from app.services.rate_limit import enforce_otp_send_limit, enforce_otp_verify_limit
+from app.services.sms_queue import get_sms_dispatcher
+from app.services.tokens import get_refresh_token_store
+from app.services.twilio import generate_otp, normalize_phone_number
+from app.services.user_cache import CachedUser, get_user_cache
 from app.settings.config import get_settings
 
 settings = get_settings()
@@ -30,7 +36,8 @@ auth_router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 )
 async def signup(
     signup_data: SignupRequest,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Register a new user and send OTP for verification
@@ -43,10 +50,14 @@ async def signup(
     # Normalize phone number to E.164 format
     normalized_number = normalize_phone_number(signup_data.mobile_number)
     
+    # Throttle per mobile number and client IP
+    await enforce_otp_send_limit(request, normalized_number)
+    
     # Check if user already exists
-    existing_user = session.exec(
+    result = await session.exec(
         select(User).where(User.mobile_number == normalized_number)
-    ).first()
+    )
+    existing_user = result.first()
     
     if existing_user:
         raise HTTPException(
@@ -63,27 +74,18 @@ async def signup(
     )
     
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     
     # Generate and send OTP
-    twilio_service = get_twilio_service()
-    otp_code = twilio_service.generate_otp()
-    
-    # Save OTP to database
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.otp_expiry_minutes)
-    otp_record = OTP(
-        mobile_number=normalized_number,
-        otp_code=otp_code,
-        expires_at=expires_at,
-        is_used=False
-    )
+    otp_code = generate_otp()
     
-    session.add(otp_record)
-    session.commit()
+    # Save OTP (replaces any previous unused code)
+    await get_otp_store().issue(session, normalized_number, otp_code)
+    await session.commit()
     
-    # Send OTP via SMS (twilio service will normalize again, but that's ok)
-    sms_sent = twilio_service.send_otp(normalized_number, otp_code)
+    # Send OTP via the SMS queue (waits up to the OTP latency budget)
+    sms_sent = await get_sms_dispatcher().send_otp(normalized_number, otp_code)
     
     if not sms_sent:
         raise HTTPException(
@@ -105,7 +107,8 @@ async def signup(
 )
 async def login(
     login_data: LoginRequest,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Login with mobile number and receive OTP
@@ -117,10 +120,14 @@ async def login(
     # Normalize phone number to E.164 format
     normalized_number = normalize_phone_number(login_data.mobile_number)
     
+    # Throttle per mobile number and client IP
+    await enforce_otp_send_limit(request, normalized_number)
+    
     # Check if user exists
-    user = session.exec(
+    result = await session.exec(
         select(User).where(User.mobile_number == normalized_number)
-    ).first()
+    )
+    user = result.first()
     
     if not user:
         raise HTTPException(
@@ -135,23 +142,14 @@ async def login(
         )
     
     # Generate and send OTP
-    twilio_service = get_twilio_service()
-    otp_code = twilio_service.generate_otp()
+    otp_code = generate_otp()
     
-    # Save OTP to database
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.otp_expiry_minutes)
-    otp_record = OTP(
-        mobile_number=normalized_number,
-        otp_code=otp_code,
-        expires_at=expires_at,
-        is_used=False
-    )
+    # Save OTP (replaces any previous unused code)
+    await get_otp_store().issue(session, normalized_number, otp_code)
+    await session.commit()
     
-    session.add(otp_record)
-    session.commit()
-    
-    # Send OTP via SMS
-    sms_sent = twilio_service.send_otp(normalized_number, otp_code)
+    # Send OTP via the SMS queue (waits up to the OTP latency budget)
+    sms_sent = await get_sms_dispatcher().send_otp(normalized_number, otp_code)
     
     if not sms_sent:
         raise HTTPException(
@@ -173,7 +171,8 @@ async def login(
 )
 async def verify_otp(
     verify_data: VerifyOTPRequest,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Verify OTP and receive JWT access and refresh tokens
@@ -186,10 +185,14 @@ async def verify_otp(
     # Normalize phone number to E.164 format
     normalized_number = normalize_phone_number(verify_data.mobile_number)
     
+    # Throttle per mobile number and client IP
+    await enforce_otp_verify_limit(request, normalized_number)
+    
     # Get user
-    user = session.exec(
+    result = await session.exec(
         select(User).where(User.mobile_number == normalized_number)
-    ).first()
+    )
+    user = result.first()
     
     if not user:
         raise HTTPException(
@@ -197,13 +200,9 @@ async def verify_otp(
             detail="User not found"
         )
     
-    # Get the latest unused OTP for this number
-    otp_record = session.exec(
-        select(OTP)
-        .where(OTP.mobile_number == normalized_number)
-        .where(OTP.is_used == False)
-        .order_by(OTP.created_at.desc())
-    ).first()
+    # Get the active OTP for this number
+    otp_store = get_otp_store()
+    otp_record = await otp_store.get_active(session, normalized_number)
     
     if not otp_record:
         raise HTTPException(
@@ -227,9 +226,8 @@ async def verify_otp(
     
     # Verify OTP
     if otp_record.otp_code != verify_data.otp_code:
-        otp_record.attempt_count += 1
-        session.add(otp_record)
-        session.commit()
+        await otp_store.record_failed_attempt(session, otp_record)
+        await session.commit()
         
         remaining_attempts = 3 - otp_record.attempt_count
         raise HTTPException(
@@ -238,24 +236,25 @@ async def verify_otp(
         )
     
     # Mark OTP as used
-    otp_record.is_used = True
-    otp_record.used_at = datetime.now(timezone.utc)
+    await otp_store.mark_used(session, otp_record)
     
     # Mark user as verified if first time
-    if not user.is_verified:
+    is_new_user = not user.is_verified
+    if is_new_user:
         user.is_verified = True
-        
-        # Send welcome message
-        twilio_service = get_twilio_service()
-        twilio_service.send_welcome_message(user.mobile_number, user.name)
     
-    session.add(otp_record)
     session.add(user)
-    session.commit()
-    session.refresh(user)
     
-    # Generate JWT tokens
-    tokens = AuthService.create_token_pair(user.id, user.mobile_number)
+    # Generate JWT tokens (the refresh token is recorded in the same commit)
+    tokens = AuthService.create_token_pair(session, user.id, user.mobile_number)
+    
+    await session.commit()
+    await session.refresh(user)
+    get_user_cache().invalidate(user.id)
+    
+    # Send welcome message in the background
+    if is_new_user:
+        await get_sms_dispatcher().send_welcome_message(user.mobile_number, user.name)
     
     return TokenResponse(
         access_token=tokens["access_token"],
@@ -273,7 +272,7 @@ async def verify_otp(
 )
 async def refresh_token(
     refresh_data: RefreshTokenRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Refresh access token using refresh token
@@ -285,8 +284,16 @@ async def refresh_token(
     # Verify refresh token
     token_data = AuthService.verify_token(refresh_data.refresh_token, token_type="refresh")
     
+    # Tokens issued before rotation was introduced can't be tracked
+    if not token_data.jti:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token is no longer supported. Please login again.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     # Get user
-    user = session.get(User, token_data.user_id)
+    user = await session.get(User, token_data.user_id)
     
     if not user:
         raise HTTPException(
@@ -300,8 +307,15 @@ async def refresh_token(
             detail="User account is inactive"
         )
     
+    # Rotate: mark the presented token used and continue its family
+    refresh_token_store = get_refresh_token_store()
+    family_id = await refresh_token_store.rotate(session, token_data.jti, user.id)
+    
     # Generate new token pair
-    tokens = AuthService.create_token_pair(user.id, user.mobile_number)
+    tokens = AuthService.create_token_pair(
+        session, user.id, user.mobile_number, family_id
+    )
+    await session.commit()
     
     return TokenResponse(
         access_token=tokens["access_token"],
@@ -312,20 +326,58 @@ async def refresh_token(
     )
 
 
+@auth_router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Logout and revoke refresh token",
+)
+async def logout(
+    refresh_data: RefreshTokenRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Revoke a refresh token together with every token rotated from it
+    
+    - **refresh_token**: Refresh token of the session to end
+    
+    Access tokens issued in the same session stop working as well. All
+    API workers are notified when the logout commits; a worker that has
+    lost its notification connection picks the revocation up within
+    `REFRESH_TOKEN_SYNC_SECONDS` (30 s by default) and accepts those
+    access tokens until then.
+    """
+    token_data = AuthService.verify_token(refresh_data.refresh_token, token_type="refresh")
+    
+    if token_data.family_id:
+        await get_refresh_token_store().revoke_family(session, token_data.family_id)
+        await session.commit()
+
+
 @auth_router.get(
     "/me",
     response_model=UserResponse,
     summary="Get current user profile",
 )
 async def get_me(
-    current_user: User = Depends(get_current_user),
+    current_user: CachedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get current authenticated user's profile
     
     Requires valid access token in Authorization header.
     """
-    return current_user
+    # The auth cache only holds the fields needed for access checks,
+    # so load the full profile row here
+    user = await session.get(User, current_user.id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
 
 
 @auth_router.post(
@@ -335,7 +387,8 @@ async def get_me(
 )
 async def resend_otp(
     mobile_data: LoginRequest,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Resend OTP to mobile number
@@ -347,10 +400,14 @@ async def resend_otp(
     # Normalize phone number to E.164 format
     normalized_number = normalize_phone_number(mobile_data.mobile_number)
     
+    # Throttle per mobile number and client IP
+    await enforce_otp_send_limit(request, normalized_number)
+    
     # Check if user exists
-    user = session.exec(
+    result = await session.exec(
         select(User).where(User.mobile_number == normalized_number)
-    ).first()
+    )
+    user = result.first()
     
     if not user:
         raise HTTPException(
@@ -359,23 +416,14 @@ async def resend_otp(
         )
     
     # Generate and send new OTP
-    twilio_service = get_twilio_service()
-    otp_code = twilio_service.generate_otp()
-    
-    # Save OTP to database
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.otp_expiry_minutes)
-    otp_record = OTP(
-        mobile_number=normalized_number,
-        otp_code=otp_code,
-        expires_at=expires_at,
-        is_used=False
-    )
+    otp_code = generate_otp()
     
-    session.add(otp_record)
-    session.commit()
+    # Save OTP (replaces any previous unused code)
+    await get_otp_store().issue(session, normalized_number, otp_code)
+    await session.commit()
     
-    # Send OTP via SMS
-    sms_sent = twilio_service.send_otp(normalized_number, otp_code)
+    # Send OTP via the SMS queue (waits up to the OTP latency budget)
+    sms_sent = await get_sms_dispatcher().send_otp(normalized_number, otp_code)
     
     if not sms_sent:
         raise HTTPException(
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas.issue import IssueEventFeedResponse
+from app.services.auth import get_current_official
+from app.services.issue_events import read_events
+from app.services.read_replicas import get_read_session
+from app.services.user_cache import CachedUser
+
+events_router = APIRouter(prefix="/api/events", tags=["Events"])
+
+# How often a waiting request checks for new events
+POLL_INTERVAL_SECONDS = 1.0
+
+
+@events_router.get(
+    "/issues",
+    response_model=IssueEventFeedResponse,
+    summary="Issue change feed",
+)
+async def get_issue_events(
+    after: int = Query(0, ge=0, description="Return events with a seq greater than this"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum events to return"),
+    issue_id: Optional[int] = Query(None, description="Only events of this issue"),
+    wait: float = Query(
+        0, ge=0, le=30, description="Seconds to wait for new events if there are none"
+    ),
+    current_user: CachedUser = Depends(get_current_official),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Read the issue event log incrementally.
+
+    **Authentication Required**: Officials only.
+
+    - **after**: The `next_after` of the previous page (0 to start from the beginning)
+    - **limit**: Page size (default: 500, max: 5000)
+    - **issue_id**: Only events of one issue
+    - **wait**: Long poll; hold the request until an event arrives or the time is up
+
+    Events come in seq order and a seq is never skipped once a later one
+    has been returned, so consumers can store `next_after` and resume
+    from it.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        events = await read_events(session, after, limit + 1, issue_id)
+        if events or time.monotonic() >= deadline:
+            break
+        # Don't hold a pooled connection while waiting
+        await session.close()
+        await asyncio.sleep(min(POLL_INTERVAL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+    has_more = len(events) > limit
+    events = events[:limit]
+    return IssueEventFeedResponse(
+        events=events,
+        next_after=events[-1].seq if events else after,
+        has_more=has_more,
+    )
@@ -1,4 +1,6 @@
+import asyncio
 import math
+from datetime import datetime
 from typing import Optional
 
 from fastapi import (
@@ -8,30 +10,98 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
     UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
     status,
 )
-from sqlmodel import Session, select
+from pydantic import ValidationError
+from sqlalchemy.orm import selectinload
+from sqlmodel import func, select, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
-from app.models.issue import Issue, IssuePhoto, IssueStatus, IssueType, User
+from app.models.issue import (
+    ArchivedIssue,
+    Issue,
+    IssueEventType,
+    IssuePhoto,
+    IssueStatus,
+    IssueType,
+)
 from app.schemas.issue import (
+    IssueBulkStatusResponse,
+    IssueBulkStatusUpdate,
     IssueCreate,
     IssueListResponse,
     IssueMapResponse,
     IssueResponse,
+    IssueStatusRejection,
     IssueStatusUpdate,
+    IssueSyncResponse,
     IssueUpdate,
+    LiveSubscriptionRequest,
     PhotoUploadResponse,
 )
-from app.services.auth import get_current_active_user, get_optional_user
+from app.services.archive import fetch_issue_page, get_issue_archive
+from app.services.auth import (
+    get_current_active_user,
+    get_current_official,
+    get_optional_user,
+)
+from app.services.issue_events import append_events
+from app.services.issue_fields import (
+    IssueProjection,
+    issue_projection,
+    select_issue_rows,
+    sign_photo_urls,
+)
+from app.services.issue_status import NOT_FOUND, update_issue_statuses
+from app.services.issue_sync import SyncToken, sync_issues
+from app.services.live_updates import (
+    BoundingBox,
+    Subscription,
+    get_live_updates,
+    send_updates,
+)
+from app.services.read_replicas import get_read_replicas, get_read_session
+from app.services.serialization import (
+    MAP_COLUMNAR_MEDIA_TYPE,
+    FastJSONResponse,
+    columnar_map,
+    issue_rows,
+    map_issue_rows,
+    wants_columnar_map,
+)
 from app.services.storage import get_storage_service
+from app.services.user_cache import CachedUser
 from app.settings.config import get_settings
 
 settings = get_settings()
 reports_router = APIRouter(prefix="/api/reports", tags=["Reports"])
 
 
+def issue_filters(
+    model,
+    issue_type: Optional[IssueType],
+    status_filter: Optional[IssueStatus],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+) -> list:
+    """Query conditions for the listing filters, on Issue or ArchivedIssue"""
+    conditions = []
+    if issue_type:
+        conditions.append(model.issue_type == issue_type)
+    if status_filter:
+        conditions.append(model.status == status_filter)
+    if created_after:
+        conditions.append(model.created_at >= created_after)
+    if created_before:
+        conditions.append(model.created_at < created_before)
+    return conditions
+
+
 @reports_router.post(
     "",
     response_model=IssueResponse,
@@ -44,8 +114,8 @@ async def create_issue(
     latitude: float = Form(..., ge=-90, le=90),
     longitude: float = Form(..., ge=-180, le=180),
     photos: list[UploadFile] = File(default=[]),
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session),
+    current_user: CachedUser = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Create a new issue report with photos.
@@ -98,8 +168,20 @@ async def create_issue(
     )
 
     session.add(new_issue)
-    session.commit()
-    session.refresh(new_issue)
+    await session.flush()
+    await append_events(session, [{
+        "issue_id": new_issue.id,
+        "event_type": IssueEventType.CREATED,
+        "actor_id": current_user.id,
+        "data": {
+            "issue_type": issue_type.value,
+            "status": IssueStatus.REPORTED.value,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    }])
+    await session.commit()
+    await session.refresh(new_issue)
 
     # Upload photos and create photo records
     for photo in photos:
@@ -107,8 +189,9 @@ async def create_issue(
             # Read file content
             content = await photo.read()
 
-            # Upload to MinIO
-            object_name = storage_service.upload_file(
+            # Upload to MinIO (blocking client, keep it off the event loop)
+            object_name = await asyncio.to_thread(
+                storage_service.upload_file,
                 file_data=content,
                 filename=photo.filename or "image.jpg",
                 content_type=photo.content_type or "image/jpeg",
@@ -126,14 +209,17 @@ async def create_issue(
 
         except Exception as e:
             # Rollback on error
-            session.rollback()
+            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to upload photo: {str(e)}",
             )
 
-    session.commit()
-    session.refresh(new_issue)
+    await session.commit()
+    # Let the reporter read the new issue back before replicas catch up
+    await get_read_replicas().pin_to_primary(current_user.id)
+    # Photos can't be lazy loaded under asyncio, refresh them explicitly
+    await session.refresh(new_issue, attribute_names=["photos"])
 
     # Generate presigned URLs for photos
     for photo in new_issue.photos:
@@ -154,8 +240,15 @@ async def get_issues(
     status_filter: Optional[IssueStatus] = Query(
         None, alias="status", description="Filter by status"
     ),
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session),
+    created_after: Optional[datetime] = Query(
+        None, description="Only issues created at or after this time"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only issues created before this time"
+    ),
+    projection: IssueProjection = Depends(issue_projection),
+    current_user: CachedUser = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get a paginated list of the current user's issue reports.
@@ -166,47 +259,62 @@ async def get_issues(
     - **page_size**: Number of items per page (default: 10, max: 100)
     - **issue_type**: Filter by specific issue type
     - **status**: Filter by issue status
+    - **created_after** / **created_before**: Filter by creation time;
+      finished issues that have been archived are only included when
+      these reach back past the archive cutoff
+    - **fields**: Only these issue fields, e.g. `id,issue_type,status`;
+      only those columns are read
+    - **include**: `photos` to embed photos with signed URLs; without
+      `fields` they are included by default, with it they are neither
+      loaded nor signed unless asked for
     
     Only returns issues created by the authenticated user.
     """
-    # Build query - filter by current user
-    query = select(Issue).where(Issue.user_id == current_user.id)
-
-    # Apply additional filters
-    if issue_type:
-        query = query.where(Issue.issue_type == issue_type)
-    if status_filter:
-        query = query.where(Issue.status == status_filter)
-
-    # Count total items - filter by current user
-    count_query = select(Issue).where(Issue.user_id == current_user.id)
-    if issue_type:
-        count_query = count_query.where(Issue.issue_type == issue_type)
-    if status_filter:
-        count_query = count_query.where(Issue.status == status_filter)
-
-    total = len(session.exec(count_query).all())
-
-    # Apply pagination
+    # Filter by current user
+    conditions = [
+        Issue.user_id == current_user.id,
+        *issue_filters(Issue, issue_type, status_filter, created_after, created_before),
+    ]
     offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(Issue.created_at.desc())
 
-    issues = session.exec(query).all()
+    if get_issue_archive().includes_archive(created_after, created_before, status_filter):
+        archived_conditions = [
+            ArchivedIssue.user_id == current_user.id,
+            *issue_filters(
+                ArchivedIssue, issue_type, status_filter, created_after, created_before
+            ),
+        ]
+        issues, total = await fetch_issue_page(
+            session, conditions, archived_conditions, offset, page_size, projection
+        )
+    else:
+        count_query = select(func.count()).select_from(Issue).where(*conditions)
+        total = (await session.exec(count_query)).one()
+
+        issues = await select_issue_rows(
+            session,
+            Issue,
+            projection,
+            conditions,
+            order_by=(Issue.created_at.desc(),),
+            offset=offset,
+            limit=page_size,
+        )
 
     # Generate presigned URLs for photos
-    storage_service = get_storage_service()
-    for issue in issues:
-        for photo in issue.photos:
-            photo.photo_url = storage_service.get_file_url(photo.photo_url)
+    if projection.photos:
+        sign_photo_urls(issues, get_storage_service())
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
-    return IssueListResponse(
-        items=issues,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
+    return FastJSONResponse(
+        {
+            "items": issues,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+        }
     )
 
 
@@ -214,8 +322,15 @@ async def get_issues(
     "/map",
     response_model=list[IssueMapResponse],
     summary="Get issues for map view",
+    responses={
+        200: {
+            "content": {MAP_COLUMNAR_MEDIA_TYPE: {}},
+            "description": "Issues as objects, or as columns if requested",
+        }
+    },
 )
 async def get_issues_for_map(
+    request: Request,
     latitude: float = Query(..., ge=-90, le=90, description="Center latitude"),
     longitude: float = Query(..., ge=-180, le=180, description="Center longitude"),
     radius: float = Query(
@@ -225,7 +340,13 @@ async def get_issues_for_map(
     status_filter: Optional[IssueStatus] = Query(
         None, alias="status", description="Filter by status"
     ),
-    session: Session = Depends(get_session),
+    created_after: Optional[datetime] = Query(
+        None, description="Only issues created at or after this time"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only issues created before this time"
+    ),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get issues near a location for map display (optimized response).
@@ -235,21 +356,49 @@ async def get_issues_for_map(
     - **radius**: Search radius in kilometers (default: 10km, max: 100km)
     - **issue_type**: Filter by specific issue type
     - **status**: Filter by issue status
-
-    Returns minimal data for performance.
+    - **created_after** / **created_before**: Filter by creation time;
+      archived issues are only included when these reach back past the
+      archive cutoff
+
+    Returns minimal data for performance. Send
+    `Accept: application/vnd.jansarthi.map+json` for a smaller columnar
+    payload:
+
+        {"count": 2, "precision": 6,
+         "issue_types": ["water", ...], "statuses": ["reported", ...],
+         "id": [101, 3], "issue_type": [0, 2], "status": [0, 0],
+         "latitude": [28612345, -1250], "longitude": [77208910, 3300]}
+
+    Issues are sorted by id. `id`, `latitude` and `longitude` are deltas
+    from the previous issue (the first from 0); add them up as you go,
+    and divide coordinates by 10^precision. `issue_type` and `status` are
+    indexes into `issue_types` and `statuses`.
     """
     # Build query
-    query = select(Issue)
-
-    # Apply filters
-    if issue_type:
-        query = query.where(Issue.issue_type == issue_type)
-    if status_filter:
-        query = query.where(Issue.status == status_filter)
+    query = select(
+        Issue.id, Issue.issue_type, Issue.latitude, Issue.longitude, Issue.status
+    ).where(
+        *issue_filters(Issue, issue_type, status_filter, created_after, created_before)
+    )
+    if get_issue_archive().includes_archive(created_after, created_before, status_filter):
+        query = union_all(
+            query,
+            select(
+                ArchivedIssue.id,
+                ArchivedIssue.issue_type,
+                ArchivedIssue.latitude,
+                ArchivedIssue.longitude,
+                ArchivedIssue.status,
+            ).where(
+                *issue_filters(
+                    ArchivedIssue, issue_type, status_filter, created_after, created_before
+                )
+            ),
+        )
 
     # Get all issues (we'll filter by distance in Python for simplicity)
     # For production, use PostGIS for efficient geospatial queries
-    all_issues = session.exec(query).all()
+    all_issues = (await session.exec(query)).all()
 
     # Filter by distance using Haversine formula
     def haversine_distance(lat1, lon1, lat2, lon2):
@@ -274,7 +423,58 @@ async def get_issues_for_map(
         <= radius
     ]
 
-    return nearby_issues
+    if wants_columnar_map(request.headers.get("accept")):
+        return FastJSONResponse(
+            columnar_map(nearby_issues),
+            media_type=MAP_COLUMNAR_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+    return FastJSONResponse(map_issue_rows(nearby_issues), headers={"Vary": "Accept"})
+
+
+@reports_router.get(
+    "/sync",
+    response_model=IssueSyncResponse,
+    summary="Get the current user's issues changed since the last sync",
+)
+async def sync_user_issues(
+    sync_token: Optional[str] = Query(
+        None, description="Token from the previous response; omit for a full sync"
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Maximum issues to return"),
+    current_user: CachedUser = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Incrementally sync the current user's issue reports.
+
+    **Authentication Required**: Must provide valid access token.
+
+    - **sync_token**: The `sync_token` of the previous response
+    - **limit**: Page size (default: 100, max: 500)
+
+    Without a token all of the user's issues are returned. With one, only
+    issues created or changed since it was issued, plus the ids of issues
+    to remove (finished issues moved to the archive). While `has_more` is
+    true, request again with the new token straight away; otherwise store
+    it for the next sync. Apply items by id: a change made just before a
+    sync may be sent again by the next one.
+    """
+    try:
+        token = SyncToken.decode(sync_token) if sync_token else SyncToken()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    page = await sync_issues(session, current_user.id, token, limit)
+
+    return FastJSONResponse(
+        {
+            "items": issue_rows(page.issues, get_storage_service()),
+            "removed_ids": page.removed_ids,
+            "sync_token": page.token.encode(),
+            "has_more": page.has_more,
+        }
+    )
 
 
 @reports_router.get(
@@ -284,24 +484,174 @@ async def get_issues_for_map(
 )
 async def get_issue(
     issue_id: int,
-    session: Session = Depends(get_session),
+    projection: IssueProjection = Depends(issue_projection),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get details of a specific issue report by ID.
 
     - **issue_id**: The ID of the issue to retrieve
+    - **fields** / **include**: Sparse fields and photos, as for the issue list
     """
-    issue = session.get(Issue, issue_id)
+    issues = await select_issue_rows(session, Issue, projection, [Issue.id == issue_id])
+    if not issues:
+        # Links to an issue keep working after it's archived
+        issues = await select_issue_rows(
+            session, ArchivedIssue, projection, [ArchivedIssue.id == issue_id]
+        )
 
-    if not issue:
+    if not issues:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Issue with id {issue_id} not found",
         )
 
+    # Generate presigned URLs for photos
+    if projection.photos:
+        sign_photo_urls(issues, get_storage_service())
+
+    return FastJSONResponse(issues[0])
+
+
+@reports_router.patch(
+    "/status",
+    response_model=IssueBulkStatusResponse,
+    summary="Update the status of a batch of issues",
+)
+async def update_issues_status(
+    update: IssueBulkStatusUpdate,
+    current_user: CachedUser = Depends(get_current_official),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Move up to 1000 issues to a new status at once.
+
+    **Authentication Required**: Officials only.
+
+    - **issue_ids**: Issues to update
+    - **status**: New status
+
+    Issues whose current status can't move to the new one (see the
+    status workflow) or that don't exist are listed under `rejected`;
+    the others are updated together in one transaction.
+    """
+    result = await update_issue_statuses(
+        session, update.issue_ids, update.status, current_user.id
+    )
+    return IssueBulkStatusResponse(
+        status=update.status,
+        updated=result.updated,
+        unchanged=result.unchanged,
+        rejected=[
+            IssueStatusRejection(issue_id=issue_id, reason=reason)
+            for issue_id, reason in result.rejected.items()
+        ],
+    )
+
+
+@reports_router.patch(
+    "/{issue_id}/status",
+    response_model=IssueResponse,
+    summary="Update the status of an issue",
+)
+async def update_issue_status(
+    issue_id: int,
+    update: IssueStatusUpdate,
+    current_user: CachedUser = Depends(get_current_official),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Move an issue to a new status.
+
+    **Authentication Required**: Officials only.
+
+    - **issue_id**: The ID of the issue to update
+    - **status**: New status; must be allowed by the status workflow
+    """
+    result = await update_issue_statuses(
+        session, [issue_id], update.status, current_user.id
+    )
+    if issue_id in result.rejected:
+        reason = result.rejected[issue_id]
+        if reason == NOT_FOUND:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Issue with id {issue_id} not found",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Issue {issue_id} {reason}",
+        )
+
+    issue = await session.get(
+        Issue, issue_id, options=[selectinload(Issue.photos)], populate_existing=True
+    )
+
     # Generate presigned URLs for photos
     storage_service = get_storage_service()
     for photo in issue.photos:
         photo.photo_url = storage_service.get_file_url(photo.photo_url)
 
     return issue
+
+
+@reports_router.websocket("/live")
+async def live_issue_updates(websocket: WebSocket):
+    """
+    Push new and changed issues inside a map viewport.
+
+    After connecting, the client sends its viewport as JSON and may send a
+    new one whenever the map moves:
+
+        {"min_lat": 28.4, "min_lon": 76.8, "max_lat": 28.9, "max_lon": 77.4,
+         "issue_type": "road", "status": null}
+
+    Each is acknowledged with `{"type": "subscribed"}`. Matching changes
+    then arrive as `{"type": "issue", "seq", "event", "issue"}` messages,
+    with the issue's id, type, coordinates and status. A client that falls
+    behind is closed with code 1013 and should reload the map before
+    subscribing again.
+    """
+    await websocket.accept()
+    if not settings.live_updates_enabled:
+        await websocket.close(code=1013, reason="Live updates are disabled")
+        return
+
+    live_updates = get_live_updates()
+    subscription: Optional[Subscription] = None
+    sender: Optional[asyncio.Task] = None
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                request = LiveSubscriptionRequest.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json(
+                    {"type": "error", "detail": [error["msg"] for error in e.errors()]}
+                )
+                continue
+
+            bbox = BoundingBox(
+                request.min_lat, request.min_lon, request.max_lat, request.max_lon
+            )
+            if subscription is None:
+                subscription = Subscription(bbox=bbox)
+            else:
+                live_updates.unsubscribe(subscription)
+                subscription.bbox = bbox
+            subscription.issue_type = request.issue_type
+            subscription.status = request.status
+            if not live_updates.subscribe(subscription):
+                subscription = None
+                await websocket.close(code=1013, reason="Too many live subscriptions")
+                return
+            if sender is None:
+                sender = asyncio.create_task(send_updates(websocket, subscription))
+            await websocket.send_json({"type": "subscribed"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if subscription is not None:
+            live_updates.unsubscribe(subscription)
+        if sender is not None:
+            sender.cancel()
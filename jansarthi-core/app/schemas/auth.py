@@ -26,6 +26,7 @@ class UserResponse(BaseModel):
     mobile_number: str
     is_active: bool
     is_verified: bool
+    is_official: bool = False
     created_at: datetime
     updated_at: datetime
     
@@ -88,3 +89,5 @@ class TokenData(BaseModel):
     user_id: Optional[int] = None
     mobile_number: Optional[str] = None
     token_type: Optional[str] = None  # "access" or "refresh"
+    jti: Optional[str] = None  # refresh tokens only
+    family_id: Optional[str] = None  # refresh token family the token belongs to
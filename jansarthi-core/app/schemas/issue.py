@@ -1,9 +1,9 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from app.models.issue import IssueStatus, IssueType
+from app.models.issue import IssueEventType, IssueStatus, IssueType
 
 
 class IssuePhotoResponse(BaseModel):
@@ -58,6 +58,17 @@ class IssueListResponse(BaseModel):
     total_pages: int
 
 
+class IssueSyncResponse(BaseModel):
+    """Schema for the issues changed since the last sync"""
+
+    items: list[IssueResponse]
+    # Issues to drop from the client's list (archived since the last sync)
+    removed_ids: list[int]
+    # Pass as `sync_token` to get the next page, or the next sync's changes
+    sync_token: str
+    has_more: bool
+
+
 class IssueMapResponse(BaseModel):
     """Minimal schema for map view (performance optimized)"""
 
@@ -76,6 +87,68 @@ class IssueStatusUpdate(BaseModel):
     status: IssueStatus
 
 
+class IssueBulkStatusUpdate(BaseModel):
+    """Schema for moving a batch of issues to a status"""
+
+    issue_ids: list[int] = Field(..., min_length=1, max_length=1000)
+    status: IssueStatus
+
+
+class IssueStatusRejection(BaseModel):
+    """An issue left out of a status update, and why"""
+
+    issue_id: int
+    reason: str
+
+
+class IssueBulkStatusResponse(BaseModel):
+    """Schema for bulk status update response"""
+
+    status: IssueStatus
+    updated: list[int]
+    unchanged: list[int]
+    rejected: list[IssueStatusRejection]
+
+
+class IssueEventResponse(BaseModel):
+    """Schema for an issue event log entry"""
+
+    seq: int
+    issue_id: int
+    event_type: IssueEventType
+    actor_id: Optional[int]
+    data: dict
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class IssueEventFeedResponse(BaseModel):
+    """Schema for a page of the issue change feed"""
+
+    events: list[IssueEventResponse]
+    # Pass as `after` to get the next page
+    next_after: int
+    has_more: bool
+
+
+class LiveSubscriptionRequest(BaseModel):
+    """Viewport and filters sent by a live map client"""
+
+    min_lat: float = Field(..., ge=-90, le=90)
+    min_lon: float = Field(..., ge=-180, le=180)
+    max_lat: float = Field(..., ge=-90, le=90)
+    max_lon: float = Field(..., ge=-180, le=180)
+    issue_type: Optional[IssueType] = None
+    status: Optional[IssueStatus] = None
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "LiveSubscriptionRequest":
+        if self.min_lat > self.max_lat or self.min_lon > self.max_lon:
+            raise ValueError("min_lat/min_lon must not exceed max_lat/max_lon")
+        return self
+
+
 class IssueUpdate(BaseModel):
     """Schema for updating an issue"""
 
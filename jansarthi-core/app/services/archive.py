@@ -0,0 +1,317 @@
+"""Monthly partitions of the issue tables and archival of finished issues"""
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import literal, text, union_all
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import SessionLocal
+from app.models.issue import ArchivedIssue, Issue, IssueEventType, IssuePhoto, IssueStatus
+from app.services.issue_events import append_events_sync
+from app.services.issue_fields import IssueProjection, select_issue_rows
+from app.services.metrics import Counter
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+ISSUES_ARCHIVED = Counter(
+    "issues_archived_total",
+    "Finished issues moved to the archive tables",
+)
+
+PARTITIONED_TABLES = ("issues", "issue_photos")
+
+
+def month_start(moment: datetime, months: int = 0) -> datetime:
+    """
+    First instant (UTC) of the month ``months`` away from ``moment``
+
+    Args:
+        moment: Any time in the starting month
+        months: Months to move forward (negative for back)
+
+    Returns:
+        datetime: Midnight UTC on the first of that month
+    """
+    moment = moment.astimezone(timezone.utc)
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of a table's partition for a month, e.g. issues_y2026m10"""
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def _columns(model) -> str:
+    return ", ".join(column.name for column in model.__table__.columns)
+
+
+class IssueArchive:
+    """
+    Keeps the live issue tables small
+
+    ``issues`` and ``issue_photos`` are range partitioned by month on
+    created_at (see the Alembic migration); ``ensure_partitions`` creates
+    the upcoming months ahead of time so new rows don't land in the
+    default partition.
+
+    Finished issues whose created_at and updated_at are both older than
+    ``archive_after_months`` are moved, with their photos, to
+    ``issues_archive`` and ``issue_photos_archive``. Listing endpoints
+    only read the archive when a date filter reaches back past that
+    cutoff.
+    """
+
+    def __init__(self, archive_after_months: int, batch_size: int, months_ahead: int):
+        self.archive_after_months = archive_after_months
+        self.batch_size = batch_size
+        self.months_ahead = months_ahead
+
+    @property
+    def enabled(self) -> bool:
+        return self.archive_after_months > 0
+
+    def cutoff(self) -> datetime:
+        """Issues created before this may have been archived"""
+        return month_start(datetime.now(timezone.utc), -self.archive_after_months)
+
+    def includes_archive(
+        self,
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        status_filter: Optional[IssueStatus] = None,
+    ) -> bool:
+        """
+        Whether a listing with these filters has to read the archive
+
+        Args:
+            created_after: Lower bound of the created_at filter
+            created_before: Upper bound of the created_at filter
+            status_filter: Status filter, if any
+
+        Returns:
+            bool: True if archived issues can match
+        """
+        if not self.enabled:
+            return False
+        if created_after is None and created_before is None:
+            return False
+        if status_filter is not None and status_filter != IssueStatus.FINISHED_WORK:
+            return False
+        return created_after is None or created_after < self.cutoff()
+
+    def ensure_partitions(self) -> None:
+        """
+        Periodic job: create monthly partitions up to ``months_ahead`` months out
+
+        A month that fails is logged and retried on the next run, so the
+        other months (and the archive step after this) still go ahead.
+        """
+        with SessionLocal() as session:
+            if session.get_bind().dialect.name != "postgresql":
+                return
+            partitioned = set(session.exec(text(
+                "SELECT c.relname FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid"
+            )).scalars())
+            session.commit()
+            now = datetime.now(timezone.utc)
+            for table in PARTITIONED_TABLES:
+                # Created by create_all (development) rather than the migration
+                if table not in partitioned:
+                    continue
+                for months in range(self.months_ahead + 1):
+                    start = month_start(now, months)
+                    try:
+                        self._create_partition(session, table, start)
+                        session.commit()
+                    except Exception as e:
+                        session.rollback()
+                        print(f"Error creating partition {partition_name(table, start)}: {e}")
+
+    def _create_partition(self, session, table: str, start: datetime) -> None:
+        """
+        Create one month's partition of a table unless it exists
+
+        Rows inserted while the partition was missing (after an outage,
+        or with a skewed clock) sit in the default partition, and
+        Postgres refuses to create a partition whose range the default
+        partition holds rows for. Those rows are moved into the new
+        table before it is attached, with inserts into the default
+        partition blocked meanwhile.
+        """
+        name = partition_name(table, start)
+        if session.exec(text("SELECT to_regclass(:name)"), params={"name": name}).scalar():
+            return
+        quote = session.get_bind().dialect.identifier_preparer.quote
+        end = month_start(start, 1)
+        parent, partition, default = quote(table), quote(name), quote(f"{table}_default")
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_month = f"created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}'"
+
+        has_default = session.exec(
+            text("SELECT to_regclass(:name)"), params={"name": f"{table}_default"}
+        ).scalar()
+        if not has_default or not session.exec(
+            text(f"SELECT 1 FROM {default} WHERE {in_month} LIMIT 1")
+        ).first():
+            session.exec(text(f"CREATE TABLE {partition} PARTITION OF {parent} FOR VALUES {bounds}"))
+            return
+
+        session.exec(text(f"LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE"))
+        session.exec(text(f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS)"))
+        moved = session.exec(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {partition} SELECT * FROM moved"
+        )).rowcount
+        session.exec(text(f"ALTER TABLE {parent} ATTACH PARTITION {partition} FOR VALUES {bounds}"))
+        print(f"Moved {moved} rows from {table}_default to new partition {name}")
+
+    def archive_batch(self) -> int:
+        """
+        Move one batch of old finished issues and their photos to the archive
+
+        Returns:
+            int: Number of issues archived
+        """
+        cutoff = self.cutoff()
+        with SessionLocal() as session:
+            issue_ids = list(session.exec(
+                select(Issue.id)
+                .where(Issue.status == IssueStatus.FINISHED_WORK)
+                .where(Issue.created_at < cutoff)
+                .where(Issue.updated_at < cutoff)
+                .order_by(Issue.created_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all())
+            if not issue_ids:
+                return 0
+
+            params = {"issue_ids": issue_ids, "cutoff": cutoff}
+            issue_columns = _columns(Issue)
+            photo_columns = _columns(IssuePhoto)
+            session.exec(text(
+                f"WITH moved AS (DELETE FROM issues WHERE id = ANY(:issue_ids) "
+                f"AND created_at < :cutoff RETURNING {issue_columns}) "
+                f"INSERT INTO issues_archive ({issue_columns}) "
+                f"SELECT {issue_columns} FROM moved"
+            ), params=params)
+            session.exec(text(
+                f"WITH moved AS (DELETE FROM issue_photos WHERE issue_id = ANY(:issue_ids) "
+                f"RETURNING {photo_columns}) "
+                f"INSERT INTO issue_photos_archive ({photo_columns}) "
+                f"SELECT {photo_columns} FROM moved"
+            ), params=params)
+            append_events_sync(session, [
+                {"issue_id": issue_id, "event_type": IssueEventType.ARCHIVED}
+                for issue_id in issue_ids
+            ])
+            session.commit()
+
+        ISSUES_ARCHIVED.inc(len(issue_ids))
+        return len(issue_ids)
+
+    def archive(self) -> int:
+        """
+        Periodic job: archive old finished issues, a batch per transaction
+
+        Returns:
+            int: Number of issues archived
+        """
+        if not self.enabled:
+            return 0
+        archived = 0
+        while True:
+            moved = self.archive_batch()
+            archived += moved
+            if moved < self.batch_size:
+                break
+        if archived:
+            print(f"Archived {archived} finished issues")
+        return archived
+
+
+# Singleton instance
+_issue_archive: IssueArchive | None = None
+
+
+def get_issue_archive() -> IssueArchive:
+    """Get or create the issue archive instance"""
+    global _issue_archive
+    if _issue_archive is None:
+        _issue_archive = IssueArchive(
+            archive_after_months=settings.archive_after_months,
+            batch_size=settings.archive_batch_size,
+            months_ahead=settings.partition_months_ahead,
+        )
+    return _issue_archive
+
+
+def maintain_issue_tables() -> None:
+    """Periodic job: create upcoming partitions, then archive finished issues"""
+    issue_archive = get_issue_archive()
+    issue_archive.ensure_partitions()
+    issue_archive.archive()
+
+
+async def fetch_issue_page(
+    session: AsyncSession,
+    live_conditions: list,
+    archived_conditions: list,
+    offset: int,
+    limit: int,
+    projection: IssueProjection,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Page through live and archived issues together, newest first
+
+    Args:
+        session: Database session
+        live_conditions: Filters on Issue
+        archived_conditions: The same filters on ArchivedIssue
+        offset: Rows to skip
+        limit: Page size
+        projection: Columns and photos to load
+
+    Returns:
+        tuple[list, int]: Issue dicts as from ``select_issue_rows``, total count
+    """
+    matches = union_all(
+        select(Issue.id, Issue.created_at, literal(False).label("archived"))
+        .where(*live_conditions),
+        select(ArchivedIssue.id, ArchivedIssue.created_at, literal(True).label("archived"))
+        .where(*archived_conditions),
+    ).subquery()
+
+    total = (await session.exec(select(func.count()).select_from(matches))).one()
+    page = (await session.exec(
+        select(matches.c.id, matches.c.archived)
+        .order_by(matches.c.created_at.desc(), matches.c.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )).all()
+
+    live_ids = [issue_id for issue_id, archived in page if not archived]
+    archived_ids = [issue_id for issue_id, archived in page if archived]
+    loaded = {}
+    if live_ids:
+        for issue in await select_issue_rows(
+            session, Issue, projection, [Issue.id.in_(live_ids)]
+        ):
+            loaded[(issue["id"], False)] = issue
+    if archived_ids:
+        for issue in await select_issue_rows(
+            session, ArchivedIssue, projection, [ArchivedIssue.id.in_(archived_ids)]
+        ):
+            loaded[(issue["id"], True)] = issue
+
+    issues = [
+        loaded[(issue_id, bool(archived))]
+        for issue_id, archived in page
+        if (issue_id, bool(archived)) in loaded
+    ]
+    return issues, total
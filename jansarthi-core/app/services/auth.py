@@ -6,11 +6,15 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.database import get_session
+from app.database import AsyncSessionLocal, get_session
 from app.models.issue import User
 from app.schemas.auth import TokenData
+from app.services.keys import get_key_ring
+from app.services.tokens import get_refresh_token_store
+from app.services.user_cache import CachedUser, get_user_cache
 from app.settings.config import get_settings
 
 settings = get_settings()
@@ -21,13 +25,37 @@ class AuthService:
     """Service for JWT token management and authentication"""
 
     @staticmethod
-    def create_access_token(user_id: int, mobile_number: str) -> str:
+    def encode_token(claims: dict) -> str:
+        """
+        Sign claims with the active key from the key ring
+        
+        Args:
+            claims: JWT claims to encode
+            
+        Returns:
+            str: Encoded JWT token (with a kid header for asymmetric keys)
+        """
+        kid, key = get_key_ring().signing_key()
+        headers = {"kid": kid} if kid else None
+        
+        return jwt.encode(
+            claims,
+            key,
+            algorithm=settings.jwt_algorithm,
+            headers=headers
+        )
+
+    @staticmethod
+    def create_access_token(
+        user_id: int, mobile_number: str, family_id: Optional[str] = None
+    ) -> str:
         """
         Create JWT access token
         
         Args:
             user_id: User's ID
             mobile_number: User's mobile number
+            family_id: Refresh token family, so revoking it also revokes this token
             
         Returns:
             str: Encoded JWT token
@@ -42,43 +70,39 @@ class AuthService:
             "exp": expire,
             "iat": datetime.utcnow()
         }
+        if family_id:
+            to_encode["fam"] = family_id
         
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.jwt_secret_key,
-            algorithm=settings.jwt_algorithm
-        )
-        return encoded_jwt
+        return AuthService.encode_token(to_encode)
 
     @staticmethod
-    def create_refresh_token(user_id: int, mobile_number: str) -> str:
+    def create_refresh_token(
+        user_id: int, mobile_number: str, jti: str, family_id: str, expire: datetime
+    ) -> str:
         """
         Create JWT refresh token
         
         Args:
             user_id: User's ID
             mobile_number: User's mobile number
+            jti: Token ID recorded in the refresh token store
+            family_id: Rotation family the token belongs to
+            expire: Expiry time recorded in the refresh token store
             
         Returns:
             str: Encoded JWT token
         """
-        expires_delta = timedelta(days=settings.jwt_refresh_token_expire_days)
-        expire = datetime.utcnow() + expires_delta
-        
         to_encode = {
             "user_id": user_id,
             "mobile_number": mobile_number,
             "token_type": "refresh",
+            "jti": jti,
+            "fam": family_id,
             "exp": expire,
             "iat": datetime.utcnow()
         }
         
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.jwt_secret_key,
-            algorithm=settings.jwt_algorithm
-        )
-        return encoded_jwt
+        return AuthService.encode_token(to_encode)
 
     @staticmethod
     def verify_token(token: str, token_type: str = "access") -> TokenData:
@@ -96,9 +120,19 @@ class AuthService:
             HTTPException: If token is invalid or expired
         """
         try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = get_key_ring().verification_key(kid)
+            
+            if key is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Unknown signing key",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            
             payload = jwt.decode(
                 token,
-                settings.jwt_secret_key,
+                key,
                 algorithms=[settings.jwt_algorithm]
             )
             
@@ -123,7 +157,9 @@ class AuthService:
             return TokenData(
                 user_id=user_id,
                 mobile_number=mobile_number,
-                token_type=token_type_from_payload
+                token_type=token_type_from_payload,
+                jti=payload.get("jti"),
+                family_id=payload.get("fam")
             )
             
         except JWTError as e:
@@ -134,19 +170,35 @@ class AuthService:
             )
 
     @staticmethod
-    def create_token_pair(user_id: int, mobile_number: str) -> dict:
+    def create_token_pair(
+        session: AsyncSession,
+        user_id: int,
+        mobile_number: str,
+        family_id: Optional[str] = None
+    ) -> dict:
         """
         Create access and refresh token pair
         
+        The refresh token is recorded in the refresh token store; the caller
+        commits the session.
+        
         Args:
+            session: Database session
             user_id: User's ID
             mobile_number: User's mobile number
+            family_id: Family to continue when rotating, None for a new login
             
         Returns:
             dict: Dictionary with access_token and refresh_token
         """
-        access_token = AuthService.create_access_token(user_id, mobile_number)
-        refresh_token = AuthService.create_refresh_token(user_id, mobile_number)
+        record = get_refresh_token_store().issue(session, user_id, family_id)
+        
+        access_token = AuthService.create_access_token(
+            user_id, mobile_number, record.family_id
+        )
+        refresh_token = AuthService.create_refresh_token(
+            user_id, mobile_number, record.jti, record.family_id, record.expires_at
+        )
         
         return {
             "access_token": access_token,
@@ -156,10 +208,35 @@ class AuthService:
         }
 
 
+async def load_user(session: AsyncSession, user_id: int) -> Optional[CachedUser]:
+    """
+    Load the authentication fields of a user, using the user cache when possible
+    
+    Args:
+        session: Database session
+        user_id: User's ID
+        
+    Returns:
+        Optional[CachedUser]: User snapshot, or None if the user doesn't exist
+    """
+    user_cache = get_user_cache()
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user = await session.get(User, user_id)
+    if user is None:
+        return None
+    
+    cached_user = CachedUser.from_user(user)
+    user_cache.set(cached_user)
+    return cached_user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
+    session: AsyncSession = Depends(get_session)
+) -> CachedUser:
     """
     Dependency to get current authenticated user
     
@@ -168,7 +245,7 @@ async def get_current_user(
         session: Database session
         
     Returns:
-        User: Current authenticated user
+        CachedUser: Current authenticated user
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -178,8 +255,17 @@ async def get_current_user(
     # Verify token
     token_data = AuthService.verify_token(token, token_type="access")
     
-    # Get user from database
-    user = session.get(User, token_data.user_id)
+    if token_data.family_id and await get_refresh_token_store().is_revoked(
+        session, token_data.family_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked. Please login again.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Get user from cache or database
+    user = await load_user(session, token_data.user_id)
     
     if user is None:
         raise HTTPException(
@@ -198,8 +284,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     """
     Dependency to get current active user
     
@@ -207,7 +293,7 @@ async def get_current_active_user(
         current_user: Current user from get_current_user
         
     Returns:
-        User: Current active user
+        CachedUser: Current active user
         
     Raises:
         HTTPException: If user is not verified
@@ -221,11 +307,55 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_official(
+    current_user: CachedUser = Depends(get_current_active_user)
+) -> CachedUser:
+    """
+    Dependency to get the current user if they are an official
+
+    The cached snapshot can be stale for up to USER_CACHE_TTL_SECONDS on
+    workers other than the one that changed the user, so is_active and
+    is_official are re-read from the database before an official acts.
+    The read uses its own short-lived session, so routes that wait (the
+    event long poll) don't keep a primary connection checked out.
+
+    Args:
+        current_user: Current user from get_current_active_user
+
+    Returns:
+        CachedUser: Current official
+
+    Raises:
+        HTTPException: If user is not an official (or no longer active)
+    """
+    async with AsyncSessionLocal() as session:
+        row = (await session.exec(
+            select(User.is_active, User.is_official).where(User.id == current_user.id)
+        )).first()
+    if row is None or (row.is_active, row.is_official) != (
+        current_user.is_active, current_user.is_official
+    ):
+        # Reload on the next request rather than wait for the TTL
+        get_user_cache().invalidate(current_user.id)
+    if row is None or not row.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    if not row.is_official:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only officials can do this"
+        )
+
+    return current_user
+
+
 # Optional: Get user from token but don't require it
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    session: Session = Depends(get_session)
-) -> Optional[User]:
+    session: AsyncSession = Depends(get_session)
+) -> Optional[CachedUser]:
     """
     Dependency to optionally get authenticated user (doesn't fail if no token)
     
@@ -234,7 +364,7 @@ async def get_optional_user(
         session: Database session
         
     Returns:
-        Optional[User]: User if authenticated, None otherwise
+        Optional[CachedUser]: User if authenticated, None otherwise
     """
     if not credentials:
         return None
@@ -242,7 +372,11 @@ async def get_optional_user(
     try:
         token = credentials.credentials
         token_data = AuthService.verify_token(token, token_type="access")
-        user = session.get(User, token_data.user_id)
+        if token_data.family_id and await get_refresh_token_store().is_revoked(
+            session, token_data.family_id
+        ):
+            return None
+        user = await load_user(session, token_data.user_id)
         return user if user and user.is_active else None
     except:
         return None
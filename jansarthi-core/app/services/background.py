@@ -0,0 +1,67 @@
+"""Periodic background jobs run alongside the API"""
+
+import asyncio
+from typing import Awaitable, Callable, Union
+
+JobFunc = Callable[[], Union[None, Awaitable[None]]]
+
+
+class PeriodicJobs:
+    """Runs registered jobs at fixed intervals for the lifetime of the app"""
+
+    def __init__(self):
+        self._jobs: list[tuple[str, float, JobFunc]] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def add(self, name: str, interval_seconds: float, func: JobFunc) -> None:
+        """
+        Register a job, replacing any registered under the same name
+
+        Args:
+            name: Job name used in log messages
+            interval_seconds: Delay between runs
+            func: Coroutine function, or blocking function run in a thread
+        """
+        self._jobs = [job for job in self._jobs if job[0] != name]
+        self._jobs.append((name, interval_seconds, func))
+
+    def start(self) -> None:
+        """Start all registered jobs"""
+        for name, interval_seconds, func in self._jobs:
+            self._tasks.append(
+                asyncio.create_task(self._run(name, interval_seconds, func))
+            )
+
+    async def stop(self) -> None:
+        """Cancel all running jobs, wait for them to finish and forget them"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # The next startup (in-process harnesses, test clients) registers
+        # its jobs again
+        self._jobs.clear()
+
+    @staticmethod
+    async def _run(name: str, interval_seconds: float, func: JobFunc) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    await func()
+                else:
+                    await asyncio.to_thread(func)
+            except Exception as e:
+                print(f"Background job {name} failed: {e}")
+
+
+# Singleton instance
+_periodic_jobs: PeriodicJobs | None = None
+
+
+def get_periodic_jobs() -> PeriodicJobs:
+    """Get or create the periodic jobs instance"""
+    global _periodic_jobs
+    if _periodic_jobs is None:
+        _periodic_jobs = PeriodicJobs()
+    return _periodic_jobs
@@ -0,0 +1,192 @@
+"""gzip/brotli response compression with a size threshold and per-route opt-out"""
+
+import asyncio
+import zlib
+from typing import Any, Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import Counter
+
+COMPRESSION_INPUT_BYTES = Counter(
+    "http_compression_input_bytes_total",
+    "Response bytes before compression",
+    ("encoding",),
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "http_compression_output_bytes_total",
+    "Response bytes after compression",
+    ("encoding",),
+)
+
+# Bodies this large are compressed in a thread so the event loop keeps serving
+THREAD_MIN_SIZE = 256 * 1024
+
+_SKIP_ATTRIBUTE = "_skip_compression"
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """
+    Mark a route's responses as never to be compressed
+
+    For endpoints streaming content that is compressed already (images,
+    archives), where compressing again only costs CPU. Apply below the
+    route decorator.
+    """
+    setattr(endpoint, _SKIP_ATTRIBUTE, True)
+    return endpoint
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Encodings from an Accept-Encoding header, without those given q=0"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+class _Compressor:
+    """Incremental compressor for one response"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk; every chunk is flushed so streams aren't held back"""
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses for clients that accept brotli or gzip
+
+    A response is compressed when its content type is in
+    ``content_types`` (``text/*`` style wildcards allowed), it isn't
+    encoded already, its route isn't marked with ``skip_compression``,
+    and it is at least ``minimum_size`` bytes, or is streamed in several
+    chunks. Streamed bodies are compressed chunk by chunk as they are
+    sent. brotli is preferred when the client accepts it and the brotli
+    package is installed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        content_types: list[str],
+        gzip_level: int,
+        brotli_quality: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {content_type.lower() for content_type in content_types}
+        self.levels = {"gzip": gzip_level}
+        if brotli_quality is not None:
+            try:
+                import brotli  # noqa: F401
+
+                self.levels["br"] = brotli_quality
+            except ImportError:
+                print("brotli is not installed, compressing responses with gzip only")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next((name for name in ("br", "gzip") if name in accepted and name in self.levels), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def compressible(self, scope: Scope, headers: Headers, status: int) -> bool:
+        route = scope.get("route")
+        if getattr(getattr(route, "endpoint", None), _SKIP_ATTRIBUTE, False):
+            return False
+        if "content-encoding" in headers or status in (204, 206, 304):
+            return False
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return (
+            content_type in self.content_types
+            or content_type.partition("/")[0] + "/*" in self.content_types
+        )
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        # None until the first body message decides whether to compress
+        self.compressor: Any = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if not self.middleware.compressible(self.scope, headers, message["status"]):
+                self.passthrough = True
+                await self._send(message)
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            if self.start is not None and not self.passthrough and self.compressor is None:
+                self.passthrough = True
+                await self._send(self.start)
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.middleware.levels[self.encoding])
+            headers["Content-Encoding"] = self.encoding
+            del headers["Content-Length"]
+            compressed = await self._compress(body, final=not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(compressed))
+            await self._send(self.start)
+        else:
+            compressed = await self._compress(body, final=not more_body)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    async def _compress(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MIN_SIZE:
+            compressed = await asyncio.to_thread(self.compressor.compress, body, final)
+        else:
+            compressed = self.compressor.compress(body, final)
+        COMPRESSION_INPUT_BYTES.inc(len(body), encoding=self.encoding)
+        COMPRESSION_OUTPUT_BYTES.inc(len(compressed), encoding=self.encoding)
+        return compressed
@@ -0,0 +1,167 @@
+"""Connection pool metrics and slow query logging"""
+
+import contextvars
+import hashlib
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.metrics import Counter, Gauge, Histogram
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+# Engines by pool name, read when metrics are exported
+_engines: dict[str, Engine] = {}
+
+
+def _pool_stats() -> dict[tuple, float]:
+    stats = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        stats[(name, "size")] = pool.size()
+        stats[(name, "checked_out")] = pool.checkedout()
+        stats[(name, "overflow")] = max(pool.overflow(), 0)
+    return stats
+
+
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connection pool size, checked out connections and overflow in use",
+    ("pool", "state"),
+    callback=_pool_stats,
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to check out a connection (waiting for a slot, connecting, pre-ping)",
+    ("pool",),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ("pool",),
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Queries slower than the slow query threshold",
+    ("pool",),
+)
+
+
+class _TimedCheckoutMixin:
+    """Records checkout time and timeouts for a SQLAlchemy pool"""
+
+    def connect(self):
+        name = self.logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(pool=name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, pool=name)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool with checkout metrics"""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics"""
+
+
+# The request scope being served, for attributing queries to routes
+_current_scope: contextvars.ContextVar[Optional[Scope]] = contextvars.ContextVar(
+    "current_scope", default=None
+)
+
+
+class RouteContextMiddleware:
+    """Makes the current request's route available to query logging"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+def current_route() -> str:
+    """Route template of the request being served, or "background" outside requests"""
+    scope = _current_scope.get()
+    if scope is None:
+        return "background"
+    # The router adds the matched route to the (shared) scope dict
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', 'WS')} {path}"
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|\$\d+|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Normalize a SQL statement so repeats of the same query group together
+
+    Literals become ``?`` and placeholder lists of any length (expanded
+    IN clauses) become ``(...)``.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        tuple[str, str]: Short hash of the normalized SQL, normalized SQL
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    digest = hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+    return digest, normalized
+
+
+def instrument_engine(name: str, engine: Engine, slow_query_seconds: float) -> None:
+    """
+    Export pool metrics for an engine and log its slow queries
+
+    Args:
+        name: Pool name used in metrics and logs
+        engine: Sync engine (``AsyncEngine.sync_engine`` for async engines)
+        slow_query_seconds: Log queries slower than this, 0 to disable
+    """
+    _engines[name] = engine
+    if slow_query_seconds <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        if elapsed < slow_query_seconds:
+            return
+        SLOW_QUERIES.inc(pool=name)
+        digest, normalized = fingerprint(statement)
+        print(
+            f"Slow query {elapsed * 1000:.0f}ms pool={name} route=\"{current_route()}\" "
+            f"fingerprint={digest}: {normalized[:500]}"
+        )
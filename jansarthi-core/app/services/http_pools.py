@@ -0,0 +1,154 @@
+"""Shared, instrumented connection pools for outbound HTTP clients (MinIO, Twilio)"""
+
+import os
+import socket
+from typing import Optional
+
+import certifi
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry, Timeout
+
+from app.services.metrics import Counter
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+CONNECTIONS_OPENED = Counter(
+    "http_pool_connections_opened_total",
+    "Outbound HTTP requests that had to open a new connection",
+    ("pool",),
+)
+CONNECTIONS_REUSED = Counter(
+    "http_pool_connections_reused_total",
+    "Outbound HTTP requests sent on a kept-alive pooled connection",
+    ("pool",),
+)
+CONNECTIONS_DISCARDED = Counter(
+    "http_pool_connections_discarded_total",
+    "Connections closed because the pool was already full (raise the pool size)",
+    ("pool",),
+)
+
+
+class _InstrumentedPoolMixin:
+    """Counts opened, reused and discarded connections of a urllib3 pool"""
+
+    pool_name = "default"
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        # Pooled connections whose socket was dropped were closed by
+        # _get_conn and reconnect on the request, like new ones
+        if conn.sock is None:
+            CONNECTIONS_OPENED.inc(pool=self.pool_name)
+        else:
+            CONNECTIONS_REUSED.inc(pool=self.pool_name)
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            CONNECTIONS_DISCARDED.inc(pool=self.pool_name)
+        super()._put_conn(conn)
+
+
+class InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    """HTTPConnectionPool with connection reuse metrics"""
+
+
+class InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    """HTTPSConnectionPool with connection reuse metrics"""
+
+
+def _pool_classes(name: str) -> dict[str, type]:
+    return {
+        "http": type(
+            "InstrumentedHTTPConnectionPool", (InstrumentedHTTPConnectionPool,), {"pool_name": name}
+        ),
+        "https": type(
+            "InstrumentedHTTPSConnectionPool", (InstrumentedHTTPSConnectionPool,), {"pool_name": name}
+        ),
+    }
+
+
+def keepalive_socket_options(idle_seconds: int) -> list[tuple[int, int, int]]:
+    """
+    Socket options for TCP keep-alive on pooled connections
+
+    Probes keep idle connections from being silently dropped by NAT
+    gateways and load balancers, which would otherwise make the next
+    request on them fail or reconnect.
+
+    Args:
+        idle_seconds: Idle time before the first probe, 0 to disable
+
+    Returns:
+        list: urllib3 socket options (including its defaults)
+    """
+    options = list(HTTPConnection.default_socket_options)
+    if idle_seconds <= 0:
+        return options
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Not available on every platform (e.g. macOS names it differently)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle_seconds))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(idle_seconds // 4, 1)))
+    return options
+
+
+def make_pool_manager(
+    name: str,
+    maxsize: int,
+    connect_timeout: float,
+    read_timeout: float,
+    retries: Retry,
+    cert_check: bool = True,
+) -> urllib3.PoolManager:
+    """
+    Create a thread-safe urllib3 PoolManager with instrumented pools
+
+    Args:
+        name: Pool name used in metrics
+        maxsize: Connections kept per host
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for response data
+        retries: Retry policy
+        cert_check: Verify TLS certificates
+
+    Returns:
+        urllib3.PoolManager: The pool manager
+    """
+    manager = urllib3.PoolManager(
+        maxsize=maxsize,
+        block=settings.http_pool_block,
+        timeout=Timeout(connect=connect_timeout, read=read_timeout),
+        retries=retries,
+        socket_options=keepalive_socket_options(settings.http_keepalive_idle_seconds),
+        cert_reqs="CERT_REQUIRED" if cert_check else "CERT_NONE",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
+    manager.pool_classes_by_scheme = _pool_classes(name)
+    return manager
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """requests adapter using instrumented pools with TCP keep-alive"""
+
+    def __init__(self, name: str, pool_maxsize: int, max_retries: Optional[Retry] = None):
+        self.pool_name = name
+        super().__init__(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries or 0,
+            pool_block=settings.http_pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault(
+            "socket_options", keepalive_socket_options(settings.http_keepalive_idle_seconds)
+        )
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes(self.pool_name)
@@ -0,0 +1,89 @@
+"""Append-only issue event log and the change feed reading it"""
+
+from typing import Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.issue import IssueEvent
+from app.services.metrics import Counter
+
+EVENTS_WRITTEN = Counter(
+    "issue_events_total",
+    "Issue events appended to the event log",
+    ("event_type",),
+)
+
+# Transaction-level advisory lock serializing event writers. seq values
+# are taken from a sequence when rows are inserted, but become visible
+# when their transaction commits; without the lock a consumer could read
+# seq 11 while seq 10 is still uncommitted and skip it for good. The lock
+# is taken right before the insert and released at commit, so events
+# commit in seq order. Writers only wait on each other for the rest of
+# the transaction, which is just the insert and the commit.
+EVENT_LOG_LOCK_KEY = 7_310_137_165_830_501
+
+# Postgres channel notified (on commit) when events are appended, so
+# every worker can pick them up without polling
+EVENT_CHANNEL = "issue_events"
+
+_LOCK_SQL = text("SELECT pg_advisory_xact_lock(:key), pg_notify(:channel, '')")
+_LOCK_PARAMS = {"key": EVENT_LOG_LOCK_KEY, "channel": EVENT_CHANNEL}
+
+
+def _event_rows(events: list[dict]) -> list[dict]:
+    for event in events:
+        event.setdefault("actor_id", None)
+        event.setdefault("data", {})
+        EVENTS_WRITTEN.inc(event_type=event["event_type"].value)
+    return events
+
+
+async def append_events(session: AsyncSession, events: list[dict]) -> None:
+    """
+    Append events in the session's transaction; call right before committing
+
+    Args:
+        session: Database session with the change being made
+        events: Dicts with issue_id, event_type and optionally actor_id and data
+    """
+    if not events:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        await session.exec(_LOCK_SQL, params=_LOCK_PARAMS)
+    await session.exec(insert(IssueEvent), params=_event_rows(events))
+
+
+def append_events_sync(session: Session, events: list[dict]) -> None:
+    """Blocking version of ``append_events`` for background jobs"""
+    if not events:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        session.exec(_LOCK_SQL, params=_LOCK_PARAMS)
+    session.exec(insert(IssueEvent), params=_event_rows(events))
+
+
+async def read_events(
+    session: AsyncSession,
+    after_seq: int,
+    limit: int,
+    issue_id: Optional[int] = None,
+) -> list[IssueEvent]:
+    """
+    Events with a seq greater than ``after_seq``, oldest first
+
+    Args:
+        session: Database session
+        after_seq: Last seq the consumer has seen (0 for the beginning)
+        limit: Maximum number of events
+        issue_id: Only events of this issue
+
+    Returns:
+        list[IssueEvent]: The events
+    """
+    query = select(IssueEvent).where(IssueEvent.seq > after_seq)
+    if issue_id is not None:
+        query = query.where(IssueEvent.issue_id == issue_id)
+    return list((await session.exec(query.order_by(IssueEvent.seq).limit(limit))).all())
@@ -0,0 +1,151 @@
+"""Sparse fieldsets and photo inclusion for the issue read endpoints"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.issue import ArchivedIssue, ArchivedIssuePhoto, Issue, IssuePhoto
+
+# IssueResponse fields that can be requested, in response order
+ISSUE_FIELDS = (
+    "id",
+    "issue_type",
+    "description",
+    "latitude",
+    "longitude",
+    "status",
+    "user_id",
+    "created_at",
+    "updated_at",
+)
+INCLUDES = ("photos",)
+
+PHOTO_FIELDS = ("id", "photo_url", "filename", "file_size", "content_type", "created_at")
+
+_PHOTO_MODELS = {Issue: IssuePhoto, ArchivedIssue: ArchivedIssuePhoto}
+
+
+@dataclass(frozen=True)
+class IssueProjection:
+    """Which issue columns to select and whether to load photos"""
+
+    fields: tuple[str, ...] = ISSUE_FIELDS
+    photos: bool = True
+
+    @classmethod
+    def parse(cls, fields: Optional[str], include: Optional[str]) -> "IssueProjection":
+        """
+        Build a projection from the ``fields`` and ``include`` parameters
+
+        Without ``fields`` every field is returned. Photos are returned if
+        ``include`` lists them, or if neither parameter is given, so
+        existing clients keep getting the full issue.
+
+        Raises:
+            ValueError: If an unknown field or include is named
+        """
+        if fields is None:
+            selected = ISSUE_FIELDS
+        else:
+            requested = {name.strip() for name in fields.split(",") if name.strip()}
+            unknown = requested.difference(ISSUE_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+            # id is always returned so clients can tell issues apart
+            requested.add("id")
+            selected = tuple(name for name in ISSUE_FIELDS if name in requested)
+
+        if include is None:
+            photos = fields is None
+        else:
+            included = {name.strip() for name in include.split(",") if name.strip()}
+            unknown = included.difference(INCLUDES)
+            if unknown:
+                raise ValueError(f"Unknown includes: {', '.join(sorted(unknown))}")
+            photos = "photos" in included
+        return cls(fields=selected, photos=photos)
+
+    def columns(self, model) -> list:
+        return [getattr(model, name) for name in self.fields]
+
+
+def issue_projection(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated issue fields to return (id is always included)",
+        examples=["id,issue_type,status,created_at"],
+    ),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated related data to embed: photos. "
+        "Defaults to photos only when `fields` isn't given",
+    ),
+) -> IssueProjection:
+    """Dependency reading the ``fields`` and ``include`` query parameters"""
+    try:
+        return IssueProjection.parse(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def select_issue_rows(
+    session: AsyncSession,
+    model,
+    projection: IssueProjection,
+    conditions: list,
+    order_by: tuple = (),
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """
+    Select only the projected columns of matching issues, and their photos if asked
+
+    Args:
+        session: Database session
+        model: Issue or ArchivedIssue
+        projection: Columns and photos to load
+        conditions: Filters on the model
+        order_by: Ordering of the issues
+        offset: Rows to skip
+        limit: Maximum number of issues
+
+    Returns:
+        list[dict]: One dict per issue with the projected fields, plus a
+        ``photos`` list of photo dicts (with object names, not URLs) if
+        the projection includes photos
+    """
+    query = select(*projection.columns(model)).where(*conditions).order_by(*order_by)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    issues = [dict(row._mapping) for row in (await session.exec(query)).all()]
+    if projection.photos and issues:
+        await attach_photos(session, model, issues)
+    return issues
+
+
+async def attach_photos(session: AsyncSession, model, issues: list[dict[str, Any]]) -> None:
+    """Load the photos of issue dicts (which must have ``id``) with one query"""
+    photo_model = _PHOTO_MODELS[model]
+    by_issue = {issue["id"]: [] for issue in issues}
+    query = (
+        select(photo_model.issue_id, *(getattr(photo_model, name) for name in PHOTO_FIELDS))
+        .where(photo_model.issue_id.in_(list(by_issue)))
+        .order_by(photo_model.id)
+    )
+    for issue_id, *values in (await session.exec(query)).all():
+        by_issue[issue_id].append(dict(zip(PHOTO_FIELDS, values)))
+    for issue in issues:
+        issue["photos"] = by_issue[issue["id"]]
+
+
+def sign_photo_urls(issues: list[dict[str, Any]], storage_service: Any) -> None:
+    """Replace photo object names with URLs, for issues that have photos loaded"""
+    get_file_url = storage_service.get_file_url
+    for issue in issues:
+        for photo in issue.get("photos", ()):
+            photo["photo_url"] = get_file_url(photo["photo_url"])
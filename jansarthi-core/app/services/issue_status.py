@@ -0,0 +1,147 @@
+"""Issue status workflow and set-based status updates by officials"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, update
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.issue import Issue, IssueEventType, IssueStatus, IssueStatusChange
+from app.services.issue_events import append_events
+from app.services.metrics import Counter
+from app.services.notifications import get_status_notifier
+from app.services.read_replicas import get_read_replicas
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+STATUS_TRANSITIONS = Counter(
+    "issue_status_transitions_total",
+    "Issue status changes applied by officials",
+    ("to_status",),
+)
+
+# Moves allowed by the workflow. Issues go forward one step at a time;
+# the Pradhan can send a report back, and finished work can be reopened.
+ALLOWED_TRANSITIONS: dict[IssueStatus, frozenset[IssueStatus]] = {
+    IssueStatus.REPORTED: frozenset({IssueStatus.PRADHAN_CHECK}),
+    IssueStatus.PRADHAN_CHECK: frozenset({IssueStatus.STARTED_WORKING, IssueStatus.REPORTED}),
+    IssueStatus.STARTED_WORKING: frozenset({IssueStatus.FINISHED_WORK}),
+    IssueStatus.FINISHED_WORK: frozenset({IssueStatus.STARTED_WORKING}),
+}
+
+
+# Rejection reason for ids that don't match an issue
+NOT_FOUND = "not found"
+
+
+def can_transition(from_status: IssueStatus, to_status: IssueStatus) -> bool:
+    """Whether the workflow allows moving an issue between two statuses"""
+    return to_status in ALLOWED_TRANSITIONS[from_status]
+
+
+@dataclass
+class StatusUpdateResult:
+    """Outcome of a status update, per issue"""
+
+    updated: list[int] = field(default_factory=list)
+    # Already in the requested status
+    unchanged: list[int] = field(default_factory=list)
+    # issue_id -> why it wasn't updated
+    rejected: dict[int, str] = field(default_factory=dict)
+
+
+async def update_issue_statuses(
+    session: AsyncSession,
+    issue_ids: list[int],
+    to_status: IssueStatus,
+    changed_by: int,
+) -> StatusUpdateResult:
+    """
+    Move issues to a status in one transaction
+
+    The issues are locked and their current status read with one query;
+    the allowed ones are then changed with a single UPDATE, and audited
+    and added to the event log with multi-row INSERTs. Issues that don't exist or whose current
+    status can't move to ``to_status`` are rejected without affecting
+    the rest.
+
+    Args:
+        session: Database session (committed here)
+        issue_ids: Issues to update
+        to_status: New status
+        changed_by: ID of the official making the change
+
+    Returns:
+        StatusUpdateResult: Which issues were updated, unchanged or rejected
+    """
+    result = StatusUpdateResult()
+    # Locked in id order, so concurrent batches can't deadlock
+    rows = (await session.exec(
+        select(Issue.id, Issue.status, Issue.user_id, Issue.issue_type)
+        .where(Issue.id.in_(issue_ids))
+        .order_by(Issue.id)
+        .with_for_update()
+    )).all()
+
+    found = {row.id: row for row in rows}
+    changes = []
+    for issue_id in dict.fromkeys(issue_ids):
+        row = found.get(issue_id)
+        if row is None:
+            result.rejected[issue_id] = NOT_FOUND
+        elif row.status == to_status:
+            result.unchanged.append(issue_id)
+        elif not can_transition(row.status, to_status):
+            result.rejected[issue_id] = (
+                f"cannot move from {row.status.value} to {to_status.value}"
+            )
+        else:
+            result.updated.append(issue_id)
+            changes.append(row)
+
+    if not changes:
+        await session.rollback()
+        return result
+
+    await session.exec(
+        update(Issue)
+        .where(Issue.id.in_(result.updated))
+        .values(status=to_status, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await session.exec(
+        insert(IssueStatusChange),
+        params=[
+            {
+                "issue_id": row.id,
+                "from_status": row.status,
+                "to_status": to_status,
+                "changed_by": changed_by,
+            }
+            for row in changes
+        ],
+    )
+    await append_events(session, [
+        {
+            "issue_id": row.id,
+            "event_type": IssueEventType.STATUS_CHANGED,
+            "actor_id": changed_by,
+            "data": {"from": row.status.value, "to": to_status.value},
+        }
+        for row in changes
+    ])
+    await session.commit()
+
+    STATUS_TRANSITIONS.inc(len(changes), to_status=to_status.value)
+    # Set-based updates bypass the ORM events that queue notifications
+    if settings.notifications_enabled:
+        notifier = get_status_notifier()
+        for row in changes:
+            if row.user_id is not None:
+                notifier.record(row.user_id, row.id, row.issue_type, row.status, to_status)
+    # The official and the issues' reporters read the new statuses back next
+    await get_read_replicas().pin_to_primary(
+        changed_by, *(row.user_id for row in changes)
+    )
+    return result
@@ -0,0 +1,175 @@
+"""Delta sync of a user's issues for the mobile app"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import selectinload
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.issue import ArchivedIssue, Issue, IssueEvent, IssueEventType
+from app.services.read_replicas import get_read_replicas
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+SYNC_TOKEN_VERSION = 1
+
+
+@dataclass
+class SyncToken:
+    """
+    Where a client's last sync left off
+
+    Between syncs only ``since`` and ``seq`` are set. While a sync is
+    being paged, ``after`` is the last (updated_at, id) sent and
+    ``next_since`` the ``since`` the sync will end with.
+    """
+
+    # Issues updated after this are sent; None sends all of them
+    since: Optional[datetime] = None
+    # Issues archived after this event seq are reported removed
+    seq: int = 0
+    next_since: Optional[datetime] = None
+    after: Optional[tuple[datetime, int]] = None
+
+    def encode(self) -> str:
+        state = {
+            "v": SYNC_TOKEN_VERSION,
+            "since": self.since.isoformat() if self.since else None,
+            "seq": self.seq,
+        }
+        if self.after is not None:
+            state["next_since"] = self.next_since.isoformat()
+            state["after"] = [self.after[0].isoformat(), self.after[1]]
+        raw = json.dumps(state, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "SyncToken":
+        """
+        Parse a token returned by ``encode``
+
+        Raises:
+            ValueError: If the token is malformed or from another version
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            state = json.loads(raw)
+            if state.get("v") != SYNC_TOKEN_VERSION:
+                raise ValueError("unsupported version")
+            sync_token = cls(
+                since=datetime.fromisoformat(state["since"]) if state["since"] else None,
+                seq=int(state["seq"]),
+            )
+            if "after" in state:
+                sync_token.next_since = datetime.fromisoformat(state["next_since"])
+                sync_token.after = (
+                    datetime.fromisoformat(state["after"][0]),
+                    int(state["after"][1]),
+                )
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError("Invalid sync token") from e
+        return sync_token
+
+
+@dataclass
+class SyncPage:
+    """Issues changed since a sync token and the token to continue from"""
+
+    issues: list[Issue] = field(default_factory=list)
+    removed_ids: list[int] = field(default_factory=list)
+    token: SyncToken = field(default_factory=SyncToken)
+    has_more: bool = False
+
+
+def sync_overlap() -> timedelta:
+    """
+    How far back from the time of a sync the next one starts
+
+    updated_at is the time a transaction started, so a change can commit
+    with an updated_at earlier than a sync that ran before the commit.
+    Syncs read from replicas also miss changes that haven't replicated
+    yet, up to the replicas' allowed lag.
+    """
+    seconds = settings.sync_overlap_seconds
+    if get_read_replicas().enabled:
+        seconds += settings.replica_max_lag_seconds
+    return timedelta(seconds=seconds)
+
+
+async def sync_issues(
+    session: AsyncSession,
+    user_id: int,
+    token: SyncToken,
+    limit: int,
+) -> SyncPage:
+    """
+    A user's issues created or changed since a sync token, oldest change first
+
+    The first page of a sync also lists the user's issues archived since
+    the token, which should be dropped from the client's list. Issues
+    changed in the overlap window before the previous sync are sent
+    again; clients apply changes by id, so repeats are harmless.
+
+    Args:
+        session: Database session
+        user_id: Owner of the issues
+        token: Token from the previous page or sync (empty for a full sync)
+        limit: Maximum number of issues
+
+    Returns:
+        SyncPage: The changes and the token for the next page or sync
+    """
+    page = SyncPage()
+    if token.after is None:
+        now = (await session.exec(select(func.now()))).one()
+        seq = (await session.exec(select(func.coalesce(func.max(IssueEvent.seq), 0)))).one()
+        next_since = now - sync_overlap()
+        if token.since is not None:
+            archived = (
+                select(ArchivedIssue.id)
+                .join(IssueEvent, IssueEvent.issue_id == ArchivedIssue.id)
+                .where(
+                    ArchivedIssue.user_id == user_id,
+                    IssueEvent.event_type == IssueEventType.ARCHIVED,
+                    IssueEvent.seq > token.seq,
+                    IssueEvent.seq <= seq,
+                )
+                .distinct()
+            )
+            page.removed_ids = list((await session.exec(archived)).all())
+    else:
+        seq, next_since = token.seq, token.next_since
+
+    conditions = [Issue.user_id == user_id]
+    if token.since is not None:
+        conditions.append(Issue.updated_at > token.since)
+    if token.after is not None:
+        conditions.append(tuple_(Issue.updated_at, Issue.id) > tuple_(*token.after))
+    query = (
+        select(Issue)
+        .where(*conditions)
+        .options(selectinload(Issue.photos))
+        .order_by(Issue.updated_at, Issue.id)
+        .limit(limit + 1)
+    )
+    issues = list((await session.exec(query)).all())
+
+    page.has_more = len(issues) > limit
+    page.issues = issues[:limit]
+    if page.has_more:
+        last = page.issues[-1]
+        page.token = SyncToken(
+            since=token.since,
+            seq=seq,
+            next_since=next_since,
+            after=(last.updated_at, last.id),
+        )
+    else:
+        page.token = SyncToken(since=next_since, seq=seq)
+    return page
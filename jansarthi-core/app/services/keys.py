@@ -0,0 +1,175 @@
+"""JWT signing key ring with key rotation and JWKS publishing"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from jose import jwk
+from jose.backends.base import Key
+
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+# Asymmetric algorithms supported by python-jose
+ASYMMETRIC_ALGORITHMS = {"ES256", "ES384", "ES512", "RS256", "RS384", "RS512"}
+
+# Minimum time between key directory reloads triggered by an unknown kid
+RELOAD_INTERVAL_SECONDS = 60
+
+
+class KeyRing:
+    """
+    Holds the parsed keys used to sign and verify JWTs
+
+    For HMAC algorithms the shared secret is used and tokens carry no kid.
+    For asymmetric algorithms every ``<kid>.pem`` file in the keys directory
+    is loaded once and kept as a ready-to-use key object, so verifying a
+    token never re-parses PEM data. Private keys can sign and verify; files
+    holding only a public key are accepted for verification, which lets a
+    retired key keep validating tokens until they expire.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        keys_dir: Optional[str] = None,
+        active_kid: Optional[str] = None,
+    ):
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid
+        self._signing_keys: dict[str, Key] = {}
+        self._verification_keys: dict[str, Key] = {}
+        self._last_reload = 0.0
+        self._lock = threading.Lock()
+
+        if self.is_asymmetric:
+            self.reload()
+
+    @property
+    def is_asymmetric(self) -> bool:
+        """Whether tokens are signed with a private key"""
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def reload(self) -> None:
+        """
+        (Re)load all keys from the keys directory
+
+        Raises:
+            RuntimeError: If no usable signing key is configured
+        """
+        if not self.keys_dir:
+            raise RuntimeError(
+                f"JWT_KEYS_DIR must be set when JWT_ALGORITHM is {self.algorithm}"
+            )
+
+        signing_keys: dict[str, Key] = {}
+        verification_keys: dict[str, Key] = {}
+
+        for path in sorted(Path(self.keys_dir).glob("*.pem")):
+            kid = path.stem
+            pem = path.read_bytes()
+            try:
+                private_key = serialization.load_pem_private_key(pem, password=None)
+            except ValueError:
+                public_key = serialization.load_pem_public_key(pem)
+                verification_keys[kid] = jwk.construct(public_key, self.algorithm)
+                continue
+
+            signing_keys[kid] = jwk.construct(private_key, self.algorithm)
+            verification_keys[kid] = jwk.construct(
+                private_key.public_key(), self.algorithm
+            )
+
+        active_kid = self.active_kid or (max(signing_keys) if signing_keys else None)
+        if active_kid not in signing_keys:
+            raise RuntimeError(
+                f"No private key found for JWT kid '{active_kid}' in {self.keys_dir}"
+            )
+
+        with self._lock:
+            self._signing_keys = signing_keys
+            self._verification_keys = verification_keys
+            self.active_kid = active_kid
+            self._last_reload = time.monotonic()
+
+    def signing_key(self) -> tuple[Optional[str], Key | str]:
+        """
+        Get the key to sign new tokens with
+
+        Returns:
+            tuple: (kid, key) - kid is None for HMAC algorithms
+        """
+        if not self.is_asymmetric:
+            return None, self.secret_key
+        return self.active_kid, self._signing_keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key | str]:
+        """
+        Get the key to verify a token signed with the given kid
+
+        An unknown kid triggers a reload, at most once per
+        RELOAD_INTERVAL_SECONDS, so keys added during rotation are picked up
+        without a restart. If the reload fails (a half-written PEM file, no
+        signing key) the previous keys stay in use.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            Optional[Key | str]: Verification key, or None if the kid is unknown
+        """
+        if not self.is_asymmetric:
+            return self.secret_key
+        if kid is None:
+            return None
+
+        key = self._verification_keys.get(kid)
+        if key is None and time.monotonic() - self._last_reload > RELOAD_INTERVAL_SECONDS:
+            # Count the attempt even if it fails, so a broken keys directory
+            # isn't re-read on every request
+            self._last_reload = time.monotonic()
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep verifying with the keys we have; the token gets a 401
+                print(f"Reloading JWT keys from {self.keys_dir} failed: {e}")
+                return None
+            key = self._verification_keys.get(kid)
+        return key
+
+    def jwks(self) -> dict:
+        """
+        Get the public verification keys as a JWK Set
+
+        Returns:
+            dict: JWKS document (empty for HMAC algorithms)
+        """
+        keys = []
+        for kid, key in self._verification_keys.items():
+            public_jwk = key.to_dict()
+            public_jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(public_jwk)
+        return {"keys": keys}
+
+
+# Singleton instance
+_key_ring: KeyRing | None = None
+
+
+def get_key_ring() -> KeyRing:
+    """Get or create the JWT key ring instance"""
+    global _key_ring
+    if _key_ring is None:
+        _key_ring = KeyRing(
+            algorithm=settings.jwt_algorithm,
+            secret_key=settings.jwt_secret_key,
+            keys_dir=settings.jwt_keys_dir,
+            active_kid=settings.jwt_active_kid,
+        )
+    return _key_ring
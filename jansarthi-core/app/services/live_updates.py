@@ -0,0 +1,309 @@
+"""Pushes new and changed issues to WebSocket clients watching a map viewport"""
+
+import asyncio
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.database import AsyncSessionLocal, async_engine
+from app.models.issue import IssueStatus, IssueType
+from app.services.issue_events import EVENT_CHANNEL
+from app.services.metrics import Counter, Gauge
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+LIVE_SUBSCRIPTIONS = Gauge(
+    "live_subscriptions",
+    "Open live map subscriptions in this worker",
+)
+LIVE_MESSAGES = Counter(
+    "live_messages_total",
+    "Issue updates queued to live map subscribers",
+)
+LIVE_DROPPED = Counter(
+    "live_dropped_subscriptions_total",
+    "Live map subscribers disconnected for falling behind",
+)
+
+# Cell sizes in degrees, finest first. A viewport is indexed at the
+# finest level where it covers at most MAX_CELLS_PER_BOX cells, so a
+# street-level view sits in a few small cells and a whole-country view
+# in a few large ones.
+GRID_LEVELS = (0.05, 0.25, 1.0, 5.0, 30.0, 360.0)
+MAX_CELLS_PER_BOX = 16
+
+_EVENTS_SQL = text(
+    "SELECT e.seq, e.event_type, i.id, i.issue_type, i.latitude, i.longitude, i.status "
+    "FROM issue_events e JOIN issues i ON i.id = e.issue_id "
+    "WHERE e.seq > :after ORDER BY e.seq LIMIT :limit"
+)
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """Map viewport in degrees"""
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        return (
+            self.min_lat <= latitude <= self.max_lat
+            and self.min_lon <= longitude <= self.max_lon
+        )
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A client's viewport and filters, and its queue of outgoing messages"""
+
+    bbox: BoundingBox
+    issue_type: Optional[IssueType] = None
+    status: Optional[IssueStatus] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(settings.live_queue_size))
+    # Set when the client fell behind and should be disconnected
+    overflowed: bool = False
+
+    def matches(self, issue: dict[str, Any]) -> bool:
+        return (
+            self.bbox.contains(issue["latitude"], issue["longitude"])
+            and (self.issue_type is None or issue["issue_type"] == self.issue_type.value)
+            and (self.status is None or issue["status"] == self.status.value)
+        )
+
+
+def _cell(level: int, latitude: float, longitude: float) -> tuple[int, int, int]:
+    size = GRID_LEVELS[level]
+    return level, math.floor((latitude + 90) / size), math.floor((longitude + 180) / size)
+
+
+class GridIndex:
+    """
+    Multi-level grid of subscriptions by viewport
+
+    Each subscription is registered in the cells its bounding box
+    overlaps at one level. Finding the subscriptions that contain a
+    point looks up one cell per level in use, then checks the candidates'
+    exact boxes, instead of testing every subscription.
+    """
+
+    def __init__(self):
+        self._cells: dict[tuple[int, int, int], set[Subscription]] = {}
+        self._keys: dict[Subscription, list[tuple[int, int, int]]] = {}
+        # level -> number of subscriptions indexed at it
+        self._levels: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def insert(self, subscription: Subscription) -> None:
+        bbox = subscription.bbox
+        for level in range(len(GRID_LEVELS)):
+            _, lat_start, lon_start = _cell(level, bbox.min_lat, bbox.min_lon)
+            _, lat_end, lon_end = _cell(level, bbox.max_lat, bbox.max_lon)
+            cells = (lat_end - lat_start + 1) * (lon_end - lon_start + 1)
+            if cells <= MAX_CELLS_PER_BOX or level == len(GRID_LEVELS) - 1:
+                break
+        keys = [
+            (level, lat_index, lon_index)
+            for lat_index in range(lat_start, lat_end + 1)
+            for lon_index in range(lon_start, lon_end + 1)
+        ]
+        for key in keys:
+            self._cells.setdefault(key, set()).add(subscription)
+        self._keys[subscription] = keys
+        self._levels[level] = self._levels.get(level, 0) + 1
+
+    def remove(self, subscription: Subscription) -> bool:
+        keys = self._keys.pop(subscription, None)
+        if not keys:
+            return False
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.discard(subscription)
+                if not cell:
+                    del self._cells[key]
+        level = keys[0][0]
+        self._levels[level] -= 1
+        if not self._levels[level]:
+            del self._levels[level]
+        return True
+
+    def query(self, latitude: float, longitude: float) -> set[Subscription]:
+        """Subscriptions whose viewport contains a point"""
+        found = set()
+        for level in self._levels:
+            for subscription in self._cells.get(_cell(level, latitude, longitude), ()):
+                if subscription.bbox.contains(latitude, longitude):
+                    found.add(subscription)
+        return found
+
+
+class LiveUpdates:
+    """
+    Fan-out of issue changes to this worker's live map subscribers
+
+    Every worker LISTENs on the issue event channel, which is notified
+    in the transaction that appends to issue_events. On a notification
+    (or every ``poll_seconds``, in case one is missed or LISTEN isn't
+    available) the worker reads the events after the last seq it has
+    seen, joined with the issues' current map fields, and queues each to
+    the subscribers whose viewport and filters match. A change made
+    through any worker thus reaches subscribers on all of them, with one
+    query per worker per burst of changes.
+    """
+
+    def __init__(self, poll_seconds: float, max_subscriptions: int, batch_size: int = 1000):
+        self.poll_seconds = poll_seconds
+        self.max_subscriptions = max_subscriptions
+        self.batch_size = batch_size
+        self.index = GridIndex()
+        self._last_seq = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._listener: Any = None
+
+    def subscribe(self, subscription: Subscription) -> bool:
+        """Start sending matching changes; False if this worker is full"""
+        if len(self.index) >= self.max_subscriptions:
+            return False
+        self.index.insert(subscription)
+        LIVE_SUBSCRIPTIONS.inc()
+        return True
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if self.index.remove(subscription):
+            LIVE_SUBSCRIPTIONS.dec()
+
+    async def start(self) -> None:
+        """Start following the event log from its current end"""
+        self._wake = asyncio.Event()
+        async with AsyncSessionLocal() as session:
+            self._last_seq = (
+                await session.exec(text("SELECT COALESCE(MAX(seq), 0) FROM issue_events"))
+            ).scalar_one()
+        await self._listen()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        if async_engine.dialect.name != "postgresql":
+            return
+        # The pooled connections can't keep a LISTEN open, use a dedicated one
+        import asyncpg
+
+        url = make_url(settings.async_database_url).set(drivername="postgresql")
+        try:
+            self._listener = await asyncpg.connect(url.render_as_string(hide_password=False))
+            await self._listener.add_listener(EVENT_CHANNEL, self._notified)
+        except Exception as e:
+            self._listener = None
+            print(f"Live updates falling back to polling: {e}")
+
+    def _notified(self, connection, pid, channel, payload) -> None:
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                if self._listener is None or self._listener.is_closed():
+                    await self._listen()
+                await self.dispatch_new_events()
+            except Exception as e:
+                print(f"Live updates failed: {e}")
+
+    async def dispatch_new_events(self) -> None:
+        """Queue events after the last seen seq to matching subscribers"""
+        while True:
+            async with AsyncSessionLocal() as session:
+                rows = (await session.exec(
+                    _EVENTS_SQL, params={"after": self._last_seq, "limit": self.batch_size}
+                )).all()
+            if not rows:
+                return
+            self._last_seq = rows[-1].seq
+            if len(self.index):
+                for row in rows:
+                    self._publish(row)
+            if len(rows) < self.batch_size:
+                return
+
+    def _publish(self, row) -> None:
+        issue = {
+            "id": row.id,
+            "issue_type": getattr(row.issue_type, "value", row.issue_type),
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "status": getattr(row.status, "value", row.status),
+        }
+        message = {
+            "type": "issue",
+            "seq": row.seq,
+            "event": getattr(row.event_type, "value", row.event_type),
+            "issue": issue,
+        }
+        for subscription in self.index.query(issue["latitude"], issue["longitude"]):
+            if not subscription.matches(issue):
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+                LIVE_MESSAGES.inc()
+            except asyncio.QueueFull:
+                # Let the client reconnect and reload the map rather than
+                # buffer without bound or silently skip updates
+                if not subscription.overflowed:
+                    subscription.overflowed = True
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.queue.put_nowait(None)
+                    LIVE_DROPPED.inc()
+
+
+# Singleton instance
+_live_updates: LiveUpdates | None = None
+
+
+def get_live_updates() -> LiveUpdates:
+    """Get or create the live updates instance"""
+    global _live_updates
+    if _live_updates is None:
+        _live_updates = LiveUpdates(
+            poll_seconds=settings.live_poll_seconds,
+            max_subscriptions=settings.live_max_subscriptions,
+        )
+    return _live_updates
+
+
+async def send_updates(websocket: WebSocket, subscription: Subscription) -> None:
+    """Write a subscription's queued messages to its WebSocket until it overflows"""
+    try:
+        while True:
+            message = await subscription.queue.get()
+            if message is None:
+                await websocket.close(code=1013, reason="Fell behind, reload the map")
+                return
+            await websocket.send_json(message)
+    except (WebSocketDisconnect, RuntimeError):
+        # Client went away; the receiving side cleans up
+        return
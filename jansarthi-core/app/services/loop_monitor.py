@@ -0,0 +1,174 @@
+"""Event loop lag monitor with stack samples of stalls"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from types import CodeType, FrameType
+from typing import Optional
+
+from fastapi import FastAPI
+
+from app.services.metrics import Counter, Histogram
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the lag probe was due and when it ran",
+    buckets=LAG_BUCKETS,
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Event loop stalls over the threshold, by route",
+    ("route",),
+)
+LOOP_STALL_DURATION = Histogram(
+    "event_loop_stall_seconds",
+    "Duration of event loop stalls over the threshold, by route",
+    ("route",),
+    buckets=LAG_BUCKETS,
+)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class StallSample:
+    """A stall and the loop thread's stack while it was blocked"""
+
+    started_at: float
+    duration: float
+    route: str
+    stack: list[str]
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and samples the stack of long stalls
+
+    A probe task sleeps for ``interval_seconds`` and records how late it
+    woke up. A watchdog thread checks the probe's heartbeat; once the loop
+    has been blocked for longer than ``stall_threshold_seconds`` it grabs
+    the loop thread's current stack (``sys._current_frames``), which still
+    shows the code doing the blocking. The stall is attributed to the
+    route whose endpoint is on that stack, or else to the outermost
+    function of the app that is.
+
+    In steady state this costs one timer wake-up per interval on the loop
+    and one on the watchdog thread; stacks are only captured on stalls.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        stall_threshold_seconds: float,
+        max_samples: int = 100,
+    ):
+        self.interval_seconds = interval_seconds
+        self.stall_threshold_seconds = stall_threshold_seconds
+        self.samples: deque[StallSample] = deque(maxlen=max_samples)
+        self._routes: dict[CodeType, str] = {}
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        # (route, stack) captured by the watchdog for the stall in progress
+        self._pending: Optional[tuple[str, list[str]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self, app: FastAPI) -> None:
+        """Start the probe and the watchdog; call from the event loop thread"""
+        self._routes = {
+            route.endpoint.__code__: route.path
+            for route in app.routes
+            if hasattr(getattr(route, "endpoint", None), "__code__")
+        }
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the probe and the watchdog"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - start - self.interval_seconds)
+            LOOP_LAG.observe(lag)
+            if lag >= self.stall_threshold_seconds:
+                self._record_stall(now - lag, lag)
+
+    def _record_stall(self, started_at: float, duration: float) -> None:
+        pending, self._pending = self._pending, None
+        route, stack = pending or ("unknown", [])
+        LOOP_STALLS.inc(route=route)
+        LOOP_STALL_DURATION.observe(duration, route=route)
+        self.samples.append(StallSample(started_at, duration, route, stack))
+        print(f"Event loop blocked for {duration * 1000:.0f}ms in {route}")
+        if stack:
+            print("".join(stack).rstrip())
+
+    def _watch(self) -> None:
+        check_every = max(self.stall_threshold_seconds / 2, 0.01)
+        sampled_beat = None
+        while not self._stopped.wait(check_every):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval_seconds
+            # One sample per stall, taken while the loop is still blocked
+            if overdue >= self.stall_threshold_seconds and beat != sampled_beat:
+                sampled_beat = beat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending = (self._attribute(frame), self._format(frame))
+
+    def _attribute(self, frame: FrameType) -> str:
+        outermost_app_function = None
+        current: Optional[FrameType] = frame
+        while current is not None:
+            route = self._routes.get(current.f_code)
+            if route is not None:
+                return route
+            if current.f_code.co_filename.startswith(_APP_DIR):
+                outermost_app_function = current.f_code.co_name
+            current = current.f_back
+        return outermost_app_function or "unknown"
+
+    @staticmethod
+    def _format(frame: FrameType, limit: int = 20) -> list[str]:
+        return traceback.format_list(traceback.extract_stack(frame, limit=limit))
+
+
+# Singleton instance
+_loop_monitor: LoopMonitor | None = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get or create the event loop monitor instance"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor(
+            interval_seconds=settings.loop_monitor_interval_seconds,
+            stall_threshold_seconds=settings.loop_stall_threshold_seconds,
+        )
+    return _loop_monitor
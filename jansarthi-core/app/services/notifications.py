@@ -0,0 +1,221 @@
+"""Batched SMS notifications to reporters when their issues change status"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.database import SessionLocal
+from app.models.issue import Issue, IssueStatus, IssueType, User
+from app.services.metrics import Counter
+from app.services.sms_queue import get_sms_dispatcher
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+STATUS_CHANGES = Counter(
+    "notification_status_changes_total",
+    "Issue status changes recorded for notification",
+)
+DIGESTS_SENT = Counter(
+    "notification_digests_total",
+    "Status digest SMS queued, one per user per window",
+)
+
+STATUS_LABELS = {
+    IssueStatus.REPORTED: "Reported",
+    IssueStatus.PRADHAN_CHECK: "Under review by Pradhan",
+    IssueStatus.STARTED_WORKING: "Work started",
+    IssueStatus.FINISHED_WORK: "Work finished",
+}
+
+_SESSION_KEY = "issue_status_changes"
+
+
+@dataclass
+class StatusChange:
+    """Net status change of one issue within a notification window"""
+
+    issue_id: int
+    issue_type: IssueType
+    # Status before the first change in the window; None if it wasn't loaded
+    from_status: Optional[IssueStatus]
+    to_status: IssueStatus
+
+
+def digest_message(changes: list[StatusChange], max_items: int) -> str:
+    """Build the digest SMS body for one user"""
+    lines = ["Jansarthi: updates on your reports"]
+    for change in changes[:max_items]:
+        lines.append(
+            f"#{change.issue_id} {change.issue_type.value.title()}: "
+            f"{STATUS_LABELS[change.to_status]}"
+        )
+    if len(changes) > max_items:
+        lines.append(f"+{len(changes) - max_items} more")
+    return "\n".join(lines)
+
+
+class StatusNotifier:
+    """
+    Coalesces issue status changes into one digest SMS per user per window
+
+    A user's window opens with the first change to one of their issues and
+    closes ``window_seconds`` later; the periodic flush then sends one
+    digest covering every issue that changed. Changes to the same issue
+    within a window collapse to its net transition, and issues that end
+    the window where they started are left out.
+
+    Pending changes are held in process memory and flushed on shutdown.
+    With several worker processes, a user whose issues are updated through
+    different workers can get one digest per worker.
+    """
+
+    def __init__(self, window_seconds: float, batch_size: int, max_items: int):
+        self.window_seconds = window_seconds
+        self.batch_size = batch_size
+        self.max_items = max_items
+        # user_id -> (window opened at, {issue_id: change})
+        self._pending: dict[int, tuple[float, dict[int, StatusChange]]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        user_id: int,
+        issue_id: int,
+        issue_type: IssueType,
+        from_status: Optional[IssueStatus],
+        to_status: IssueStatus,
+    ) -> None:
+        """Add a committed status change to the reporter's pending digest"""
+        STATUS_CHANGES.inc()
+        with self._lock:
+            _, changes = self._pending.setdefault(user_id, (time.monotonic(), {}))
+            change = changes.get(issue_id)
+            if change is None:
+                changes[issue_id] = StatusChange(
+                    issue_id, issue_type, from_status, to_status
+                )
+            else:
+                change.to_status = to_status
+
+    def pending_users(self) -> int:
+        """Number of users with changes waiting to be sent"""
+        return len(self._pending)
+
+    def _take_due(self, force: bool) -> dict[int, list[StatusChange]]:
+        now = time.monotonic()
+        due = {}
+        with self._lock:
+            for user_id, (opened_at, changes) in list(self._pending.items()):
+                if force or now - opened_at >= self.window_seconds:
+                    del self._pending[user_id]
+                    net = [
+                        change
+                        for change in changes.values()
+                        if change.to_status != change.from_status
+                    ]
+                    if net:
+                        due[user_id] = sorted(net, key=lambda c: c.issue_id)
+        return due
+
+    async def flush(self, force: bool = False) -> None:
+        """
+        Send digests for users whose window has closed
+
+        Args:
+            force: Send everything pending regardless of window (shutdown)
+        """
+        due = self._take_due(force)
+        user_ids = list(due)
+        for start in range(0, len(user_ids), self.batch_size):
+            batch = user_ids[start:start + self.batch_size]
+            numbers = await asyncio.to_thread(self._lookup_numbers, batch)
+            messages = [
+                (numbers[user_id], digest_message(due[user_id], self.max_items))
+                for user_id in batch
+                if user_id in numbers
+            ]
+            await get_sms_dispatcher().enqueue_many(messages, kind="status_digest")
+            DIGESTS_SENT.inc(len(messages))
+
+    @staticmethod
+    def _lookup_numbers(user_ids: list[int]) -> dict[int, str]:
+        with SessionLocal() as session:
+            rows = session.exec(
+                select(User.id, User.mobile_number)
+                .where(User.id.in_(user_ids))
+                .where(User.is_active == True)
+            ).all()
+        return {user_id: mobile_number for user_id, mobile_number in rows}
+
+
+# Singleton instance
+_status_notifier: StatusNotifier | None = None
+
+
+def get_status_notifier() -> StatusNotifier:
+    """Get or create the status notifier instance"""
+    global _status_notifier
+    if _status_notifier is None:
+        _status_notifier = StatusNotifier(
+            window_seconds=settings.notification_window_seconds,
+            batch_size=settings.notification_batch_size,
+            max_items=settings.notification_max_items,
+        )
+    return _status_notifier
+
+
+async def flush_status_notifications() -> None:
+    """Periodic job: send digests whose window has closed"""
+    await get_status_notifier().flush()
+
+
+# Status changes are collected per session at flush time and only handed
+# to the notifier once the transaction commits, so rolled back updates
+# never notify anyone.
+
+@event.listens_for(Issue.status, "set", active_history=True)
+def _load_previous_status(target: Issue, value, oldvalue, initiator) -> None:
+    # Registering with active_history makes SQLAlchemy load an expired
+    # status before it's overwritten, so flush history has the old value
+    pass
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_status_changes(session: Session, flush_context) -> None:
+    if not settings.notifications_enabled:
+        return
+    for target in session.dirty:
+        if not isinstance(target, Issue) or target.user_id is None:
+            continue
+        history = inspect(target).attrs.status.history
+        if not history.added:
+            continue
+        session.info.setdefault(_SESSION_KEY, []).append((
+            target.user_id,
+            target.id,
+            target.issue_type,
+            history.deleted[0] if history.deleted else None,
+            history.added[0],
+        ))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_changes(session: Session) -> None:
+    changes = session.info.pop(_SESSION_KEY, None)
+    if not changes:
+        return
+    notifier = get_status_notifier()
+    for user_id, issue_id, issue_type, from_status, to_status in changes:
+        notifier.record(user_id, issue_id, issue_type, from_status, to_status)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,200 @@
+"""Pluggable storage for one-time passwords"""
+
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import SessionLocal
+from app.models.issue import OTP
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+
+class OTPStore(ABC):
+    """
+    Interface for OTP storage
+
+    Each mobile number has at most one active (unused) OTP: issuing a new
+    code replaces the previous one. Methods take the request's async
+    database session; changes are committed by the caller.
+    """
+
+    @abstractmethod
+    async def issue(self, session: AsyncSession, mobile_number: str, otp_code: str) -> OTP:
+        """
+        Store a new OTP for a mobile number, replacing any active one
+
+        Args:
+            session: Database session
+            mobile_number: Normalized mobile number
+            otp_code: Generated OTP code
+
+        Returns:
+            OTP: The stored OTP record
+        """
+
+    @abstractmethod
+    async def get_active(self, session: AsyncSession, mobile_number: str) -> Optional[OTP]:
+        """
+        Get the active (unused) OTP for a mobile number, expired or not
+
+        Args:
+            session: Database session
+            mobile_number: Normalized mobile number
+
+        Returns:
+            Optional[OTP]: The active OTP record, if any
+        """
+
+    @abstractmethod
+    async def record_failed_attempt(self, session: AsyncSession, otp: OTP) -> None:
+        """Count a wrong code entered for an OTP"""
+
+    @abstractmethod
+    async def mark_used(self, session: AsyncSession, otp: OTP) -> None:
+        """Mark an OTP as used so it can't be verified again"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """
+        Remove OTPs that expired more than the retention period ago
+
+        Returns:
+            int: Number of OTPs removed
+        """
+
+    @staticmethod
+    def _expiry() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.otp_expiry_minutes)
+
+    @staticmethod
+    def _purge_cutoff() -> datetime:
+        return datetime.now(timezone.utc) - timedelta(hours=settings.otp_retention_hours)
+
+
+class DatabaseOTPStore(OTPStore):
+    """OTPs in the otps table, looked up through the (mobile_number, is_used, created_at) index"""
+
+    async def issue(self, session: AsyncSession, mobile_number: str, otp_code: str) -> OTP:
+        # Superseded codes can never be verified, drop them
+        await session.exec(
+            delete(OTP)
+            .where(OTP.mobile_number == mobile_number)
+            .where(OTP.is_used == False)
+        )
+        otp = OTP(
+            mobile_number=mobile_number,
+            otp_code=otp_code,
+            expires_at=self._expiry(),
+            is_used=False
+        )
+        session.add(otp)
+        return otp
+
+    async def get_active(self, session: AsyncSession, mobile_number: str) -> Optional[OTP]:
+        result = await session.exec(
+            select(OTP)
+            .where(OTP.mobile_number == mobile_number)
+            .where(OTP.is_used == False)
+            .order_by(OTP.created_at.desc())
+            .limit(1)
+        )
+        return result.first()
+
+    async def record_failed_attempt(self, session: AsyncSession, otp: OTP) -> None:
+        otp.attempt_count += 1
+        session.add(otp)
+
+    async def mark_used(self, session: AsyncSession, otp: OTP) -> None:
+        otp.is_used = True
+        otp.used_at = datetime.now(timezone.utc)
+        session.add(otp)
+
+    def purge_expired(self) -> int:
+        with SessionLocal() as session:
+            result = session.exec(
+                delete(OTP).where(OTP.expires_at < self._purge_cutoff())
+            )
+            session.commit()
+            return result.rowcount
+
+
+class InMemoryOTPStore(OTPStore):
+    """
+    OTPs held in process memory with TTL expiry
+
+    Only suitable for a single worker process (development, load tests),
+    since an OTP issued by one worker can't be verified by another.
+    """
+
+    def __init__(self):
+        self._otps: dict[str, OTP] = {}
+        self._lock = threading.Lock()
+
+    async def issue(self, session: AsyncSession, mobile_number: str, otp_code: str) -> OTP:
+        now = datetime.now(timezone.utc)
+        otp = OTP(
+            mobile_number=mobile_number,
+            otp_code=otp_code,
+            expires_at=self._expiry(),
+            created_at=now,
+            is_used=False,
+            attempt_count=0
+        )
+        with self._lock:
+            self._otps[mobile_number] = otp
+        return otp
+
+    async def get_active(self, session: AsyncSession, mobile_number: str) -> Optional[OTP]:
+        otp = self._otps.get(mobile_number)
+        return otp if otp is not None and not otp.is_used else None
+
+    async def record_failed_attempt(self, session: AsyncSession, otp: OTP) -> None:
+        with self._lock:
+            otp.attempt_count += 1
+
+    async def mark_used(self, session: AsyncSession, otp: OTP) -> None:
+        with self._lock:
+            otp.is_used = True
+            otp.used_at = datetime.now(timezone.utc)
+
+    def purge_expired(self) -> int:
+        # Nothing to audit in memory, drop codes as soon as they expire
+        cutoff = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [
+                mobile_number
+                for mobile_number, otp in self._otps.items()
+                if otp.expires_at < cutoff
+            ]
+            for mobile_number in expired:
+                del self._otps[mobile_number]
+        return len(expired)
+
+
+# Singleton instance
+_otp_store: OTPStore | None = None
+
+
+def get_otp_store() -> OTPStore:
+    """Get or create the OTP store for the configured backend"""
+    global _otp_store
+    if _otp_store is None:
+        if settings.otp_store == "memory":
+            _otp_store = InMemoryOTPStore()
+        else:
+            _otp_store = DatabaseOTPStore()
+    return _otp_store
+
+
+def purge_expired_otps() -> None:
+    """Periodic job: remove expired OTPs"""
+    purged = get_otp_store().purge_expired()
+    if purged:
+        print(f"Purged {purged} expired OTPs")
@@ -0,0 +1,240 @@
+"""Token bucket rate limiting for OTP endpoints"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from fastapi import HTTPException, Request, status
+
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+# (key, limit, window_seconds)
+Rule = tuple[str, int, float]
+
+
+class RateLimitBackend(ABC):
+    """Interface for rate limit storage backends"""
+
+    @abstractmethod
+    async def hit(self, rules: list[Rule]) -> float:
+        """
+        Take one token from the bucket of every rule, or from none of them
+
+        Each bucket holds up to ``limit`` tokens and refills at
+        ``limit / window_seconds`` tokens per second. Tokens are only
+        taken if every bucket has one, so a request rejected by one rule
+        doesn't use up the others.
+
+        Args:
+            rules: List of (key, limit, window_seconds)
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until it would be
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process token buckets (limits apply to each worker separately)
+
+    At most ``max_keys`` buckets are kept. When the table is full,
+    buckets that have refilled completely are dropped (they carry no
+    state); if every bucket is still active, requests needing a new
+    bucket are rejected until the first of them refills. Live buckets
+    are never dropped, so cycling through many IPs or numbers can't
+    reset anyone's limits.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time, refill rate, capacity]
+        self._buckets: dict[str, list[float]] = {}
+        # While full of active buckets: monotonic time the first one refills
+        self._full_until = 0.0
+        self._lock = threading.Lock()
+
+    async def hit(self, rules: list[Rule]) -> float:
+        now = time.monotonic()
+
+        with self._lock:
+            buckets = []
+            retry_after = 0.0
+            for key, limit, window_seconds in rules:
+                rate = limit / window_seconds
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    if len(self._buckets) >= self.max_keys:
+                        wait = self._make_room(now)
+                        if wait > 0:
+                            return wait
+                    bucket = self._buckets[key] = [float(limit), now, rate, float(limit)]
+                else:
+                    bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * rate)
+                    bucket[1] = now
+                buckets.append(bucket)
+                if bucket[0] < 1:
+                    retry_after = max(retry_after, (1 - bucket[0]) / rate)
+
+            if retry_after > 0:
+                return retry_after
+            for bucket in buckets:
+                bucket[0] -= 1
+            return 0.0
+
+    def _make_room(self, now: float) -> float:
+        """
+        Drop buckets that have refilled completely
+
+        Returns:
+            float: 0 if there is room for a new bucket, otherwise seconds
+            until the first active bucket refills
+        """
+        if now < self._full_until:
+            return self._full_until - now
+        refilled = []
+        first_refill = float("inf")
+        for key, (tokens, last, rate, capacity) in self._buckets.items():
+            missing = capacity - (tokens + (now - last) * rate)
+            if missing <= 0:
+                refilled.append(key)
+            else:
+                first_refill = min(first_refill, missing / rate)
+        for key in refilled:
+            del self._buckets[key]
+        if len(self._buckets) < self.max_keys:
+            return 0.0
+        print(f"Rate limit table full ({self.max_keys} active buckets), rejecting new clients")
+        self._full_until = now + first_refill
+        return first_refill
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token buckets shared by all workers through Redis"""
+
+    # Refill every bucket, then take a token from each only if all have
+    # one; returns the wait in seconds. ARGV: now, then capacity and rate
+    # per key
+    SCRIPT = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local available = tokens[i]
+    if retry_after == 0 then
+        available = available - 1
+    end
+    redis.call('HSET', key, 'tokens', available, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate))
+end
+return tostring(retry_after)
+"""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package "
+                "(pip install jansarthi-core[redis])"
+            ) from e
+
+        self.client = redis_asyncio.from_url(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    async def hit(self, rules: list[Rule]) -> float:
+        args: list[float] = [time.time()]
+        for _, limit, window_seconds in rules:
+            args += [limit, limit / window_seconds]
+        retry_after = await self._script(
+            keys=[f"ratelimit:{key}" for key, _, _ in rules],
+            args=args,
+        )
+        return float(retry_after)
+
+
+class RateLimiter:
+    """Applies rate limit rules and turns violations into HTTP 429 errors"""
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    async def enforce(self, rules: list[Rule]) -> None:
+        """
+        Take a token for every rule, or fail without taking any
+
+        Args:
+            rules: List of (key, limit, window_seconds); a limit of 0 or
+                less disables the rule
+
+        Raises:
+            HTTPException: 429 with a Retry-After header if a limit is hit
+        """
+        rules = [rule for rule in rules if rule[1] > 0]
+        if not rules:
+            return
+        retry_after = await self.backend.hit(rules)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, round(retry_after + 0.5)))},
+            )
+
+
+def client_ip(request: Request) -> str:
+    """Get the client IP, honouring X-Forwarded-For only behind a trusted proxy"""
+    if settings.trust_proxy_headers:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_otp_send_limit(request: Request, mobile_number: str) -> None:
+    """Limit OTP sends (signup, login, resend) per mobile number and per client IP"""
+    window = settings.otp_send_window_seconds
+    await get_rate_limiter().enforce([
+        (f"otp-send:ip:{client_ip(request)}", settings.otp_send_limit_per_ip, window),
+        (f"otp-send:number:{mobile_number}", settings.otp_send_limit_per_number, window),
+    ])
+
+
+async def enforce_otp_verify_limit(request: Request, mobile_number: str) -> None:
+    """Limit OTP verification attempts per mobile number and per client IP"""
+    window = settings.otp_verify_window_seconds
+    await get_rate_limiter().enforce([
+        (f"otp-verify:ip:{client_ip(request)}", settings.otp_verify_limit_per_ip, window),
+        (f"otp-verify:number:{mobile_number}", settings.otp_verify_limit_per_number, window),
+    ])
+
+
+# Singleton instance
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the rate limiter for the configured backend"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        if settings.rate_limit_backend == "redis":
+            backend: RateLimitBackend = RedisRateLimitBackend(settings.redis_url)
+        else:
+            backend = InMemoryRateLimitBackend()
+        _rate_limiter = RateLimiter(backend)
+    return _rate_limiter
@@ -0,0 +1,311 @@
+"""Routing of read-only queries to Postgres read replicas"""
+
+import asyncio
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import AsyncSessionLocal, make_async_engine
+from app.services.auth import AuthService
+from app.services.metrics import Counter, Gauge
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+READ_ROUTES = Counter(
+    "db_read_sessions_total",
+    "Read-only sessions by target (replica, primary, pinned, failover)",
+    ("target",),
+)
+REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "Whether a read replica is used for reads (1) or skipped (0)",
+    ("replica",),
+)
+REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag reported by the last health check",
+    ("replica",),
+)
+
+# Zero when the replica has replayed everything it received, so an idle
+# primary doesn't show up as growing lag
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    """A read replica's engine, session factory and health state"""
+
+    def __init__(self, url: str):
+        parsed = make_url(url).set(drivername="postgresql+asyncpg")
+        self.name = f"{parsed.host}:{parsed.port or 5432}"
+        self.engine: AsyncEngine = make_async_engine(parsed, f"replica:{self.name}")
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        # Replicas start out unused until the first health check passes
+        self.healthy = False
+        REPLICA_HEALTHY.set(0, replica=self.name)
+
+    def mark(self, healthy: bool, reason: str = "") -> None:
+        if healthy != self.healthy:
+            print(f"Read replica {self.name} {'healthy' if healthy else 'unhealthy'} {reason}".rstrip())
+        self.healthy = healthy
+        REPLICA_HEALTHY.set(1 if healthy else 0, replica=self.name)
+
+
+class PinStore(ABC):
+    """Interface for where read-your-writes pins are kept"""
+
+    @abstractmethod
+    async def pin(self, user_ids: list[int], seconds: float) -> None:
+        """Pin users' reads to the primary for ``seconds``"""
+
+    @abstractmethod
+    async def is_pinned(self, user_id: int) -> bool:
+        """Whether a user's reads currently have to go to the primary"""
+
+    def may_have_pins(self) -> bool:
+        """False when no user can be pinned, so requests skip the lookup"""
+        return True
+
+
+class InMemoryPinStore(PinStore):
+    """Per-process pins (a worker doesn't see pins set by the others)"""
+
+    def __init__(self, max_users: int = 10_000):
+        self.max_users = max_users
+        # user_id -> monotonic time the pin expires
+        self._pinned: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    async def pin(self, user_ids: list[int], seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pinned) > self.max_users:
+                self._pinned = {
+                    pinned_user_id: until
+                    for pinned_user_id, until in self._pinned.items()
+                    if until > now
+                }
+            for user_id in user_ids:
+                self._pinned[user_id] = now + seconds
+
+    async def is_pinned(self, user_id: int) -> bool:
+        until = self._pinned.get(user_id)
+        if until is None:
+            return False
+        if until > time.monotonic():
+            return True
+        with self._lock:
+            if self._pinned.get(user_id, 0) <= time.monotonic():
+                self._pinned.pop(user_id, None)
+        return False
+
+    def may_have_pins(self) -> bool:
+        return bool(self._pinned)
+
+
+class RedisPinStore(PinStore):
+    """Pins shared by all workers through Redis keys that expire with the pin"""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "READ_YOUR_WRITES_BACKEND=redis requires the 'redis' package "
+                "(pip install jansarthi-core[redis])"
+            ) from e
+
+        self.client = redis_asyncio.from_url(url)
+
+    async def pin(self, user_ids: list[int], seconds: float) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for user_id in user_ids:
+                    pipeline.set(f"read-pin:{user_id}", 1, px=int(seconds * 1000))
+                await pipeline.execute()
+        except Exception as e:
+            # The write itself succeeded; only read-your-writes is lost
+            print(f"Error pinning reads to the primary: {e}")
+
+    async def is_pinned(self, user_id: int) -> bool:
+        try:
+            return bool(await self.client.exists(f"read-pin:{user_id}"))
+        except Exception:
+            # Unknown: the primary is always up to date
+            return True
+
+
+class ReadReplicas:
+    """
+    Picks the database session for read-only requests
+
+    Reads are spread round-robin over replicas that passed their last
+    health check (reachable, replication lag under ``max_lag_seconds``).
+    A replica that fails to hand out a connection is marked unhealthy on
+    the spot and the next one is tried; with none left, reads go to the
+    primary.
+
+    Read-your-writes: after ``pin_to_primary(user_id, ...)`` those users'
+    reads go to the primary for ``pin_seconds``, so they see what was
+    just written regardless of replication lag. Pins are kept in
+    ``pins``; with several workers that has to be a shared store
+    (RedisPinStore), since the next request may reach another worker.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        max_lag_seconds: float,
+        pin_seconds: float,
+        pins: Optional[PinStore] = None,
+    ):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.pin_seconds = pin_seconds
+        self.pins = pins or InMemoryPinStore()
+        self._next = itertools.cycle(range(len(self.replicas) or 1))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def pin_to_primary(self, *user_ids: Optional[int]) -> None:
+        """Send users' reads to the primary for the read-your-writes window"""
+        if not self.enabled or self.pin_seconds <= 0:
+            return
+        user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+        if user_ids:
+            await self.pins.pin(user_ids, self.pin_seconds)
+
+    async def is_pinned(self, user_id: int) -> bool:
+        """Whether a user's reads currently have to go to the primary"""
+        return await self.pins.is_pinned(user_id)
+
+    def has_pins(self) -> bool:
+        return self.pins.may_have_pins()
+
+    async def open_session(self, pinned: bool = False) -> AsyncSession:
+        """
+        Open a session on a healthy replica, or on the primary
+
+        Args:
+            pinned: Skip the replicas (read-your-writes)
+
+        Returns:
+            AsyncSession: A session with a connection already checked out
+        """
+        if pinned:
+            READ_ROUTES.inc(target="pinned")
+            return AsyncSessionLocal()
+
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next)]
+            if not replica.healthy:
+                continue
+            session = replica.sessionmaker()
+            try:
+                # Check out (and pre-ping) a connection now, so a dead
+                # replica fails over instead of failing the request
+                await session.connection()
+            except Exception as e:
+                await session.close()
+                replica.mark(False, f"({e.__class__.__name__})")
+                continue
+            READ_ROUTES.inc(target="replica")
+            return session
+
+        READ_ROUTES.inc(target="failover" if self.enabled else "primary")
+        return AsyncSessionLocal()
+
+    async def check_health(self) -> None:
+        """Periodic job: measure each replica's lag and update its health"""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as connection:
+                lag = float(
+                    await asyncio.wait_for(
+                        connection.scalar(REPLICATION_LAG_SQL), timeout=5
+                    )
+                )
+        except Exception as e:
+            replica.mark(False, f"({e.__class__.__name__})")
+            return
+
+        REPLICA_LAG.set(lag, replica=replica.name)
+        if lag > self.max_lag_seconds:
+            replica.mark(False, f"(lag {lag:.1f}s)")
+        else:
+            replica.mark(True)
+
+    async def dispose(self) -> None:
+        """Close all replica connection pools"""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+# Singleton instance
+_read_replicas: ReadReplicas | None = None
+
+
+def get_read_replicas() -> ReadReplicas:
+    """Get or create the read replica router"""
+    global _read_replicas
+    if _read_replicas is None:
+        urls = settings.database_replica_urls
+        if urls and settings.read_your_writes_backend == "redis":
+            pins: PinStore = RedisPinStore(settings.redis_url)
+        else:
+            pins = InMemoryPinStore()
+        _read_replicas = ReadReplicas(
+            urls=urls,
+            max_lag_seconds=settings.replica_max_lag_seconds,
+            pin_seconds=settings.read_your_writes_seconds,
+            pins=pins,
+        )
+    return _read_replicas
+
+
+def _request_user_id(request: Request) -> Optional[int]:
+    """User ID from the bearer token, without hitting the database"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return AuthService.verify_token(token, token_type="access").user_id
+    except Exception:
+        return None
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency for a read-only database session (replica when possible)"""
+    read_replicas = get_read_replicas()
+    pinned = False
+    if read_replicas.enabled and read_replicas.has_pins():
+        user_id = _request_user_id(request)
+        pinned = user_id is not None and await read_replicas.is_pinned(user_id)
+
+    session = await read_replicas.open_session(pinned)
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,207 @@
+"""
+Fast JSON responses for the issue list and map endpoints
+
+Returning a Pydantic model from a route costs two passes per issue: the
+route builds the response model from ORM objects, then FastAPI validates
+it again against ``response_model`` before dumping it. The endpoints
+here instead copy rows into slotted dataclasses and hand them to orjson,
+which serializes dataclasses, enums and datetimes natively. Returning a
+Response skips FastAPI's response validation; ``response_model`` stays on
+the routes for the OpenAPI schema.
+
+The map endpoint can also answer in a columnar format (see
+``columnar_map``) for clients that ask for it in their Accept header.
+
+The dataclasses mirror ``IssueResponse``, ``IssuePhotoResponse`` and
+``IssueMapResponse`` field for field, and have to be kept in step with
+them.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Iterable, Optional
+
+import orjson
+from fastapi.responses import Response
+
+from app.models.issue import IssueStatus, IssueType
+
+# Accept/Content-Type for the columnar map payload
+MAP_COLUMNAR_MEDIA_TYPE = "application/vnd.jansarthi.map+json"
+
+# Decimal places kept in columnar coordinates (0.11 m at the equator)
+COORDINATE_PRECISION = 6
+
+_ISSUE_TYPE_CODES = {issue_type: code for code, issue_type in enumerate(IssueType)}
+_STATUS_CODES = {issue_status: code for code, issue_status in enumerate(IssueStatus)}
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # Z for UTC, as Pydantic writes it
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+@dataclass(slots=True)
+class PhotoRow:
+    id: int
+    photo_url: str
+    filename: str
+    file_size: int
+    content_type: str
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class IssueRow:
+    id: int
+    issue_type: IssueType
+    description: str
+    latitude: float
+    longitude: float
+    status: IssueStatus
+    user_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    photos: list[PhotoRow]
+
+
+@dataclass(slots=True)
+class MapIssueRow:
+    id: int
+    issue_type: IssueType
+    latitude: float
+    longitude: float
+    status: IssueStatus
+
+
+def issue_rows(issues: Iterable[Any], storage_service: Any) -> list[IssueRow]:
+    """
+    Copy issues with their photos loaded into response rows
+
+    Args:
+        issues: Issue or ArchivedIssue objects
+        storage_service: Used to turn photo object names into URLs
+
+    Returns:
+        list[IssueRow]: One row per issue, with photo URLs filled in
+    """
+    get_file_url = storage_service.get_file_url
+    return [
+        IssueRow(
+            issue.id,
+            issue.issue_type,
+            issue.description,
+            issue.latitude,
+            issue.longitude,
+            issue.status,
+            issue.user_id,
+            issue.created_at,
+            issue.updated_at,
+            [
+                PhotoRow(
+                    photo.id,
+                    get_file_url(photo.photo_url),
+                    photo.filename,
+                    photo.file_size,
+                    photo.content_type,
+                    photo.created_at,
+                )
+                for photo in issue.photos
+            ],
+        )
+        for issue in issues
+    ]
+
+
+def map_issue_rows(rows: Iterable[tuple]) -> list[MapIssueRow]:
+    """Response rows from (id, issue_type, latitude, longitude, status) tuples"""
+    return [MapIssueRow(*row) for row in rows]
+
+
+def _media_ranges(accept: str) -> dict[str, float]:
+    """Media ranges of an Accept header with their q-values"""
+    ranges = {}
+    for part in accept.lower().split(","):
+        media_range, *params = part.split(";")
+        media_range = media_range.strip()
+        if not media_range:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges[media_range] = max(q, ranges.get(media_range, 0.0))
+    return ranges
+
+
+def wants_columnar_map(accept: Optional[str]) -> bool:
+    """
+    Whether an Accept header prefers the columnar map payload
+
+    The columnar type has to be listed explicitly and with a higher q than
+    application/json gets (from its own entry, or else application/* or
+    */*); ties and q=0 get the default JSON.
+    """
+    if not accept:
+        return False
+    ranges = _media_ranges(accept)
+    columnar_q = ranges.get(MAP_COLUMNAR_MEDIA_TYPE, 0.0)
+    if columnar_q <= 0:
+        return False
+    for media_range in ("application/json", "application/*", "*/*"):
+        if media_range in ranges:
+            return columnar_q > ranges[media_range]
+    return True
+
+
+def columnar_map(rows: Iterable[tuple]) -> dict[str, Any]:
+    """
+    Map payload as parallel arrays instead of one object per issue
+
+    Issues are sorted by id. ``id``, ``latitude`` and ``longitude`` are
+    delta encoded: each value is the difference from the previous issue's
+    (the first from 0), and coordinates are integers in units of
+    10^-precision degrees. ``issue_type`` and ``status`` are indexes into
+    the ``issue_types`` and ``statuses`` lists sent with them.
+
+    Args:
+        rows: (id, issue_type, latitude, longitude, status) tuples
+
+    Returns:
+        dict[str, Any]: The payload
+    """
+    scale = 10**COORDINATE_PRECISION
+    ids, issue_types, latitudes, longitudes, statuses = [], [], [], [], []
+    last_id = last_latitude = last_longitude = 0
+    for issue_id, issue_type, latitude, longitude, issue_status in sorted(
+        rows, key=itemgetter(0)
+    ):
+        latitude = round(latitude * scale)
+        longitude = round(longitude * scale)
+        ids.append(issue_id - last_id)
+        latitudes.append(latitude - last_latitude)
+        longitudes.append(longitude - last_longitude)
+        issue_types.append(_ISSUE_TYPE_CODES[issue_type])
+        statuses.append(_STATUS_CODES[issue_status])
+        last_id, last_latitude, last_longitude = issue_id, latitude, longitude
+    return {
+        "count": len(ids),
+        "precision": COORDINATE_PRECISION,
+        "issue_types": [issue_type.value for issue_type in IssueType],
+        "statuses": [issue_status.value for issue_status in IssueStatus],
+        "id": ids,
+        "issue_type": issue_types,
+        "latitude": latitudes,
+        "longitude": longitudes,
+        "status": statuses,
+    }
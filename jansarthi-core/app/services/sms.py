@@ -0,0 +1,238 @@
+"""SMS provider interface, circuit breaker and provider selection"""
+
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+
+from app.services.metrics import Counter, Gauge, Histogram
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+SMS_REQUESTS = Counter(
+    "sms_provider_requests_total",
+    "SMS send attempts by provider and outcome",
+    ("provider", "outcome"),
+)
+SMS_LATENCY = Histogram(
+    "sms_provider_latency_seconds",
+    "Time spent in provider send calls",
+    ("provider",),
+)
+SMS_CIRCUIT_STATE = Gauge(
+    "sms_provider_circuit_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("provider",),
+)
+
+
+class SMSDeliveryError(Exception):
+    """Raised when an SMS could not be handed to the provider"""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        # Permanent errors (e.g. invalid number) are not worth retrying
+        self.permanent = permanent
+
+
+class SMSProviderUnavailable(SMSDeliveryError):
+    """Raised without calling the provider while its circuit is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("SMS provider is temporarily unavailable")
+        self.retry_after = retry_after
+
+
+class SMSProvider(ABC):
+    """Interface for SMS providers"""
+
+    name = "base"
+
+    @abstractmethod
+    def send(self, to_number: str, body: str) -> str:
+        """
+        Send an SMS (blocking)
+
+        Args:
+            to_number: Recipient phone number in E.164 format
+            body: Message text
+
+        Returns:
+            str: Provider message ID
+
+        Raises:
+            SMSDeliveryError: If the message could not be sent
+        """
+
+    def available(self) -> bool:
+        """Whether the provider is currently accepting requests"""
+        return True
+
+
+class FakeSMSProvider(SMSProvider):
+    """In-process stand-in provider, for local development, tests and benchmarks"""
+
+    name = "fake"
+
+    def __init__(self, latency_ms: float = 0, failure_rate: float = 0):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        # Most recent messages as (to_number, body), newest last
+        self.sent: deque[tuple[str, str]] = deque(maxlen=1000)
+
+    def send(self, to_number: str, body: str) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise SMSDeliveryError("Simulated provider failure")
+
+        self.sent.append((to_number, body))
+        return f"FAKE{uuid.uuid4().hex}"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    Closed: calls go through. After ``failure_threshold`` failures in a row
+    it opens and rejects calls for ``reset_timeout_seconds``, then lets a
+    single trial call through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        SMS_CIRCUIT_STATE.set(0, provider=name)
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout_seconds - time.monotonic())
+
+    def is_open(self) -> bool:
+        """Whether calls would currently be rejected"""
+        return self.state == self.OPEN and self.retry_after() > 0
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, taking the half-open trial slot if needed"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.retry_after() > 0:
+                    return False
+                self._set_state(self.HALF_OPEN)
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a call that reached the provider"""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed or timed out call"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        SMS_CIRCUIT_STATE.set(
+            {self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}[state], provider=self.name
+        )
+        print(f"SMS provider {self.name} circuit {state}")
+
+
+class ResilientSMSProvider(SMSProvider):
+    """Wraps a provider with a circuit breaker and latency/error metrics"""
+
+    def __init__(self, provider: SMSProvider, breaker: CircuitBreaker):
+        self.provider = provider
+        self.breaker = breaker
+        self.name = provider.name
+
+    def available(self) -> bool:
+        return not self.breaker.is_open()
+
+    def send(self, to_number: str, body: str) -> str:
+        if not self.breaker.allow_request():
+            SMS_REQUESTS.inc(provider=self.name, outcome="circuit_open")
+            raise SMSProviderUnavailable(self.breaker.retry_after())
+
+        start = time.perf_counter()
+        try:
+            message_id = self.provider.send(to_number, body)
+        except SMSDeliveryError as e:
+            SMS_LATENCY.observe(time.perf_counter() - start, provider=self.name)
+            if e.permanent:
+                # The provider answered, the request was bad
+                self.breaker.record_success()
+                SMS_REQUESTS.inc(provider=self.name, outcome="rejected")
+            else:
+                self.breaker.record_failure()
+                SMS_REQUESTS.inc(provider=self.name, outcome="error")
+            raise
+
+        SMS_LATENCY.observe(time.perf_counter() - start, provider=self.name)
+        self.breaker.record_success()
+        SMS_REQUESTS.inc(provider=self.name, outcome="success")
+        return message_id
+
+
+# Singleton instance
+_sms_provider: SMSProvider | None = None
+
+
+def get_sms_provider() -> SMSProvider:
+    """Get or create the configured SMS provider, wrapped with a circuit breaker"""
+    global _sms_provider
+    if _sms_provider is None:
+        if settings.sms_provider == "fake":
+            provider: SMSProvider = FakeSMSProvider(
+                latency_ms=settings.fake_sms_latency_ms,
+                failure_rate=settings.fake_sms_failure_rate,
+            )
+        else:
+            from app.services.twilio import TwilioSMSProvider
+
+            provider = TwilioSMSProvider(
+                account_sid=settings.twilio_account_sid,
+                auth_token=settings.twilio_auth_token,
+                from_number=settings.twilio_from_number,
+                timeout_seconds=settings.sms_provider_timeout_seconds,
+                pool_maxsize=settings.twilio_pool_maxsize,
+                max_retries=settings.twilio_max_retries,
+            )
+        _sms_provider = ResilientSMSProvider(
+            provider,
+            CircuitBreaker(
+                provider.name,
+                failure_threshold=settings.sms_circuit_failure_threshold,
+                reset_timeout_seconds=settings.sms_circuit_reset_seconds,
+            ),
+        )
+    return _sms_provider
@@ -0,0 +1,348 @@
+"""Outbound SMS queue with a persisted outbox, worker pool and retries"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.database import SessionLocal
+from app.models.issue import MessageStatus, OutboundMessage
+from app.services.sms import (
+    SMSDeliveryError,
+    SMSProvider,
+    SMSProviderUnavailable,
+    get_sms_provider,
+)
+from app.services.twilio import otp_message, welcome_message
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+
+class SMSDispatcher:
+    """
+    Sends SMS from a bounded pool of worker threads, off the event loop
+
+    Every message is written to the outbound_messages table before it is
+    queued, so nothing is lost if the process dies. A row is "leased" by
+    pushing its next_attempt_at into the future while a worker owns it;
+    the outbox poller only picks up pending rows whose lease has run out,
+    which covers crashes and messages queued by other workers.
+    """
+
+    def __init__(
+        self,
+        provider: SMSProvider,
+        workers: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        lease_seconds: float,
+    ):
+        self.provider = provider
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._waiters: dict[int, asyncio.Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the worker pool"""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="sms"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the worker pool; queued messages stay pending in the outbox"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def enqueue(
+        self, to_number: str, body: str, kind: str, wait_seconds: float = 0
+    ) -> bool:
+        """
+        Persist a message and queue it for delivery
+
+        Args:
+            to_number: Recipient phone number
+            body: Message text
+            kind: Message kind stored in the outbox ("otp", "welcome", ...)
+            wait_seconds: How long to wait for the first delivery attempt
+
+        Returns:
+            bool: False if delivery failed permanently within wait_seconds,
+                True if it was sent or is still queued for (re)delivery
+        """
+        message_id = await asyncio.to_thread(self._persist, to_number, body, kind)
+
+        future = None
+        if wait_seconds > 0:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[message_id] = future
+
+        self._queue.put_nowait(message_id)
+        if future is None:
+            return True
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), wait_seconds)
+        except asyncio.TimeoutError:
+            return True
+        finally:
+            self._waiters.pop(message_id, None)
+
+    async def enqueue_many(self, messages: list[tuple[str, str]], kind: str) -> None:
+        """
+        Persist several messages in one transaction and queue them, without waiting
+
+        Args:
+            messages: (to_number, body) pairs
+            kind: Message kind stored in the outbox
+        """
+        if not messages:
+            return
+        message_ids = await asyncio.to_thread(self._persist_many, messages, kind)
+        for message_id in message_ids:
+            self._queue.put_nowait(message_id)
+
+    async def send_otp(self, to_number: str, otp_code: str) -> bool:
+        """
+        Queue an OTP SMS, waiting up to the OTP latency budget for delivery
+        
+        Raises:
+            HTTPException: 503 right away while the provider's circuit is open
+        """
+        if not self.provider.available():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="SMS service is temporarily unavailable. Please try again later.",
+                headers={"Retry-After": str(int(settings.sms_circuit_reset_seconds))},
+            )
+        return await self.enqueue(
+            to_number,
+            otp_message(otp_code),
+            kind="otp",
+            wait_seconds=settings.sms_otp_latency_budget_seconds,
+        )
+
+    async def send_welcome_message(self, to_number: str, name: str) -> None:
+        """Queue a welcome SMS without waiting for delivery"""
+        await self.enqueue(to_number, welcome_message(name), kind="welcome")
+
+    async def recover_due_messages(self) -> None:
+        """Periodic job: queue pending messages whose lease has expired"""
+        for message_id in await asyncio.to_thread(self._claim_due):
+            self._queue.put_nowait(message_id)
+
+    async def _worker(self) -> None:
+        while True:
+            message_id = await self._queue.get()
+            try:
+                await self._deliver(message_id)
+            except Exception as e:
+                print(f"Error delivering SMS {message_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, message_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        claimed = await asyncio.to_thread(self._claim, message_id)
+        if claimed is None:
+            return
+        to_number, body, attempts = claimed
+        attempts += 1
+
+        try:
+            provider_message_id = await loop.run_in_executor(
+                self._executor, self.provider.send, to_number, body
+            )
+        except SMSProviderUnavailable as e:
+            # The provider was never called, so this doesn't use up an attempt
+            delay = max(e.retry_after, 1.0) * random.uniform(1.0, 1.5)
+            await asyncio.to_thread(
+                self._record_failure, message_id, attempts - 1, str(e), delay
+            )
+            loop.call_later(delay, self._queue.put_nowait, message_id)
+            return
+        except SMSDeliveryError as e:
+            if e.permanent or attempts >= self.max_attempts:
+                await asyncio.to_thread(
+                    self._record_failure, message_id, attempts, str(e), None
+                )
+                self._resolve(message_id, False)
+                return
+
+            delay = min(
+                self.retry_max_seconds,
+                self.retry_base_seconds * 2 ** (attempts - 1),
+            ) * random.uniform(0.8, 1.2)
+            await asyncio.to_thread(
+                self._record_failure, message_id, attempts, str(e), delay
+            )
+            loop.call_later(delay, self._queue.put_nowait, message_id)
+            return
+
+        await asyncio.to_thread(
+            self._record_success, message_id, attempts, provider_message_id
+        )
+        self._resolve(message_id, True)
+
+    def _resolve(self, message_id: int, sent: bool) -> None:
+        future = self._waiters.get(message_id)
+        if future is not None and not future.done():
+            future.set_result(sent)
+
+    def _lease_until(self, delay_seconds: float = 0) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(
+            seconds=delay_seconds + self.lease_seconds
+        )
+
+    def _persist(self, to_number: str, body: str, kind: str) -> int:
+        with SessionLocal() as session:
+            message = OutboundMessage(
+                to_number=to_number,
+                body=body,
+                kind=kind,
+                status=MessageStatus.PENDING,
+                next_attempt_at=self._lease_until(),
+            )
+            session.add(message)
+            # Read the id before commit expires the object (which would
+            # cost another SELECT to refresh it)
+            session.flush()
+            message_id = message.id
+            session.commit()
+            return message_id
+
+    def _persist_many(self, messages: list[tuple[str, str]], kind: str) -> list[int]:
+        with SessionLocal() as session:
+            rows = [
+                OutboundMessage(
+                    to_number=to_number,
+                    body=body,
+                    kind=kind,
+                    status=MessageStatus.PENDING,
+                    next_attempt_at=self._lease_until(),
+                )
+                for to_number, body in messages
+            ]
+            session.add_all(rows)
+            session.flush()
+            message_ids = [row.id for row in rows]
+            session.commit()
+            return message_ids
+
+    def _claim(self, message_id: int) -> Optional[tuple[str, str, int]]:
+        """Renew the lease on a pending message; None if it's no longer pending"""
+        with SessionLocal() as session:
+            message = session.exec(
+                select(OutboundMessage)
+                .where(OutboundMessage.id == message_id)
+                .with_for_update()
+            ).first()
+            if message is None or message.status != MessageStatus.PENDING:
+                return None
+            message.next_attempt_at = self._lease_until()
+            session.add(message)
+            claimed = message.to_number, message.body, message.attempts
+            session.commit()
+            return claimed
+
+    def _claim_due(self, limit: int = 100) -> list[int]:
+        with SessionLocal() as session:
+            messages = session.exec(
+                select(OutboundMessage)
+                .where(OutboundMessage.status == MessageStatus.PENDING)
+                .where(OutboundMessage.next_attempt_at <= datetime.now(timezone.utc))
+                .order_by(OutboundMessage.next_attempt_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            for message in messages:
+                message.next_attempt_at = self._lease_until()
+                session.add(message)
+            message_ids = [message.id for message in messages]
+            session.commit()
+            return message_ids
+
+    def _record_success(
+        self, message_id: int, attempts: int, provider_message_id: str
+    ) -> None:
+        with SessionLocal() as session:
+            message = session.get(OutboundMessage, message_id)
+            message.status = MessageStatus.SENT
+            message.attempts = attempts
+            message.provider_message_id = provider_message_id
+            message.sent_at = datetime.now(timezone.utc)
+            message.last_error = None
+            if message.kind == "otp":
+                # Don't keep codes around once delivered
+                message.body = ""
+            session.add(message)
+            session.commit()
+
+    def _record_failure(
+        self,
+        message_id: int,
+        attempts: int,
+        error: str,
+        retry_in_seconds: Optional[float],
+    ) -> None:
+        with SessionLocal() as session:
+            message = session.get(OutboundMessage, message_id)
+            message.attempts = attempts
+            message.last_error = error[:500]
+            if retry_in_seconds is None:
+                message.status = MessageStatus.FAILED
+            else:
+                message.next_attempt_at = self._lease_until(retry_in_seconds)
+            session.add(message)
+            session.commit()
+
+
+# Singleton instance
+_sms_dispatcher: SMSDispatcher | None = None
+
+
+def get_sms_dispatcher() -> SMSDispatcher:
+    """Get or create the SMS dispatcher instance"""
+    global _sms_dispatcher
+    if _sms_dispatcher is None:
+        _sms_dispatcher = SMSDispatcher(
+            provider=get_sms_provider(),
+            workers=settings.sms_workers,
+            max_attempts=settings.sms_max_attempts,
+            retry_base_seconds=settings.sms_retry_base_seconds,
+            retry_max_seconds=settings.sms_retry_max_seconds,
+            lease_seconds=settings.sms_outbox_lease_seconds,
+        )
+    return _sms_dispatcher
+
+
+def purge_outbox() -> None:
+    """Periodic job: delete delivered and failed messages past retention"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.sms_outbox_retention_days)
+    with SessionLocal() as session:
+        session.exec(
+            delete(OutboundMessage)
+            .where(OutboundMessage.status != MessageStatus.PENDING)
+            .where(OutboundMessage.created_at < cutoff)
+        )
+        session.commit()
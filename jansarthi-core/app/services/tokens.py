@@ -0,0 +1,278 @@
+"""Refresh token rotation store with in-memory revocation checks"""
+
+import hashlib
+import math
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, text, update
+from sqlalchemy.engine import make_url
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import SessionLocal, async_engine
+from app.models.issue import RefreshToken
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+# Postgres channel notified (on commit) with the id of each revoked
+# family, so every worker adds it to its filter right away
+REVOCATION_CHANNEL = "refresh_token_revocations"
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, :family_id)")
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over string keys"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.num_bits = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter"""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RefreshTokenStore:
+    """
+    Tracks issued refresh tokens by jti and family
+
+    Every login starts a token family. Exchanging a refresh token marks it
+    used and issues the next token in the same family; presenting a used
+    token again is treated as theft and revokes the whole family.
+
+    The refresh_tokens table is the source of truth. Revoked family ids are
+    mirrored into a bloom filter so access checks on every request cost a
+    few hash lookups; only a (rare) filter hit is confirmed in the database.
+    The filter is rebuilt, and expired rows purged, by a periodic job.
+
+    On Postgres a revocation is also broadcast on REVOCATION_CHANNEL when
+    it commits, and every worker listening there adds it to its filter
+    immediately. Without the listener (another database, or while it
+    reconnects) other workers learn of it at the next sync, so access
+    tokens of the family keep working there for up to
+    REFRESH_TOKEN_SYNC_SECONDS.
+    """
+
+    def __init__(self, expected_revocations: int = 100_000):
+        self.expected_revocations = expected_revocations
+        self._revoked = BloomFilter(expected_revocations)
+        # Families revoked by this process since the last sync
+        self._recently_revoked: set[str] = set()
+        self._lock = threading.Lock()
+        self._listener: Any = None
+
+    def issue(
+        self, session: AsyncSession, user_id: int, family_id: Optional[str] = None
+    ) -> RefreshToken:
+        """
+        Record a new refresh token (added to the session, not committed)
+
+        Args:
+            session: Database session
+            user_id: User's ID
+            family_id: Family to continue, or None to start a new one
+
+        Returns:
+            RefreshToken: The new token record
+        """
+        token = RefreshToken(
+            jti=str(uuid.uuid4()),
+            family_id=family_id or str(uuid.uuid4()),
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.jwt_refresh_token_expire_days),
+        )
+        session.add(token)
+        return token
+
+    async def rotate(self, session: AsyncSession, jti: str, user_id: int) -> str:
+        """
+        Mark a refresh token as used so it can be exchanged for a new one
+
+        Args:
+            session: Database session
+            jti: Token ID of the presented refresh token
+            user_id: User the token was issued to
+
+        Returns:
+            str: Family ID to issue the next token in
+
+        Raises:
+            HTTPException: If the token is unknown, revoked or already used
+        """
+        result = await session.exec(
+            select(RefreshToken).where(RefreshToken.jti == jti).with_for_update()
+        )
+        token = result.first()
+
+        if token is None or token.user_id != user_id or token.revoked_at is not None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked. Please login again.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if token.used_at is not None:
+            # Reuse of a rotated token: someone else holds a copy
+            await self.revoke_family(session, token.family_id)
+            await session.commit()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token reuse detected. Please login again.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        token.used_at = datetime.now(timezone.utc)
+        session.add(token)
+        return token.family_id
+
+    async def revoke_family(self, session: AsyncSession, family_id: str) -> None:
+        """
+        Revoke every token in a family (not committed)
+
+        Args:
+            session: Database session
+            family_id: Family to revoke
+        """
+        await session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id)
+            .where(RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        if session.get_bind().dialect.name == "postgresql":
+            await session.exec(
+                _NOTIFY_SQL,
+                params={"channel": REVOCATION_CHANNEL, "family_id": family_id},
+            )
+        self.mark_revoked(family_id)
+
+    def mark_revoked(self, family_id: str) -> None:
+        """
+        Add a revoked family to the filter
+
+        Args:
+            family_id: Family revoked by this or another worker
+        """
+        with self._lock:
+            self._revoked.add(family_id)
+            self._recently_revoked.add(family_id)
+
+    async def is_revoked(self, session: AsyncSession, family_id: str) -> bool:
+        """
+        Check whether a token family has been revoked
+
+        Args:
+            session: Database session, only used to confirm filter hits
+            family_id: Family to check
+
+        Returns:
+            bool: True if the family is revoked
+        """
+        if family_id not in self._revoked:
+            return False
+
+        result = await session.exec(
+            select(RefreshToken.jti)
+            .where(RefreshToken.family_id == family_id)
+            .where(RefreshToken.revoked_at.is_not(None))
+            .limit(1)
+        )
+        return result.first() is not None
+
+    def sync(self, session: Session) -> None:
+        """
+        Purge expired tokens and rebuild the revocation filter from the table
+
+        Args:
+            session: Database session
+        """
+        now = datetime.now(timezone.utc)
+        session.exec(delete(RefreshToken).where(RefreshToken.expires_at < now))
+        session.commit()
+
+        revoked_families = session.exec(
+            select(RefreshToken.family_id)
+            .where(RefreshToken.revoked_at.is_not(None))
+            .distinct()
+        ).all()
+
+        revoked = BloomFilter(max(self.expected_revocations, 2 * len(revoked_families)))
+        for family_id in revoked_families:
+            revoked.add(family_id)
+
+        with self._lock:
+            # Keep local revocations that may have committed after the query
+            for family_id in self._recently_revoked:
+                revoked.add(family_id)
+            self._recently_revoked.clear()
+            self._revoked = revoked
+
+
+    async def listen(self) -> None:
+        """Follow revocations made by other workers, (re)connecting if needed"""
+        if async_engine.dialect.name != "postgresql":
+            return
+        if self._listener is not None and not self._listener.is_closed():
+            return
+        # The pooled connections can't keep a LISTEN open, use a dedicated one
+        import asyncpg
+
+        url = make_url(settings.async_database_url).set(drivername="postgresql")
+        try:
+            self._listener = await asyncpg.connect(url.render_as_string(hide_password=False))
+            await self._listener.add_listener(REVOCATION_CHANNEL, self._notified)
+        except Exception as e:
+            self._listener = None
+            print(f"Refresh token revocations falling back to periodic sync: {e}")
+
+    async def stop_listening(self) -> None:
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def _notified(self, connection, pid, channel, payload) -> None:
+        if payload:
+            self.mark_revoked(payload)
+
+
+# Singleton instance
+_refresh_token_store: RefreshTokenStore | None = None
+
+
+def get_refresh_token_store() -> RefreshTokenStore:
+    """Get or create the refresh token store instance"""
+    global _refresh_token_store
+    if _refresh_token_store is None:
+        _refresh_token_store = RefreshTokenStore()
+    return _refresh_token_store
+
+
+def sync_refresh_token_store() -> None:
+    """Periodic job: purge expired refresh tokens and reload revocations"""
+    with SessionLocal() as session:
+        get_refresh_token_store().sync(session)
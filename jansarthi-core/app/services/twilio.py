@@ -1,11 +1,9 @@
-"""Twilio service for sending OTP SMS"""
+"""Twilio SMS provider and OTP message helpers"""
 
 import random
 import re
-from datetime import datetime, timedelta
-
-from twilio.rest import Client
 
+from app.services.sms import SMSDeliveryError, SMSProvider
 from app.settings.config import get_settings
 
 settings = get_settings()
@@ -48,91 +46,85 @@ def normalize_phone_number(phone: str) -> str:
     return phone
 
 
-class TwilioService:
-    """Service for sending SMS via Twilio"""
+def generate_otp() -> str:
+    """Generate a random OTP code"""
+    otp = ''.join([str(random.randint(0, 9)) for _ in range(settings.otp_length)])
+    return otp
 
-    def __init__(self):
-        """Initialize Twilio client"""
-        self.client = Client(
-            settings.twilio_account_sid,
-            settings.twilio_auth_token
-        )
-        # Use your actual Twilio phone number
-        self.from_number = "+17248043746"
 
-    def generate_otp(self) -> str:
-        """Generate a random OTP code"""
-        otp = ''.join([str(random.randint(0, 9)) for _ in range(settings.otp_length)])
-        return otp
+def otp_message(otp_code: str) -> str:
+    """Build the OTP SMS body"""
+    return f"Your Jansarthi verification code is: {otp_code}\n\nThis code will expire in {settings.otp_expiry_minutes} minutes.\n\nDo not share this code with anyone."
+
+
+def welcome_message(name: str) -> str:
+    """Build the welcome SMS body"""
+    return f"Welcome to Jansarthi, {name}! 🎉\n\nThank you for joining us. You can now report civic issues in your area and help make your community better."
+
+
+class TwilioSMSProvider(SMSProvider):
+    """SMS provider backed by the Twilio REST API"""
+
+    name = "twilio"
 
-    def send_otp(self, to_number: str, otp_code: str) -> bool:
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        timeout_seconds: float,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+    ):
         """
-        Send OTP via SMS
-        
+        Initialize Twilio client
+
         Args:
-            to_number: Recipient phone number (will be normalized to E.164 format)
-            otp_code: OTP code to send
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            from_number: Sender number
+            timeout_seconds: Request timeout
+            pool_maxsize: Connections kept alive to the Twilio API, shared
+                by the SMS workers' threads
+            max_retries: Retries of requests that failed to connect; sends
+                that may have reached Twilio are never retried here
         """
-        try:
-            # Normalize phone number to E.164 format
-            normalized_number = normalize_phone_number(to_number)
-            
-            message_body = f"Your Jansarthi verification code is: {otp_code}\n\nThis code will expire in {settings.otp_expiry_minutes} minutes.\n\nDo not share this code with anyone."
-            
-            message = self.client.messages.create(
-                body=message_body,
-                from_=self.from_number,
-                to=normalized_number
-            )
-            
-            print(f"SMS sent successfully to {normalized_number}. SID: {message.sid}")
-            return True
-            
-        except Exception as e:
-            print(f"Error sending SMS to {to_number}: {str(e)}")
-            return False
+        # The twilio package is slow to import; load it on first use only
+        from twilio.http.http_client import TwilioHttpClient
+        from twilio.rest import Client
+        from urllib3.util import Retry
+
+        from app.services.http_pools import PooledHTTPAdapter
+
+        http_client = TwilioHttpClient(timeout=timeout_seconds)
+        http_client.session.mount(
+            "https://",
+            PooledHTTPAdapter(
+                "twilio",
+                pool_maxsize=pool_maxsize,
+                max_retries=Retry(total=max_retries, read=0, backoff_factor=0.2),
+            ),
+        )
+        self.client = Client(account_sid, auth_token, http_client=http_client)
+        self.from_number = from_number
 
-    def send_welcome_message(self, to_number: str, name: str) -> bool:
-        """
-        Send welcome message to new user
+    def send(self, to_number: str, body: str) -> str:
+        from twilio.base.exceptions import TwilioRestException
+
+        normalized_number = normalize_phone_number(to_number)
         
-        Args:
-            to_number: Recipient phone number (will be normalized to E.164 format)
-            name: User's name
-            
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
         try:
-            # Normalize phone number to E.164 format
-            normalized_number = normalize_phone_number(to_number)
-            
-            message_body = f"Welcome to Jansarthi, {name}! 🎉\n\nThank you for joining us. You can now report civic issues in your area and help make your community better."
-            
             message = self.client.messages.create(
-                body=message_body,
+                body=body,
                 from_=self.from_number,
                 to=normalized_number
             )
-            
-            print(f"Welcome SMS sent successfully to {normalized_number}. SID: {message.sid}")
-            return True
-            
+        except TwilioRestException as e:
+            # 4xx other than throttling means the request itself is bad
+            permanent = 400 <= e.status < 500 and e.status != 429
+            raise SMSDeliveryError(str(e), permanent=permanent) from e
         except Exception as e:
-            print(f"Error sending welcome SMS to {to_number}: {str(e)}")
-            return False
-
-
-# Singleton instance
-_twilio_service = None
-
-
-def get_twilio_service() -> TwilioService:
-    """Get Twilio service instance"""
-    global _twilio_service
-    if _twilio_service is None:
-        _twilio_service = TwilioService()
-    return _twilio_service
+            raise SMSDeliveryError(str(e)) from e
+        
+        print(f"SMS sent successfully to {normalized_number}. SID: {message.sid}")
+        return message.sid
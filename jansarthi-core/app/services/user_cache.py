@@ -0,0 +1,126 @@
+"""Short-lived in-process cache of the user fields needed for authentication"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.models.issue import User
+from app.settings.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Snapshot of the user fields checked on every authenticated request"""
+
+    id: int
+    name: str
+    mobile_number: str
+    is_active: bool
+    is_verified: bool
+    is_official: bool = False
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        """Build a snapshot from a User row"""
+        return cls(
+            id=user.id,
+            name=user.name,
+            mobile_number=user.mobile_number,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            is_official=user.is_official,
+        )
+
+
+class UserCache:
+    """Bounded LRU cache with a per-entry TTL, keyed by user id"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[float, CachedUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is turned on"""
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        """
+        Get a cached user if present and not expired
+
+        Args:
+            user_id: User's ID
+
+        Returns:
+            Optional[CachedUser]: Cached snapshot, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user: CachedUser) -> None:
+        """Store a user snapshot, evicting the least recently used entry if full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from the cache"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached users"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+_user_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache:
+    """Get or create the user cache instance"""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(
+            ttl_seconds=settings.user_cache_ttl_seconds,
+            max_size=settings.user_cache_max_size,
+        )
+    return _user_cache
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target: User) -> None:
+    """Invalidate the cached snapshot whenever a user row is flushed (verified, deactivated, renamed)"""
+    if target.id is not None:
+        get_user_cache().invalidate(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User) -> None:
+    """Invalidate the cached snapshot when a user row is deleted"""
+    if target.id is not None:
+        get_user_cache().invalidate(target.id)
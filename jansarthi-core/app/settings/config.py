@@ -10,6 +10,12 @@ MINIO_USER: str = os.getenv("MINIO_USER", "admin")
 MINIO_PASSWORD: str = os.getenv("MINIO_PASSWORD", "YourPassword123")
 MINIO_BUCKET: str = os.getenv("MINIO_BUCKET", "jansarthi-images")
 MINIO_SECURE: bool = os.getenv("MINIO_SECURE", "false").lower() == "true"
+# Sized for concurrent uploads from the default thread pool (up to 32 threads)
+MINIO_POOL_MAXSIZE: int = int(os.getenv("MINIO_POOL_MAXSIZE", "32"))
+MINIO_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("MINIO_CONNECT_TIMEOUT_SECONDS", "5"))
+MINIO_READ_TIMEOUT_SECONDS: float = float(os.getenv("MINIO_READ_TIMEOUT_SECONDS", "60"))
+MINIO_MAX_RETRIES: int = int(os.getenv("MINIO_MAX_RETRIES", "3"))
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "minio")  # "minio" or "memory"
 
 # PostgreSQL Configuration
 POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
@@ -23,29 +29,165 @@ POSTGRES_PORT: int = int(os.getenv("POSTGRES_PORT", "5432"))
 # Twilio Configuration
 TWILIO_ACCOUNT_SID: str = os.getenv("TWILIO_ACCOUNT_SID", "your_account_sid")
 TWILIO_AUTH_TOKEN: str = os.getenv("TWILIO_AUTH_TOKEN", "your_auth_token")
+TWILIO_FROM_NUMBER: str = os.getenv("TWILIO_FROM_NUMBER", "+17248043746")
+TWILIO_POOL_MAXSIZE: int = int(os.getenv("TWILIO_POOL_MAXSIZE", "10"))
+TWILIO_MAX_RETRIES: int = int(os.getenv("TWILIO_MAX_RETRIES", "2"))  # connection errors only
+
+# Outbound HTTP connection pools (MinIO, Twilio)
+HTTP_POOL_BLOCK: bool = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+HTTP_KEEPALIVE_IDLE_SECONDS: int = int(os.getenv("HTTP_KEEPALIVE_IDLE_SECONDS", "60"))  # 0 disables
+
+# SMS delivery
+SMS_PROVIDER: str = os.getenv("SMS_PROVIDER", "twilio")  # "twilio" or "fake"
+FAKE_SMS_LATENCY_MS: float = float(os.getenv("FAKE_SMS_LATENCY_MS", "0"))
+FAKE_SMS_FAILURE_RATE: float = float(os.getenv("FAKE_SMS_FAILURE_RATE", "0"))
+SMS_PROVIDER_TIMEOUT_SECONDS: float = float(os.getenv("SMS_PROVIDER_TIMEOUT_SECONDS", "5"))
+SMS_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("SMS_CIRCUIT_FAILURE_THRESHOLD", "5"))
+SMS_CIRCUIT_RESET_SECONDS: float = float(os.getenv("SMS_CIRCUIT_RESET_SECONDS", "30"))
+SMS_WORKERS: int = int(os.getenv("SMS_WORKERS", "8"))
+SMS_MAX_ATTEMPTS: int = int(os.getenv("SMS_MAX_ATTEMPTS", "5"))
+SMS_RETRY_BASE_SECONDS: float = float(os.getenv("SMS_RETRY_BASE_SECONDS", "2"))
+SMS_RETRY_MAX_SECONDS: float = float(os.getenv("SMS_RETRY_MAX_SECONDS", "300"))
+SMS_OTP_LATENCY_BUDGET_SECONDS: float = float(os.getenv("SMS_OTP_LATENCY_BUDGET_SECONDS", "3"))
+SMS_OUTBOX_POLL_SECONDS: int = int(os.getenv("SMS_OUTBOX_POLL_SECONDS", "10"))
+SMS_OUTBOX_LEASE_SECONDS: int = int(os.getenv("SMS_OUTBOX_LEASE_SECONDS", "60"))
+SMS_OUTBOX_RETENTION_DAYS: int = int(os.getenv("SMS_OUTBOX_RETENTION_DAYS", "7"))
+
+# Issue status notifications
+NOTIFICATIONS_ENABLED: bool = os.getenv("NOTIFICATIONS_ENABLED", "true").lower() == "true"
+NOTIFICATION_WINDOW_SECONDS: int = int(os.getenv("NOTIFICATION_WINDOW_SECONDS", "300"))
+NOTIFICATION_FLUSH_SECONDS: int = int(os.getenv("NOTIFICATION_FLUSH_SECONDS", "30"))
+NOTIFICATION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+NOTIFICATION_MAX_ITEMS: int = int(os.getenv("NOTIFICATION_MAX_ITEMS", "5"))  # issues listed per digest
+
+# Live map updates over WebSocket
+LIVE_UPDATES_ENABLED: bool = os.getenv("LIVE_UPDATES_ENABLED", "true").lower() == "true"
+LIVE_POLL_SECONDS: float = float(os.getenv("LIVE_POLL_SECONDS", "5"))  # fallback when LISTEN is unavailable
+LIVE_MAX_SUBSCRIPTIONS: int = int(os.getenv("LIVE_MAX_SUBSCRIPTIONS", "10000"))  # per worker
+LIVE_QUEUE_SIZE: int = int(os.getenv("LIVE_QUEUE_SIZE", "100"))  # pending messages per client
+
+# Response compression
+COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_CONTENT_TYPES: list[str] = [
+    content_type.strip()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,application/vnd.jansarthi.map+json,text/*",
+    ).split(",")
+    if content_type.strip()
+]
+GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))  # 1-9
+BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))  # 0-11, -1 disables brotli
+
+# Delta sync: changes made this long before a sync are sent again by the
+# next one, to catch transactions that committed after it ran
+SYNC_OVERLAP_SECONDS: float = float(os.getenv("SYNC_OVERLAP_SECONDS", "30"))
+
+# Event loop monitor
+LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+LOOP_MONITOR_INTERVAL_SECONDS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.25"))
+LOOP_STALL_THRESHOLD_SECONDS: float = float(os.getenv("LOOP_STALL_THRESHOLD_SECONDS", "0.1"))
 
 # JWT Configuration
 JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
-JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")  # HS256, ES256 or RS256
+JWT_KEYS_DIR: str | None = os.getenv("JWT_KEYS_DIR")  # <kid>.pem files, required for ES256/RS256
+JWT_ACTIVE_KID: str | None = os.getenv("JWT_ACTIVE_KID")  # defaults to the last kid in sort order
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60"))  # 1 hour
 JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "30"))  # 30 days
+REFRESH_TOKEN_SYNC_SECONDS: int = int(os.getenv("REFRESH_TOKEN_SYNC_SECONDS", "30"))  # revocation reload + purge interval
 
 # OTP Configuration
 OTP_EXPIRY_MINUTES: int = int(os.getenv("OTP_EXPIRY_MINUTES", "10"))  # 10 minutes
 OTP_LENGTH: int = 6
+OTP_STORE: str = os.getenv("OTP_STORE", "database")  # "database" or "memory" (single worker only)
+OTP_RETENTION_HOURS: int = int(os.getenv("OTP_RETENTION_HOURS", "24"))  # kept after expiry, then purged
+OTP_PURGE_INTERVAL_SECONDS: int = int(os.getenv("OTP_PURGE_INTERVAL_SECONDS", "600"))
+
+# Rate limiting
+RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+TRUST_PROXY_HEADERS: bool = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+OTP_SEND_LIMIT_PER_NUMBER: int = int(os.getenv("OTP_SEND_LIMIT_PER_NUMBER", "5"))
+OTP_SEND_LIMIT_PER_IP: int = int(os.getenv("OTP_SEND_LIMIT_PER_IP", "20"))
+OTP_SEND_WINDOW_SECONDS: int = int(os.getenv("OTP_SEND_WINDOW_SECONDS", "900"))  # 15 minutes
+OTP_VERIFY_LIMIT_PER_NUMBER: int = int(os.getenv("OTP_VERIFY_LIMIT_PER_NUMBER", "10"))
+OTP_VERIFY_LIMIT_PER_IP: int = int(os.getenv("OTP_VERIFY_LIMIT_PER_IP", "50"))
+OTP_VERIFY_WINDOW_SECONDS: int = int(os.getenv("OTP_VERIFY_WINDOW_SECONDS", "900"))  # 15 minutes
+
+# Authenticated user cache
+# Cached user fields are invalidated only in the worker that changes the user;
+# other workers may keep a deactivated user's access for up to this long.
+# Official-only actions re-read is_active/is_official from the database.
+USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))  # 0 disables the cache
+USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
 
 # Database URL
 DATABASE_URL: str = (
     f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
     f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
 )
+# Same database through asyncpg, used by request handlers
+ASYNC_DATABASE_URL: str = (
+    f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@"
+    f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
+)
+
+# Startup: "create" runs create_all (development), "check" only verifies
+# that the database is at the Alembic head revision
+STARTUP_MODE: str = os.getenv(
+    "STARTUP_MODE",
+    "create" if os.getenv("DEBUG", "true").lower() == "true" else "check",
+)
 
+# Connection pools (per engine, per worker process)
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 disables
+SLOW_QUERY_THRESHOLD_MS: int = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))  # 0 disables
+
+# Read replicas (comma-separated postgresql:// URLs), used by read-only endpoints
+DATABASE_REPLICA_URLS: list[str] = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+REPLICA_HEALTH_CHECK_SECONDS: int = int(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))  # 0 disables
+# Where read-your-writes pins are kept: "memory" (single worker only) or "redis" (REDIS_URL)
+READ_YOUR_WRITES_BACKEND: str = os.getenv("READ_YOUR_WRITES_BACKEND", "memory")
+
+
+# Issue partitions and archive
+PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+ARCHIVE_AFTER_MONTHS: int = int(os.getenv("ARCHIVE_AFTER_MONTHS", "12"))  # 0 disables
+ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
 
 class Settings:
     """Application settings"""
 
     # Database
     database_url: str = DATABASE_URL
+    async_database_url: str = ASYNC_DATABASE_URL
+    startup_mode: str = STARTUP_MODE
+    db_pool_size: int = DB_POOL_SIZE
+    db_max_overflow: int = DB_MAX_OVERFLOW
+    db_pool_timeout_seconds: float = DB_POOL_TIMEOUT_SECONDS
+    db_pool_recycle_seconds: int = DB_POOL_RECYCLE_SECONDS
+    db_statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS
+    slow_query_threshold_ms: int = SLOW_QUERY_THRESHOLD_MS
+    database_replica_urls: list[str] = DATABASE_REPLICA_URLS
+    replica_health_check_seconds: int = REPLICA_HEALTH_CHECK_SECONDS
+    replica_max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS
+    read_your_writes_seconds: int = READ_YOUR_WRITES_SECONDS
+    read_your_writes_backend: str = READ_YOUR_WRITES_BACKEND
+    partition_months_ahead: int = PARTITION_MONTHS_AHEAD
+    archive_after_months: int = ARCHIVE_AFTER_MONTHS
+    archive_batch_size: int = ARCHIVE_BATCH_SIZE
+    archive_interval_seconds: int = ARCHIVE_INTERVAL_SECONDS
 
     # MinIO/S3
     minio_endpoint: str = MINIO_ENDPOINT
@@ -53,6 +195,15 @@ class Settings:
     minio_password: str = MINIO_PASSWORD
     minio_bucket: str = MINIO_BUCKET
     minio_secure: bool = MINIO_SECURE
+    minio_pool_maxsize: int = MINIO_POOL_MAXSIZE
+    minio_connect_timeout_seconds: float = MINIO_CONNECT_TIMEOUT_SECONDS
+    minio_read_timeout_seconds: float = MINIO_READ_TIMEOUT_SECONDS
+    minio_max_retries: int = MINIO_MAX_RETRIES
+    storage_backend: str = STORAGE_BACKEND
+
+    # Outbound HTTP connection pools
+    http_pool_block: bool = HTTP_POOL_BLOCK
+    http_keepalive_idle_seconds: int = HTTP_KEEPALIVE_IDLE_SECONDS
 
     # Application
     app_name: str = "Jansarthi API"
@@ -67,16 +218,84 @@ class Settings:
     # Twilio
     twilio_account_sid: str = TWILIO_ACCOUNT_SID
     twilio_auth_token: str = TWILIO_AUTH_TOKEN
+    twilio_from_number: str = TWILIO_FROM_NUMBER
+    twilio_pool_maxsize: int = TWILIO_POOL_MAXSIZE
+    twilio_max_retries: int = TWILIO_MAX_RETRIES
+
+    # SMS delivery
+    sms_provider: str = SMS_PROVIDER
+    fake_sms_latency_ms: float = FAKE_SMS_LATENCY_MS
+    fake_sms_failure_rate: float = FAKE_SMS_FAILURE_RATE
+    sms_provider_timeout_seconds: float = SMS_PROVIDER_TIMEOUT_SECONDS
+    sms_circuit_failure_threshold: int = SMS_CIRCUIT_FAILURE_THRESHOLD
+    sms_circuit_reset_seconds: float = SMS_CIRCUIT_RESET_SECONDS
+    sms_workers: int = SMS_WORKERS
+    sms_max_attempts: int = SMS_MAX_ATTEMPTS
+    sms_retry_base_seconds: float = SMS_RETRY_BASE_SECONDS
+    sms_retry_max_seconds: float = SMS_RETRY_MAX_SECONDS
+    sms_otp_latency_budget_seconds: float = SMS_OTP_LATENCY_BUDGET_SECONDS
+    sms_outbox_poll_seconds: int = SMS_OUTBOX_POLL_SECONDS
+    sms_outbox_lease_seconds: int = SMS_OUTBOX_LEASE_SECONDS
+    sms_outbox_retention_days: int = SMS_OUTBOX_RETENTION_DAYS
+
+    # Issue status notifications
+    notifications_enabled: bool = NOTIFICATIONS_ENABLED
+    notification_window_seconds: int = NOTIFICATION_WINDOW_SECONDS
+    notification_flush_seconds: int = NOTIFICATION_FLUSH_SECONDS
+    notification_batch_size: int = NOTIFICATION_BATCH_SIZE
+    notification_max_items: int = NOTIFICATION_MAX_ITEMS
+
+    # Live map updates
+    live_updates_enabled: bool = LIVE_UPDATES_ENABLED
+    live_poll_seconds: float = LIVE_POLL_SECONDS
+    live_max_subscriptions: int = LIVE_MAX_SUBSCRIPTIONS
+    live_queue_size: int = LIVE_QUEUE_SIZE
+
+    # Response compression
+    compression_enabled: bool = COMPRESSION_ENABLED
+    compression_min_size: int = COMPRESSION_MIN_SIZE
+    compression_content_types: list[str] = COMPRESSION_CONTENT_TYPES
+    gzip_level: int = GZIP_LEVEL
+    brotli_quality: int = BROTLI_QUALITY
+
+    # Delta sync
+    sync_overlap_seconds: float = SYNC_OVERLAP_SECONDS
     
+    # Event loop monitor
+    loop_monitor_enabled: bool = LOOP_MONITOR_ENABLED
+    loop_monitor_interval_seconds: float = LOOP_MONITOR_INTERVAL_SECONDS
+    loop_stall_threshold_seconds: float = LOOP_STALL_THRESHOLD_SECONDS
+
     # JWT
     jwt_secret_key: str = JWT_SECRET_KEY
     jwt_algorithm: str = JWT_ALGORITHM
+    jwt_keys_dir: str | None = JWT_KEYS_DIR
+    jwt_active_kid: str | None = JWT_ACTIVE_KID
     jwt_access_token_expire_minutes: int = JWT_ACCESS_TOKEN_EXPIRE_MINUTES
     jwt_refresh_token_expire_days: int = JWT_REFRESH_TOKEN_EXPIRE_DAYS
+    refresh_token_sync_seconds: int = REFRESH_TOKEN_SYNC_SECONDS
     
     # OTP
     otp_expiry_minutes: int = OTP_EXPIRY_MINUTES
     otp_length: int = OTP_LENGTH
+    otp_store: str = OTP_STORE
+    otp_retention_hours: int = OTP_RETENTION_HOURS
+    otp_purge_interval_seconds: int = OTP_PURGE_INTERVAL_SECONDS
+
+    # Rate limiting
+    rate_limit_backend: str = RATE_LIMIT_BACKEND
+    redis_url: str = REDIS_URL
+    trust_proxy_headers: bool = TRUST_PROXY_HEADERS
+    otp_send_limit_per_number: int = OTP_SEND_LIMIT_PER_NUMBER
+    otp_send_limit_per_ip: int = OTP_SEND_LIMIT_PER_IP
+    otp_send_window_seconds: int = OTP_SEND_WINDOW_SECONDS
+    otp_verify_limit_per_number: int = OTP_VERIFY_LIMIT_PER_NUMBER
+    otp_verify_limit_per_ip: int = OTP_VERIFY_LIMIT_PER_IP
+    otp_verify_window_seconds: int = OTP_VERIFY_WINDOW_SECONDS
+
+    # Authenticated user cache
+    user_cache_ttl_seconds: int = USER_CACHE_TTL_SECONDS
+    user_cache_max_size: int = USER_CACHE_MAX_SIZE
 
 
 @lru_cache()
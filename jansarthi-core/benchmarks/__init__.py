@@ -0,0 +1 @@
+"""Benchmarks for Jansarthi Core"""
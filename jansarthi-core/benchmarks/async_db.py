@@ -0,0 +1,162 @@
+"""
+Load test: request throughput with blocking vs async database access
+
+Serves the same handler two ways inside one event loop, as a single
+uvicorn worker would:
+
+- sync:  an ``async def`` route querying through the psycopg2 Session
+         (how the report routes used to work; each query blocks the loop)
+- async: the same queries through the asyncpg AsyncSession
+
+Each request runs the "my reports" page query (count + 20 newest issues
+with photos), optionally preceded by ``pg_sleep`` to emulate the round
+trip to a remote database. Clients are driven in-process through
+httpx's ASGI transport at each concurrency level. Only throughput is
+reported: with the loop blocked, in-process clients can't even start
+timing a request, so per-request latencies would flatter the sync mode.
+
+Needs a migrated Postgres reachable through the POSTGRES_* settings. A
+throwaway user and its issues are created and removed again.
+
+Usage:
+    python -m benchmarks.async_db [--requests 2000] [--db-latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, text
+from sqlalchemy.orm import selectinload
+from sqlmodel import func, select
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.models.issue import Issue, IssueType, User
+
+BENCH_MOBILE_NUMBER = "+910000000000"
+
+
+def build_app(user_id: int, db_latency_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    def page_queries():
+        count_query = select(func.count()).select_from(Issue).where(
+            Issue.user_id == user_id
+        )
+        page_query = (
+            select(Issue)
+            .where(Issue.user_id == user_id)
+            .options(selectinload(Issue.photos))
+            .order_by(Issue.created_at.desc())
+            .limit(20)
+        )
+        return count_query, page_query
+
+    @app.get("/sync")
+    async def sync_page():
+        count_query, page_query = page_queries()
+        with SessionLocal() as session:
+            if db_latency_seconds:
+                session.exec(text(f"SELECT pg_sleep({db_latency_seconds})"))
+            total = session.exec(count_query).one()
+            issues = session.exec(page_query).all()
+        return {"total": total, "items": len(issues)}
+
+    @app.get("/async")
+    async def async_page():
+        count_query, page_query = page_queries()
+        async with AsyncSessionLocal() as session:
+            if db_latency_seconds:
+                await session.exec(text(f"SELECT pg_sleep({db_latency_seconds})"))
+            total = (await session.exec(count_query)).one()
+            issues = (await session.exec(page_query)).all()
+        return {"total": total, "items": len(issues)}
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, requests: int, concurrency: int) -> None:
+    remaining = requests
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            response = await client.get(path)
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{path.strip('/'):<6} {concurrency:>11} {requests / elapsed:>9.0f} "
+        f"{elapsed:>9.2f}"
+    )
+
+
+def seed(issues: int) -> int:
+    with SessionLocal() as session:
+        user = User(name="Bench User", mobile_number=BENCH_MOBILE_NUMBER, is_verified=True)
+        session.add(user)
+        session.commit()
+        session.add_all(
+            Issue(
+                issue_type=IssueType.ROAD,
+                description="Benchmark issue, safe to delete",
+                latitude=28.6,
+                longitude=77.2,
+                user_id=user.id,
+            )
+            for _ in range(issues)
+        )
+        session.commit()
+        return user.id
+
+
+def cleanup() -> None:
+    with SessionLocal() as session:
+        user_id = session.exec(
+            select(User.id).where(User.mobile_number == BENCH_MOBILE_NUMBER)
+        ).first()
+        if user_id is not None:
+            session.exec(delete(Issue).where(Issue.user_id == user_id))
+            session.exec(delete(User).where(User.id == user_id))
+            session.commit()
+
+
+async def run(requests: int, concurrency_levels: list[int], db_latency_ms: float) -> None:
+    cleanup()
+    user_id = seed(200)
+    try:
+        app = build_app(user_id, db_latency_ms / 1000)
+        print(f"{'mode':<6} {'concurrency':>11} {'req/s':>9} {'total s':>9}")
+        for concurrency in concurrency_levels:
+            for path in ("/sync", "/async"):
+                await drive(app, path, requests, concurrency)
+    finally:
+        cleanup()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs async database throughput")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    parser.add_argument(
+        "--db-latency-ms",
+        type=float,
+        default=5,
+        help="Extra server-side delay per request (pg_sleep), 0 to disable",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.concurrency, args.db_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: moving a batch of issues to a new status
+
+Compares, for batches of 1,000 issues:
+
+- per-issue: load each issue through the ORM, set its status, add an
+             audit row and append its event, one flush per issue (how a
+             loop over the single update would work)
+- set-based: ``update_issue_statuses``, which locks and reads the batch
+             with one query, then runs one UPDATE and one multi-row
+             INSERT each for the audit rows and the events
+
+Both write the same rows: the status, an audit row and a status_changed
+event per issue, in a single transaction per batch on the asyncpg
+session.
+
+Runs against a throwaway database (a temporary cluster, or a database
+created on --server), migrated with `alembic upgrade head` and removed
+afterwards, so the event feed of a real database isn't touched.
+
+Usage:
+    python -m benchmarks.bulk_status [--batch-size 1000] [--rounds 5]
+        [--server postgresql://user:pw@host:5432]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.endpoints import ephemeral_postgres, migrate, throwaway_database
+
+
+def seed(issues: int) -> tuple[int, list[int]]:
+    from app.database import SessionLocal
+    from app.models.issue import Issue, IssueType, User
+
+    with SessionLocal() as session:
+        user = User(
+            name="Bench Official",
+            mobile_number="+910000000001",
+            is_verified=True,
+            is_official=True,
+        )
+        session.add(user)
+        session.commit()
+        batch = [
+            Issue(
+                issue_type=IssueType.ROAD,
+                description="Benchmark issue for status updates",
+                latitude=28.6,
+                longitude=77.2,
+                user_id=user.id,
+            )
+            for _ in range(issues)
+        ]
+        session.add_all(batch)
+        session.commit()
+        return user.id, [issue.id for issue in batch]
+
+
+async def per_issue(issue_ids: list[int], to_status, user_id: int) -> None:
+    from app.database import AsyncSessionLocal
+    from app.models.issue import Issue, IssueEventType, IssueStatusChange
+    from app.services.issue_events import append_events
+
+    async with AsyncSessionLocal() as session:
+        for issue_id in issue_ids:
+            issue = await session.get(Issue, issue_id, with_for_update=True)
+            session.add(
+                IssueStatusChange(
+                    issue_id=issue_id,
+                    from_status=issue.status,
+                    to_status=to_status,
+                    changed_by=user_id,
+                )
+            )
+            await append_events(session, [{
+                "issue_id": issue_id,
+                "event_type": IssueEventType.STATUS_CHANGED,
+                "actor_id": user_id,
+                "data": {"from": issue.status.value, "to": to_status.value},
+            }])
+            issue.status = to_status
+            await session.flush()
+        await session.commit()
+
+
+async def set_based(issue_ids: list[int], to_status, user_id: int) -> None:
+    from app.database import AsyncSessionLocal
+    from app.services.issue_status import update_issue_statuses
+
+    async with AsyncSessionLocal() as session:
+        result = await update_issue_statuses(session, issue_ids, to_status, user_id)
+    assert len(result.updated) == len(issue_ids), result.rejected
+
+
+async def run(batch_size: int, rounds: int) -> None:
+    from app.database import async_engine
+    from app.models.issue import IssueStatus
+
+    user_id, issue_ids = seed(batch_size)
+    try:
+        # Each round moves the batch forward and back again, so every
+        # update is a valid transition
+        there_and_back = [IssueStatus.PRADHAN_CHECK, IssueStatus.REPORTED]
+        print(f"{'mode':<10} {'batch':>6} {'median ms':>10} {'issues/s':>9}")
+        for name, apply in (("per-issue", per_issue), ("set-based", set_based)):
+            timings = []
+            for _ in range(rounds):
+                for to_status in there_and_back:
+                    start = time.perf_counter()
+                    await apply(issue_ids, to_status, user_id)
+                    timings.append(time.perf_counter() - start)
+            median = statistics.median(timings)
+            print(f"{name:<10} {batch_size:>6} {median * 1000:>10.1f} {batch_size / median:>9.0f}")
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk issue status updates")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--server",
+        help="Existing Postgres server URL to create a throwaway database on, "
+        "instead of starting a cluster",
+    )
+    args = parser.parse_args()
+
+    stand_in = throwaway_database(args.server) if args.server else ephemeral_postgres()
+    with stand_in as postgres_environment:
+        os.environ.update(postgres_environment)
+        # Keep digests of the benchmark's status changes out of the SMS outbox
+        os.environ["NOTIFICATIONS_ENABLED"] = "false"
+        if "app.settings.config" in sys.modules:
+            raise SystemExit("The app was imported before its settings were applied")
+        migrate()
+        asyncio.run(run(args.batch_size, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: response compression CPU cost against bytes saved
+
+Compresses typical response bodies at a range of gzip levels and brotli
+qualities, with the compressor CompressionMiddleware uses, and reports
+the compressed size, bytes saved and CPU time per response:
+
+- list:     a full page (100 issues with photos) of GET /api/reports
+- map:      GET /api/reports/map with 5,000 issues, as objects
+- columnar: the same map issues in the columnar encoding
+
+Usage:
+    python -m benchmarks.compression [--map-issues 5000] [--rounds 20]
+"""
+
+import argparse
+import importlib.util
+import statistics
+import time
+
+from app.services.compression import _Compressor
+from app.services.serialization import (
+    FastJSONResponse,
+    columnar_map,
+    issue_rows,
+    map_issue_rows,
+)
+from benchmarks.map_encoding import make_rows
+from benchmarks.serialization import PassThroughStorage, make_issues
+
+LEVELS = {
+    "gzip": (1, 4, 6, 9),
+    "br": (0, 2, 4, 6, 9, 11),
+}
+
+
+def bodies(map_issues: int) -> dict[str, bytes]:
+    page = {"total": 100, "page": 1, "page_size": 100, "total_pages": 1}
+    items = issue_rows(make_issues(100), PassThroughStorage())
+    rows = make_rows(map_issues, radius_km=10.0, seed=1)
+    return {
+        "list": FastJSONResponse({"items": items, **page}).body,
+        "map": FastJSONResponse(map_issue_rows(rows)).body,
+        "columnar": FastJSONResponse(columnar_map(rows)).body,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response compression levels")
+    parser.add_argument("--map-issues", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("brotli") is None:
+        print("brotli is not installed, skipping it")
+        del LEVELS["br"]
+
+    print(f"{'body':<9} {'encoding':<8} {'level':>5} {'bytes':>9} {'saved':>7} {'CPU ms':>8}")
+    for name, body in bodies(args.map_issues).items():
+        print(f"{name:<9} {'identity':<8} {'':>5} {len(body):>9} {'':>7} {'':>8}")
+        for encoding, levels in LEVELS.items():
+            for level in levels:
+                timings = []
+                for _ in range(args.rounds):
+                    start = time.process_time()
+                    compressed = _Compressor(encoding, level).compress(body, final=True)
+                    timings.append(time.process_time() - start)
+                saved = 1 - len(compressed) / len(body)
+                print(
+                    f"{name:<9} {encoding:<8} {level:>5} {len(compressed):>9} "
+                    f"{saved:>6.1%} {statistics.median(timings) * 1000:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
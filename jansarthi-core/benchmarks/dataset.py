@@ -0,0 +1,642 @@
+"""
+Synthetic city-scale data: users, OTPs, issues and issue photos
+
+Generates realistic-looking rows and bulk loads them into the database
+the app is configured for (POSTGRES_* settings):
+
+- towns:  placed around CENTER, the biggest at CENTER itself, with
+          Zipf-like populations; issues cluster around them with a
+          spread that grows with the town
+- users:  living in a town, a few of them officials; most issues come
+          from a small share of active reporters
+- issues: types weighted per town, more of them in later months (as
+          users join) and during the day, statuses advanced according
+          to their age
+- photos: zero to three per issue, pointing at a small pool of fake
+          JPEG objects (uploaded to storage with --upload-photos)
+- OTPs:   codes sent in the last two days, most of them used
+
+Rows depend only on the parameters, --seed and --end (a fixed date by
+default), so two loads with the same arguments are identical, ids
+included, and benchmark runs against them can be compared. Each table
+draws from its own random stream, so changing --otps doesn't change
+the issues.
+
+On Postgres rows are loaded with COPY, after creating the monthly
+partitions they fall in; elsewhere (sqlite) with bulk inserts. The
+tables must be empty, or pass --truncate to empty them first (this also
+removes refresh tokens, status changes, events and archived issues).
+
+Usage:
+    python -m benchmarks.dataset [--users 100000] [--issues 1000000]
+        [--otps 50000] [--towns 30] [--months 24] [--seed 1]
+        [--end 2026-10-01] [--truncate] [--upload-photos]
+"""
+
+import argparse
+import csv
+import io
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+# The biggest town; the endpoint benchmark queries the map here
+CENTER = (28.6139, 77.2090)
+
+# Towns are placed up to this far from CENTER
+REGION_RADIUS_KM = 150.0
+
+DEFAULT_END = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+KM_PER_DEGREE = 111.32
+
+# Columns loaded per table, in row tuple order
+COLUMNS = {
+    "users": (
+        "id", "name", "mobile_number", "is_active", "is_verified", "is_official",
+        "created_at", "updated_at",
+    ),
+    "otps": (
+        "id", "mobile_number", "otp_code", "is_used", "attempt_count", "expires_at",
+        "created_at", "used_at",
+    ),
+    "issues": (
+        "id", "issue_type", "description", "latitude", "longitude", "status", "user_id",
+        "created_at", "updated_at",
+    ),
+    "issue_photos": (
+        "id", "issue_id", "photo_url", "filename", "file_size", "content_type", "created_at",
+    ),
+}
+
+# Emptied by --truncate: the generated tables and those referring to them
+TRUNCATE_TABLES = (
+    "users",
+    "otps",
+    "issues",
+    "issue_photos",
+    "issues_archive",
+    "issue_photos_archive",
+    "issue_status_changes",
+    "issue_events",
+    "refresh_tokens",
+)
+
+TYPE_WEIGHTS = {"road": 0.32, "garbage": 0.28, "water": 0.24, "electricity": 0.16}
+
+# Mean days to reach each status after the previous one, and the share of
+# issues that ever get there
+STATUS_STEPS = (
+    ("pradhan_check", 4.0, 0.92),
+    ("started_working", 12.0, 0.8),
+    ("finished_work", 20.0, 0.85),
+)
+
+# Photos per issue
+PHOTO_COUNT_WEIGHTS = (0.2, 0.45, 0.25, 0.1)
+
+OTP_EXPIRY = timedelta(minutes=10)
+
+FIRST_NAMES = (
+    "Aarav", "Aditi", "Amit", "Ananya", "Anil", "Arjun", "Deepak", "Divya", "Gaurav",
+    "Geeta", "Harish", "Kavita", "Komal", "Manoj", "Meena", "Mohit", "Neha", "Nikhil",
+    "Pooja", "Pradeep", "Priya", "Rahul", "Rajesh", "Ramesh", "Rekha", "Rohit", "Sanjay",
+    "Seema", "Shivani", "Sunil", "Sunita", "Suresh", "Vikas", "Vinod", "Yash",
+)
+LAST_NAMES = (
+    "Bhatt", "Bisht", "Chauhan", "Gupta", "Jain", "Joshi", "Kumar", "Mehta", "Negi",
+    "Pandey", "Rana", "Rawat", "Sharma", "Singh", "Tiwari", "Verma", "Yadav",
+)
+TOWN_PREFIXES = (
+    "Ram", "Shiv", "Krishna", "Lakshmi", "Hari", "Ganga", "Durga", "Indra", "Surya",
+    "Chandra", "Shanti", "Bhim", "Raj", "Dev", "Mohan", "Anand",
+)
+TOWN_SUFFIXES = ("pur", "nagar", "garh", "abad", "ganj", "puram", "kot", "khera", "wadi")
+
+PLACES = (
+    "the main market", "the bus stand", "the primary school", "the temple",
+    "the health centre", "the panchayat office", "the railway crossing",
+    "the water tank", "the post office", "the community hall", "the bank",
+    "the mosque", "the park", "the police chowki", "the ration shop",
+)
+DESCRIPTIONS = {
+    "water": (
+        "No water supply near {place} in ward {ward} for {days} days",
+        "Pipeline leaking near {place}, water is being wasted on the road",
+        "Dirty water coming from the taps in ward {ward} since last week",
+        "Hand pump near {place} is broken and people are fetching water from far",
+        "Very low water pressure in ward {ward}, upper floors get nothing",
+    ),
+    "electricity": (
+        "Street lights not working near {place} for {days} days",
+        "Transformer near {place} sparks every evening, it is dangerous",
+        "Power cuts of several hours every day in ward {ward}",
+        "Electric pole leaning near {place}, wires are hanging low",
+        "Loose wires at the junction near {place} after the storm",
+    ),
+    "road": (
+        "Big potholes on the road near {place}, two wheelers keep falling",
+        "Road in ward {ward} broken for {days} days, vehicles cannot pass",
+        "Waterlogging near {place} after every rain, the drain is blocked",
+        "Speed breaker near {place} has no paint and causes accidents",
+        "Road construction near {place} left unfinished, rubble everywhere",
+    ),
+    "garbage": (
+        "Garbage not collected near {place} for {days} days",
+        "Overflowing dustbin near {place}, stray animals spread the waste",
+        "People burning garbage in ward {ward} every morning",
+        "Drain near {place} choked with plastic, bad smell in the area",
+        "Dead animal lying near {place}, nobody has removed it",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Parameters that fully determine a generated dataset"""
+
+    users: int = 100_000
+    issues: int = 1_000_000
+    otps: int = 50_000
+    towns: int = 30
+    months: int = 24
+    seed: int = 1
+    end: datetime = DEFAULT_END
+    photo_objects: int = 48
+
+    @property
+    def start(self) -> datetime:
+        return self.end - timedelta(days=30.4 * self.months)
+
+    def random(self, stream: str) -> random.Random:
+        """Independent random stream for one kind of row"""
+        return random.Random(f"{self.seed}:{stream}")
+
+
+@dataclass(frozen=True)
+class Town:
+    name: str
+    latitude: float
+    longitude: float
+    # Standard deviation of issue locations around the centre
+    spread_km: float
+    population: float
+    type_weights: tuple[float, ...]
+
+
+def _offset(latitude: float, longitude: float, north_km: float, east_km: float) -> tuple[float, float]:
+    return (
+        latitude + north_km / KM_PER_DEGREE,
+        longitude + east_km / (KM_PER_DEGREE * math.cos(math.radians(latitude))),
+    )
+
+
+def make_towns(spec: DatasetSpec) -> list[Town]:
+    """Towns with Zipf-like populations, the biggest at CENTER"""
+    rng = spec.random("towns")
+    towns = []
+    names = set()
+    for rank in range(1, spec.towns + 1):
+        population = 1 / rank ** 1.1
+        if rank == 1:
+            latitude, longitude = CENTER
+        else:
+            distance = REGION_RADIUS_KM * math.sqrt(rng.random())
+            bearing = rng.uniform(0, 2 * math.pi)
+            latitude, longitude = _offset(
+                *CENTER, distance * math.cos(bearing), distance * math.sin(bearing)
+            )
+        name = rng.choice(TOWN_PREFIXES) + rng.choice(TOWN_SUFFIXES)
+        while name in names:
+            name = rng.choice(TOWN_PREFIXES) + rng.choice(TOWN_SUFFIXES) + f" {rank}"
+        names.add(name)
+        towns.append(Town(
+            name=name,
+            latitude=latitude,
+            longitude=longitude,
+            spread_km=1.0 + 7.0 * math.sqrt(population),
+            population=population,
+            type_weights=tuple(weight * rng.uniform(0.6, 1.4) for weight in TYPE_WEIGHTS.values()),
+        ))
+    return towns
+
+
+@dataclass
+class Users:
+    """Generated user rows, and what issues need to know about their authors"""
+
+    rows: list[tuple]
+    # User ids living in each town, by town index
+    by_town: list[list[int]]
+    created_at: list[datetime]
+
+
+def make_users(spec: DatasetSpec, towns: list[Town]) -> Users:
+    rng = spec.random("users")
+    weights = [town.population for town in towns]
+    users = Users(rows=[], by_town=[[] for _ in towns], created_at=[])
+    # Sign-ups start a few months before the first issue
+    first = spec.start - timedelta(days=90)
+    span = (spec.end - first).total_seconds()
+    for user_id in range(1, spec.users + 1):
+        town = rng.choices(range(len(towns)), weights)[0]
+        created_at = first + timedelta(seconds=span * rng.random())
+        updated_at = created_at + timedelta(seconds=rng.randrange(600))
+        users.rows.append((
+            user_id,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"+9170{user_id:08d}",
+            rng.random() < 0.99,
+            rng.random() < 0.95,
+            rng.random() < 0.002,
+            created_at,
+            updated_at,
+        ))
+        users.by_town[town].append(user_id)
+        users.created_at.append(created_at)
+    # Every town needs someone to report its issues
+    for town, members in enumerate(users.by_town):
+        if not members:
+            members.append(rng.randrange(1, spec.users + 1))
+    return users
+
+
+def make_otps(spec: DatasetSpec, users: Users) -> list[tuple]:
+    rng = spec.random("otps")
+    rows = []
+    window = timedelta(days=2).total_seconds()
+    for otp_id in range(1, spec.otps + 1):
+        if users.rows and rng.random() < 0.9:
+            mobile_number = rng.choice(users.rows)[2]
+        else:
+            # Numbers that never finished signing up
+            mobile_number = f"+9180{rng.randrange(10 ** 8):08d}"
+        created_at = spec.end - timedelta(seconds=window * rng.random())
+        is_used = rng.random() < 0.75
+        rows.append((
+            otp_id,
+            mobile_number,
+            f"{rng.randrange(10 ** 6):06d}",
+            is_used,
+            rng.choices((0, 1, 2, 3), (0.1, 0.75, 0.1, 0.05))[0] if is_used else rng.randrange(4),
+            created_at + OTP_EXPIRY,
+            created_at,
+            created_at + timedelta(seconds=rng.uniform(5, 300)) if is_used else None,
+        ))
+    return rows
+
+
+def make_photo_objects(spec: DatasetSpec) -> dict[str, bytes]:
+    """Small JPEGs standing in for uploaded photos, by object name"""
+    from PIL import Image, ImageDraw
+
+    rng = spec.random("photo_objects")
+    objects = {}
+    for index in range(spec.photo_objects):
+        image = Image.new("RGB", (640, 480), tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(24):
+            x, y = rng.randrange(640), rng.randrange(480)
+            draw.rectangle(
+                (x, y, x + rng.randrange(20, 200), y + rng.randrange(20, 160)),
+                fill=tuple(rng.randrange(256) for _ in range(3)),
+            )
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=80)
+        objects[f"seed/photo-{index:03d}.jpg"] = buffer.getvalue()
+    return objects
+
+
+def _status(rng: random.Random, age_days: float) -> tuple[str, float]:
+    """Status an issue of this age has reached, and days from report to its last change"""
+    status, changed_days, elapsed = "reported", 0.0, 0.0
+    for step, mean_days, share in STATUS_STEPS:
+        if rng.random() >= share:
+            break
+        elapsed += rng.expovariate(1 / mean_days)
+        if elapsed > age_days:
+            break
+        status, changed_days = step, elapsed
+    return status, changed_days
+
+
+def issue_batches(
+    spec: DatasetSpec,
+    towns: list[Town],
+    users: Users,
+    photo_objects: dict[str, int],
+    batch_size: int,
+) -> Iterator[tuple[list[tuple], list[tuple]]]:
+    """
+    Generate issues and their photos, a batch at a time
+
+    Args:
+        spec: Dataset parameters
+        towns: From make_towns
+        users: From make_users
+        photo_objects: Photo object names and their sizes in bytes
+        batch_size: Issues per batch
+
+    Returns:
+        Iterator of (issue rows, photo rows) per batch
+    """
+    rng = spec.random("issues")
+    types = tuple(TYPE_WEIGHTS)
+    town_weights = [town.population for town in towns]
+    object_names = sorted(photo_objects)
+    photo_id = 0
+    issues: list[tuple] = []
+    photos: list[tuple] = []
+    for issue_id in range(1, spec.issues + 1):
+        town_index = rng.choices(range(len(towns)), town_weights)[0]
+        town = towns[town_index]
+        # A few active reporters write most of a town's issues
+        members = users.by_town[town_index]
+        user_id = members[int(len(members) * rng.random() ** 3)]
+
+        # Reported after the author signed up, so months get busier as
+        # users join; mostly during the day
+        earliest = max(spec.start, users.created_at[user_id - 1])
+        span_days = max((spec.end - earliest).total_seconds() / 86400, 1.0)
+        day = earliest + timedelta(days=int(span_days * rng.random()))
+        day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        hours = min(max(rng.gauss(13, 3.5), 0), 23.99)
+        created_at = day + timedelta(hours=hours, microseconds=rng.randrange(10 ** 6))
+        created_at = min(max(created_at, earliest), spec.end - timedelta(seconds=1))
+
+        issue_type = rng.choices(types, town.type_weights)[0]
+        age_days = (spec.end - created_at).total_seconds() / 86400
+        status, elapsed_days = _status(rng, age_days)
+        updated_at = min(created_at + timedelta(days=elapsed_days), spec.end)
+
+        latitude, longitude = _offset(
+            town.latitude,
+            town.longitude,
+            rng.gauss(0, town.spread_km),
+            rng.gauss(0, town.spread_km),
+        )
+        description = rng.choice(DESCRIPTIONS[issue_type]).format(
+            place=rng.choice(PLACES), ward=rng.randint(1, 40), days=rng.randint(2, 20)
+        ) + f", {town.name}"
+        issues.append((
+            issue_id,
+            issue_type,
+            description,
+            round(latitude, 6),
+            round(longitude, 6),
+            status,
+            user_id,
+            created_at,
+            updated_at,
+        ))
+
+        photo_count = rng.choices(range(len(PHOTO_COUNT_WEIGHTS)), PHOTO_COUNT_WEIGHTS)[0]
+        for n in range(photo_count):
+            photo_id += 1
+            object_name = rng.choice(object_names)
+            # Same created_at as the issue, so both land in the same partition
+            photos.append((
+                photo_id,
+                issue_id,
+                object_name,
+                f"IMG_{created_at:%Y%m%d}_{n + 1}.jpg",
+                photo_objects[object_name],
+                "image/jpeg",
+                created_at,
+            ))
+
+        if len(issues) >= batch_size:
+            yield issues, photos
+            issues, photos = [], []
+    if issues:
+        yield issues, photos
+
+
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _Loader:
+    """Writes row tuples to a table, with COPY on Postgres and bulk inserts elsewhere"""
+
+    def __init__(self, engine):
+        from sqlmodel import SQLModel
+
+        self.engine = engine
+        self.postgres = engine.dialect.name == "postgresql"
+        self.tables = SQLModel.metadata.tables
+
+    def load(self, table: str, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        columns = COLUMNS[table]
+        if self.postgres:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([_csv_value(value) for value in row])
+            buffer.seek(0)
+            connection = self.engine.raw_connection()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                        buffer,
+                    )
+                connection.commit()
+            finally:
+                connection.close()
+        else:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    self.tables[table].insert(), [dict(zip(columns, row)) for row in rows]
+                )
+
+    def prepare(self, spec: DatasetSpec, truncate: bool) -> None:
+        """Empty the tables if asked, check they are empty, and create partitions"""
+        from sqlalchemy import text
+
+        from app.services.archive import PARTITIONED_TABLES, month_start, partition_name
+
+        with self.engine.begin() as connection:
+            if truncate:
+                if self.postgres:
+                    connection.execute(text(
+                        f"TRUNCATE {', '.join(TRUNCATE_TABLES)} RESTART IDENTITY CASCADE"
+                    ))
+                else:
+                    for table in reversed(TRUNCATE_TABLES):
+                        connection.execute(text(f"DELETE FROM {table}"))
+            for table in COLUMNS:
+                if connection.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first():
+                    raise SystemExit(f"{table} is not empty; pass --truncate to empty it")
+            if not self.postgres:
+                return
+            partitioned = set(connection.execute(text(
+                "SELECT c.relname FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid"
+            )).scalars())
+            for table in PARTITIONED_TABLES:
+                # Created by create_all rather than the migration
+                if table not in partitioned:
+                    continue
+                month = month_start(spec.start)
+                while month < spec.end:
+                    connection.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+                        f"PARTITION OF {table} FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{month_start(month, 1).isoformat()}')"
+                    ))
+                    month = month_start(month, 1)
+
+    def finish(self) -> None:
+        """Move id sequences past the loaded ids and refresh planner statistics"""
+        from sqlalchemy import text
+
+        with self.engine.begin() as connection:
+            if self.postgres:
+                for table in COLUMNS:
+                    connection.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT max(id) FROM {table}))"
+                    ))
+            for table in COLUMNS:
+                connection.execute(text(f"ANALYZE {table}"))
+
+
+def upload_photo_objects(objects: dict[str, bytes]) -> None:
+    """Put the fake photos in the configured storage under their fixed names"""
+    from app.services.storage import MemoryStorageService, get_storage_service
+
+    storage = get_storage_service()
+    for object_name, data in objects.items():
+        if isinstance(storage, MemoryStorageService):
+            storage.objects[object_name] = (data, "image/jpeg")
+        else:
+            storage.client.put_object(
+                bucket_name=storage.bucket_name,
+                object_name=object_name,
+                data=io.BytesIO(data),
+                length=len(data),
+                content_type="image/jpeg",
+            )
+
+
+def load_dataset(
+    spec: DatasetSpec,
+    truncate: bool = False,
+    upload_photos: bool = False,
+    batch_size: int = 50_000,
+) -> dict[str, int]:
+    """
+    Generate a dataset and load it into the app's database
+
+    Args:
+        spec: Dataset parameters
+        truncate: Empty the tables first
+        upload_photos: Also put the fake photo objects in storage
+        batch_size: Issues generated and loaded at a time
+
+    Returns:
+        dict[str, int]: Rows loaded per table
+    """
+    from app.database import engine
+
+    loader = _Loader(engine)
+    loader.prepare(spec, truncate)
+    counts = {}
+
+    def timed(table: str, load) -> None:
+        start = time.perf_counter()
+        rows = load()
+        elapsed = time.perf_counter() - start
+        counts[table] = counts.get(table, 0) + rows
+        print(f"{table:<13} {rows:>10} rows {elapsed:>8.1f} s {rows / elapsed if elapsed else 0:>10.0f} rows/s")
+
+    objects = make_photo_objects(spec)
+    if upload_photos:
+        upload_photo_objects(objects)
+        print(f"Uploaded {len(objects)} photo objects")
+
+    towns = make_towns(spec)
+    users = make_users(spec, towns)
+
+    def load(table: str, rows: list[tuple]) -> int:
+        loader.load(table, rows)
+        return len(rows)
+
+    timed("users", lambda: load("users", users.rows))
+    timed("otps", lambda: load("otps", make_otps(spec, users)))
+
+    sizes = {object_name: len(data) for object_name, data in objects.items()}
+    batches = issue_batches(spec, towns, users, sizes, batch_size)
+    issue_count = photo_count = 0
+    start = time.perf_counter()
+    for issues, photos in batches:
+        loader.load("issues", issues)
+        loader.load("issue_photos", photos)
+        issue_count += len(issues)
+        photo_count += len(photos)
+        print(f"  {issue_count}/{spec.issues} issues", end="\r", flush=True)
+    elapsed = time.perf_counter() - start
+    counts["issues"], counts["issue_photos"] = issue_count, photo_count
+    print(
+        f"\r{'issues':<13} {issue_count:>10} rows {elapsed:>8.1f} s "
+        f"{(issue_count + photo_count) / elapsed if elapsed else 0:>10.0f} rows/s "
+        f"(with {photo_count} photos)"
+    )
+
+    loader.finish()
+    return counts
+
+
+def _date(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Load a synthetic city-scale dataset")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--issues", type=int, default=1_000_000)
+    parser.add_argument("--otps", type=int, default=50_000)
+    parser.add_argument("--towns", type=int, default=30)
+    parser.add_argument("--months", type=int, default=24, help="of issue history")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--end",
+        type=_date,
+        default=DEFAULT_END,
+        help="Date the history ends (UTC, YYYY-MM-DD); fixed by default so loads repeat",
+    )
+    parser.add_argument("--photo-objects", type=int, default=48, help="distinct fake photos")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="issues per COPY")
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first")
+    parser.add_argument(
+        "--upload-photos", action="store_true", help="Put the fake photos in storage"
+    )
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(
+        users=args.users,
+        issues=args.issues,
+        otps=args.otps,
+        towns=args.towns,
+        months=args.months,
+        seed=args.seed,
+        end=args.end,
+        photo_objects=args.photo_objects,
+    )
+    load_dataset(spec, args.truncate, args.upload_photos, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
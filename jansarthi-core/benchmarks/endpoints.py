@@ -0,0 +1,435 @@
+"""
+Benchmark: throughput and latency of the main API endpoints
+
+Runs the FastAPI app in-process (lifespan included) and drives it through
+httpx's ASGI transport, against local stand-ins:
+
+- Postgres: a throwaway cluster started with initdb/pg_ctl from the
+            local PostgreSQL install, or a throwaway database on the
+            server given with --server. Either way the schema is built
+            with `alembic upgrade head` and removed afterwards.
+- MinIO:    MemoryStorageService (STORAGE_BACKEND=memory)
+- Twilio:   FakeSMSProvider (SMS_PROVIDER=fake); OTPs are read back from it
+
+Each endpoint is run in turn, with --requests requests and --concurrency
+in flight at a time. Later steps use what earlier ones created:
+
+    signup, verify_otp, create_issue (with photos), list, map, get_issue
+
+With --dataset-issues the database is first loaded with a synthetic
+city-scale dataset (see benchmarks/dataset.py), the same for every run
+with the same seed, so list and map are measured against realistic
+table sizes rather than only the issues created here.
+
+Throughput and p50/p95/p99 latency per endpoint are printed and written
+as JSON, with the git commit, so runs can be diffed between commits.
+
+Usage:
+    python -m benchmarks.endpoints [--requests 300] [--concurrency 10]
+        [--photos 2] [--photo-kb 200] [--dataset-issues 0]
+        [--server postgresql://user:pw@host:5432] [--output endpoints-<commit>.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
+
+from benchmarks.dataset import CENTER, DatasetSpec, load_dataset
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Settings for the app under test, applied before it is imported
+APP_ENVIRONMENT = {
+    "DEBUG": "false",
+    "STARTUP_MODE": "check",
+    "SMS_PROVIDER": "fake",
+    "STORAGE_BACKEND": "memory",
+    "NOTIFICATIONS_ENABLED": "false",
+    # Keep the dataset's old finished issues out of the archive
+    "ARCHIVE_AFTER_MONTHS": "0",
+    "OTP_SEND_LIMIT_PER_NUMBER": "1000000",
+    "OTP_SEND_LIMIT_PER_IP": "1000000",
+    "OTP_VERIFY_LIMIT_PER_NUMBER": "1000000",
+    "OTP_VERIFY_LIMIT_PER_IP": "1000000",
+}
+
+_OTP_PATTERN = re.compile(r"code is: (\d+)")
+
+
+def _postgres_bin(name: str) -> str:
+    found = shutil.which(name)
+    if found:
+        return found
+    try:
+        bindir = subprocess.run(
+            ["pg_config", "--bindir"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        bindir = ""
+    candidate = Path(bindir) / name
+    if not candidate.exists():
+        raise SystemExit(
+            f"{name} not found; install PostgreSQL or pass --server to use a running one"
+        )
+    return str(candidate)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def ephemeral_postgres() -> Iterator[dict[str, str]]:
+    """Start a throwaway cluster in a temporary directory, yielding POSTGRES_* settings"""
+    workdir = Path(tempfile.mkdtemp(prefix="jansarthi-bench-"))
+    data_dir = workdir / "data"
+    port = _free_port()
+    pg_ctl = _postgres_bin("pg_ctl")
+    subprocess.run(
+        [_postgres_bin("initdb"), "-D", str(data_dir), "-U", "postgres", "-A", "trust"],
+        check=True,
+        capture_output=True,
+    )
+    options = (
+        f"-p {port} -k {workdir} -c listen_addresses=127.0.0.1 "
+        "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+    )
+    subprocess.run(
+        [pg_ctl, "-D", str(data_dir), "-o", options, "-l", str(workdir / "postgres.log"), "-w", "start"],
+        check=True,
+        capture_output=True,
+    )
+    try:
+        yield {
+            "POSTGRES_HOST": "127.0.0.1",
+            "POSTGRES_PORT": str(port),
+            "POSTGRES_USER": "postgres",
+            "POSTGRES_PASSWORD": "",
+            "POSTGRES_DATABASE": "postgres",
+        }
+    finally:
+        subprocess.run(
+            [pg_ctl, "-D", str(data_dir), "-m", "immediate", "stop"], capture_output=True
+        )
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@contextmanager
+def throwaway_database(server_url: str) -> Iterator[dict[str, str]]:
+    """Create a database on an existing server, yielding POSTGRES_* settings"""
+    import psycopg2
+    from sqlalchemy.engine import make_url
+
+    url = make_url(server_url)
+    database = f"jansarthi_bench_{uuid.uuid4().hex[:8]}"
+    connect = {
+        "host": url.host or "localhost",
+        "port": url.port or 5432,
+        "user": url.username or "postgres",
+        "password": url.password or "",
+        "dbname": url.database or "postgres",
+    }
+
+    def execute(statement: str) -> None:
+        connection = psycopg2.connect(**connect)
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(statement)
+        finally:
+            connection.close()
+
+    execute(f'CREATE DATABASE "{database}"')
+    try:
+        yield {
+            "POSTGRES_HOST": connect["host"],
+            "POSTGRES_PORT": str(connect["port"]),
+            "POSTGRES_USER": connect["user"],
+            "POSTGRES_PASSWORD": connect["password"],
+            "POSTGRES_DATABASE": database,
+        }
+    finally:
+        execute(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)')
+
+
+def migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_DIR / "alembic"))
+    command.upgrade(config, "head")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def measure(
+    requests: list[Callable[[], Awaitable]], concurrency: int
+) -> tuple[dict, list]:
+    """
+    Run request callables with bounded concurrency
+
+    Returns:
+        tuple[dict, list]: Summary statistics, and the responses in order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def timed(request):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await request()
+            except Exception as e:
+                latencies.append(time.perf_counter() - start)
+                key = type(e).__name__
+                errors[key] = errors.get(key, 0) + 1
+                return None
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                key = str(response.status_code)
+                errors[key] = errors.get(key, 0) + 1
+            return response
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(timed(request) for request in requests))
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    summary = {
+        "requests": len(requests),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(requests) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+    return summary, responses
+
+
+async def run(args, database: str) -> dict:
+    import httpx
+
+    from app.main import app
+    from app.services.sms import get_sms_provider
+
+    generator = random.Random(args.seed)
+    photo = generator.randbytes(args.photo_kb * 1024)
+    results: dict[str, dict] = {}
+
+    def report(name: str, summary: dict) -> None:
+        results[name] = summary
+        errors = sum(summary["errors"].values())
+        print(
+            f"{name:<13} {summary['requests']:>6} {errors:>6} {summary['throughput_rps']:>9} "
+            f"{summary['p50_ms']:>8} {summary['p95_ms']:>8} {summary['p99_ms']:>8}"
+        )
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'endpoint':<13} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+            numbers = [f"+9190{index:08d}" for index in range(args.requests)]
+            sent = get_sms_provider().provider.sent
+            otps = {}
+
+            async def signup(number: str):
+                response = await client.post(
+                    "/api/auth/signup", json={"name": "Bench User", "mobile_number": number}
+                )
+                # The OTP is delivered before signup returns; the fake
+                # provider only keeps recent messages, so read it now
+                for to_number, body in reversed(sent):
+                    if to_number == number:
+                        otps[number] = _OTP_PATTERN.search(body).group(1)
+                        break
+                return response
+
+            summary, _ = await measure(
+                [lambda number=number: signup(number) for number in numbers],
+                args.concurrency,
+            )
+            report("signup", summary)
+
+            summary, responses = await measure(
+                [
+                    lambda number=number: client.post(
+                        "/api/auth/verify-otp",
+                        json={"mobile_number": number, "otp_code": otps.get(number, "000000")},
+                    )
+                    for number in numbers
+                ],
+                args.concurrency,
+            )
+            report("verify_otp", summary)
+            headers = [
+                {"Authorization": f"Bearer {response.json()['access_token']}"}
+                for response in responses
+                if response is not None and response.status_code == 200
+            ]
+            if not headers:
+                raise SystemExit("No user could sign in; see the errors above")
+
+            def create(index: int):
+                return client.post(
+                    "/api/reports",
+                    data={
+                        "issue_type": ("water", "electricity", "road", "garbage")[index % 4],
+                        "description": f"Benchmark issue {index}, reported for load testing",
+                        "latitude": str(CENTER[0] + generator.uniform(-0.05, 0.05)),
+                        "longitude": str(CENTER[1] + generator.uniform(-0.05, 0.05)),
+                    },
+                    files=[
+                        ("photos", (f"photo{n}.jpg", photo, "image/jpeg"))
+                        for n in range(args.photos)
+                    ],
+                    headers=headers[index % len(headers)],
+                )
+
+            summary, responses = await measure(
+                [lambda index=index: create(index) for index in range(args.requests)],
+                args.concurrency,
+            )
+            report("create_issue", summary)
+            issue_ids = [
+                response.json()["id"]
+                for response in responses
+                if response is not None and response.status_code == 201
+            ] or [1]
+
+            summary, _ = await measure(
+                [
+                    lambda index=index: client.get(
+                        "/api/reports",
+                        params={"page_size": 20},
+                        headers=headers[index % len(headers)],
+                    )
+                    for index in range(args.requests)
+                ],
+                args.concurrency,
+            )
+            report("list", summary)
+
+            summary, _ = await measure(
+                [
+                    lambda: client.get(
+                        "/api/reports/map",
+                        params={"latitude": CENTER[0], "longitude": CENTER[1], "radius": 10},
+                    )
+                    for _ in range(args.requests)
+                ],
+                args.concurrency,
+            )
+            report("map", summary)
+
+            summary, _ = await measure(
+                [
+                    lambda issue_id=generator.choice(issue_ids): client.get(
+                        f"/api/reports/{issue_id}"
+                    )
+                    for _ in range(args.requests)
+                ],
+                args.concurrency,
+            )
+            report("get_issue", summary)
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database,
+        "parameters": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "photos": args.photos,
+            "photo_kb": args.photo_kb,
+            "dataset_issues": args.dataset_issues,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API endpoint benchmark")
+    parser.add_argument("--requests", type=int, default=300, help="per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--photos", type=int, default=2, help="per created issue")
+    parser.add_argument("--photo-kb", type=int, default=200)
+    parser.add_argument(
+        "--dataset-issues",
+        type=int,
+        default=0,
+        help="Issues in a synthetic dataset loaded first (with a user per 10 issues)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--server",
+        help="Existing Postgres server URL to create a throwaway database on, "
+        "instead of starting a cluster",
+    )
+    parser.add_argument("--output", help="JSON results file (default: endpoints-<commit>.json)")
+    args = parser.parse_args()
+
+    database = "server" if args.server else "ephemeral cluster"
+    stand_in = throwaway_database(args.server) if args.server else ephemeral_postgres()
+    with stand_in as postgres_environment:
+        os.environ.update(APP_ENVIRONMENT)
+        os.environ.update(postgres_environment)
+        if "app.settings.config" in sys.modules:
+            raise SystemExit("The app was imported before its settings were applied")
+        migrate()
+        if args.dataset_issues:
+            load_dataset(
+                DatasetSpec(
+                    users=max(args.dataset_issues // 10, 1),
+                    issues=args.dataset_issues,
+                    otps=max(args.dataset_issues // 40, 1),
+                    seed=args.seed,
+                ),
+                upload_photos=True,
+            )
+        report = asyncio.run(run(args, database))
+
+    output = Path(args.output or f"endpoints-{report['commit'][:12]}.json")
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: JWT sign and verify throughput per algorithm
+
+Generates throwaway keys for each algorithm, points a KeyRing at them and
+times AuthService-style signing and verification through python-jose.
+
+Usage:
+    python -m benchmarks.jwt_algorithms [--iterations 2000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from app.services.keys import KeyRing
+
+
+def write_key(keys_dir: Path, kid: str, private_key) -> None:
+    """Write a private key as <kid>.pem"""
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    (keys_dir / f"{kid}.pem").write_bytes(pem)
+
+
+def make_key_ring(algorithm: str, keys_dir: Path) -> KeyRing:
+    """Create a key ring for the algorithm, generating a key if needed"""
+    if algorithm.startswith("ES"):
+        write_key(keys_dir, "bench-es", ec.generate_private_key(ec.SECP256R1()))
+        return KeyRing(algorithm, "", str(keys_dir), "bench-es")
+    if algorithm.startswith("RS"):
+        write_key(
+            keys_dir,
+            "bench-rs",
+            rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        )
+        return KeyRing(algorithm, "", str(keys_dir), "bench-rs")
+    return KeyRing(algorithm, "bench-secret-key")
+
+
+def bench(algorithm: str, iterations: int, keys_dir: Path) -> tuple[float, float]:
+    """Return (signs per second, verifies per second)"""
+    key_ring = make_key_ring(algorithm, keys_dir)
+    claims = {
+        "user_id": 1,
+        "mobile_number": "+919876543210",
+        "token_type": "access",
+        "exp": int(time.time()) + 3600,
+    }
+
+    kid, signing_key = key_ring.signing_key()
+    headers = {"kid": kid} if kid else None
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        token = jwt.encode(claims, signing_key, algorithm=algorithm, headers=headers)
+    sign_rate = iterations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        header_kid = jwt.get_unverified_header(token).get("kid")
+        jwt.decode(token, key_ring.verification_key(header_kid), algorithms=[algorithm])
+    verify_rate = iterations / (time.perf_counter() - start)
+
+    return sign_rate, verify_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT algorithm benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<10} {'sign/s':>10} {'verify/s':>10}")
+    for algorithm in ("HS256", "ES256", "RS256"):
+        with tempfile.TemporaryDirectory() as keys_dir:
+            sign_rate, verify_rate = bench(algorithm, args.iterations, Path(keys_dir))
+        print(f"{algorithm:<10} {sign_rate:>10.0f} {verify_rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: map payload size and client decode time, objects vs columnar
+
+Generates issues scattered within ``--radius`` km of a point (seeded, so
+runs are comparable) and encodes them the two ways /api/reports/map can
+answer:
+
+- objects:  the default JSON array with one object per issue
+- columnar: the application/vnd.jansarthi.map+json payload
+
+For each it reports the body size, raw and gzipped, and the time to decode
+it back into a list of issue dicts the way a client would (json.loads,
+plus undoing the delta and enum encoding for columnar). The columnar
+round trip is checked against the originals to COORDINATE_PRECISION.
+
+Usage:
+    python -m benchmarks.map_encoding [--issues 50000] [--rounds 10]
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import statistics
+import time
+
+from app.models.issue import IssueStatus, IssueType
+from app.services.serialization import (
+    COORDINATE_PRECISION,
+    FastJSONResponse,
+    columnar_map,
+    map_issue_rows,
+)
+
+CENTER = (28.6139, 77.2090)
+
+
+def make_rows(count: int, radius_km: float, seed: int) -> list[tuple]:
+    generator = random.Random(seed)
+    issue_types = list(IssueType)
+    statuses = list(IssueStatus)
+    rows = []
+    for issue_id in range(1, count + 1):
+        distance = radius_km * math.sqrt(generator.random()) / 111.32
+        angle = generator.random() * 2 * math.pi
+        latitude = CENTER[0] + distance * math.sin(angle)
+        longitude = CENTER[1] + distance * math.cos(angle) / math.cos(math.radians(CENTER[0]))
+        rows.append(
+            (
+                issue_id,
+                generator.choice(issue_types),
+                latitude,
+                longitude,
+                generator.choice(statuses),
+            )
+        )
+    return rows
+
+
+def decode_objects(body: bytes) -> list[dict]:
+    return json.loads(body)
+
+
+def decode_columnar(body: bytes) -> list[dict]:
+    payload = json.loads(body)
+    scale = 10 ** payload["precision"]
+    issue_types, statuses = payload["issue_types"], payload["statuses"]
+    issues = []
+    issue_id = latitude = longitude = 0
+    for id_delta, type_code, latitude_delta, longitude_delta, status_code in zip(
+        payload["id"],
+        payload["issue_type"],
+        payload["latitude"],
+        payload["longitude"],
+        payload["status"],
+    ):
+        issue_id += id_delta
+        latitude += latitude_delta
+        longitude += longitude_delta
+        issues.append(
+            {
+                "id": issue_id,
+                "issue_type": issue_types[type_code],
+                "latitude": latitude / scale,
+                "longitude": longitude / scale,
+                "status": statuses[status_code],
+            }
+        )
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Map payload encodings")
+    parser.add_argument("--issues", type=int, default=50_000)
+    parser.add_argument("--radius", type=float, default=10.0, help="km")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = make_rows(args.issues, args.radius, args.seed)
+    encodings = {
+        "objects": (FastJSONResponse(map_issue_rows(rows)).body, decode_objects),
+        "columnar": (FastJSONResponse(columnar_map(rows)).body, decode_columnar),
+    }
+
+    objects = decode_objects(encodings["objects"][0])
+    tolerance = 0.5 / 10**COORDINATE_PRECISION + 1e-12
+    for expected, actual in zip(objects, decode_columnar(encodings["columnar"][0])):
+        assert expected["id"] == actual["id"]
+        assert expected["issue_type"] == actual["issue_type"]
+        assert expected["status"] == actual["status"]
+        assert abs(expected["latitude"] - actual["latitude"]) <= tolerance
+        assert abs(expected["longitude"] - actual["longitude"]) <= tolerance
+
+    print(f"{args.issues} issues within {args.radius:g} km")
+    print(f"{'encoding':<9} {'bytes':>10} {'gzip bytes':>11} {'decode ms':>10}")
+    for name, (body, decode) in encodings.items():
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            decode(body)
+            timings.append(time.perf_counter() - start)
+        gzipped = len(gzip.compress(body, compresslevel=6))
+        print(
+            f"{name:<9} {len(body):>10} {gzipped:>11} "
+            f"{statistics.median(timings) * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
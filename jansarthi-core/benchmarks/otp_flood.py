@@ -0,0 +1,130 @@
+"""
+Load test: OTP endpoint rate limiting under a flood of requests
+
+Without --url, drives the rate limiter in-process with three flood
+patterns and reports how many requests get through and the cost per
+check. With --url, floods a running server's /api/auth/resend-otp and
+counts status codes (point it at a deployment with a fake SMS provider).
+
+Usage:
+    python -m benchmarks.otp_flood [--requests 100000]
+    python -m benchmarks.otp_flood --url http://localhost:8000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import collections
+import time
+
+from fastapi import HTTPException
+
+import app.services.rate_limit as rate_limit
+from app.services.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    enforce_otp_send_limit,
+)
+
+
+class FakeRequest:
+    """Just enough of a Starlette request for client_ip()"""
+
+    class Client:
+        def __init__(self, host: str):
+            self.host = host
+
+    def __init__(self, host: str):
+        self.client = self.Client(host)
+        self.headers: dict[str, str] = {}
+
+
+async def flood(name: str, requests: int, pick) -> None:
+    """Send `requests` OTP sends where pick(i) returns (ip, mobile_number)"""
+    rate_limit._rate_limiter = RateLimiter(InMemoryRateLimitBackend())
+    allowed = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        ip, mobile_number = pick(i)
+        try:
+            await enforce_otp_send_limit(FakeRequest(ip), mobile_number)
+            allowed += 1
+        except HTTPException:
+            pass
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<32} {requests:>8} {allowed:>8} {requests - allowed:>8} "
+        f"{elapsed / requests * 1e6:>8.2f}"
+    )
+
+
+async def run_in_process(requests: int) -> None:
+    print(f"{'pattern':<32} {'sent':>8} {'allowed':>8} {'429':>8} {'us/req':>8}")
+    await flood(
+        "one number, one IP",
+        requests,
+        lambda i: ("203.0.113.7", "+919876543210"),
+    )
+    await flood(
+        "one IP, many numbers",
+        requests,
+        lambda i: ("203.0.113.7", f"+9198{i % 100000:08d}"),
+    )
+    await flood(
+        "one number, many IPs",
+        requests,
+        lambda i: (f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", "+919876543210"),
+    )
+    await flood(
+        "distinct users (legitimate)",
+        requests,
+        lambda i: (f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", f"+9198{i:08d}"),
+    )
+
+
+async def run_against_server(url: str, requests: int, concurrency: int) -> None:
+    import httpx
+
+    counts: collections.Counter = collections.Counter()
+    retry_after: list[int] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker(client: httpx.AsyncClient):
+        while not queue.empty():
+            queue.get_nowait()
+            response = await client.post(
+                "/api/auth/resend-otp", json={"mobile_number": "+919876543210"}
+            )
+            counts[response.status_code] += 1
+            if "retry-after" in response.headers:
+                retry_after.append(int(response.headers["retry-after"]))
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(f"sent {requests} requests in {elapsed:.2f}s ({requests / elapsed:.0f} req/s)")
+    for code, count in sorted(counts.items()):
+        print(f"  HTTP {code}: {count}")
+    if retry_after:
+        print(f"  Retry-After range: {min(retry_after)}-{max(retry_after)}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTP rate limit flood test")
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--url", help="Flood a running server instead")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(run_against_server(args.url, args.requests, args.concurrency))
+    else:
+        asyncio.run(run_in_process(args.requests))
+
+
+if __name__ == "__main__":
+    main()
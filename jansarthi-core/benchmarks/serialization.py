@@ -0,0 +1,143 @@
+"""
+Benchmark: CPU to serialize issue list and map responses
+
+Builds in-memory issues (two photos each) and times, per 1,000 issues:
+
+- pydantic: the previous route code, building IssueListResponse from the
+            ORM objects (or returning map rows as is) and letting FastAPI
+            validate it against the route's response_model and dump it
+- orjson:   copying the rows into the serialization dataclasses and
+            rendering a FastJSONResponse, as the map and sync routes do
+            (the list route now renders dicts of the selected columns,
+            see app/services/issue_fields.py)
+
+Both produce the same JSON, which is checked before timing. Photo URLs
+are passed through unchanged so presigning doesn't dominate.
+
+Usage:
+    python -m benchmarks.serialization [--issues 1000] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from fastapi.routing import serialize_response
+
+from app.models.issue import Issue, IssuePhoto, IssueStatus, IssueType
+from app.routes.reports import reports_router
+from app.schemas.issue import IssueListResponse
+from app.services.serialization import FastJSONResponse, issue_rows, map_issue_rows
+
+MapRow = namedtuple("MapRow", "id issue_type latitude longitude status")
+
+
+class PassThroughStorage:
+    def get_file_url(self, object_name: str) -> str:
+        return object_name
+
+
+def make_issues(count: int) -> list[Issue]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    issues = []
+    for i in range(count):
+        created_at = start + timedelta(minutes=i, microseconds=i)
+        issue = Issue(
+            id=i + 1,
+            issue_type=list(IssueType)[i % len(IssueType)],
+            description=f"Benchmark issue number {i} with a typical description",
+            latitude=28.6 + i * 1e-4,
+            longitude=77.2 - i * 1e-4,
+            status=list(IssueStatus)[i % len(IssueStatus)],
+            user_id=1,
+            created_at=created_at,
+            updated_at=created_at + timedelta(hours=1),
+        )
+        issue.photos = [
+            IssuePhoto(
+                id=i * 2 + n + 1,
+                issue_id=i + 1,
+                photo_url=f"issues/{i + 1}/{n}.jpg",
+                filename=f"photo_{n}.jpg",
+                file_size=204_800,
+                content_type="image/jpeg",
+                created_at=created_at,
+            )
+            for n in range(2)
+        ]
+        issues.append(issue)
+    return issues
+
+
+def response_field(path: str):
+    for route in reports_router.routes:
+        if route.path == path and "GET" in getattr(route, "methods", ()):
+            return route.response_field
+    raise LookupError(path)
+
+
+async def run(count: int, rounds: int) -> None:
+    issues = make_issues(count)
+    map_rows = [
+        MapRow(issue.id, issue.issue_type, issue.latitude, issue.longitude, issue.status)
+        for issue in issues
+    ]
+    storage = PassThroughStorage()
+    list_field = response_field("/api/reports")
+    map_field = response_field("/api/reports/map")
+    page = {"total": count, "page": 1, "page_size": count, "total_pages": 1}
+
+    async def list_pydantic() -> bytes:
+        for issue in issues:
+            for photo in issue.photos:
+                photo.photo_url = storage.get_file_url(photo.photo_url)
+        content = IssueListResponse(items=issues, **page)
+        return await serialize_response(
+            field=list_field, response_content=content, dump_json=True
+        )
+
+    async def list_orjson() -> bytes:
+        return FastJSONResponse({"items": issue_rows(issues, storage), **page}).body
+
+    async def map_pydantic() -> bytes:
+        return await serialize_response(
+            field=map_field, response_content=map_rows, dump_json=True
+        )
+
+    async def map_orjson() -> bytes:
+        return FastJSONResponse(map_issue_rows(map_rows)).body
+
+    cases = (
+        ("list", list_pydantic, list_orjson),
+        ("map", map_pydantic, map_orjson),
+    )
+    for name, before, after in cases:
+        assert json.loads(await before()) == json.loads(await after()), name
+
+    print(f"{'endpoint':<9} {'mode':<9} {'CPU ms/1k':>10} {'bytes':>9}")
+    for name, before, after in cases:
+        for mode, render in (("pydantic", before), ("orjson", after)):
+            timings = []
+            for _ in range(rounds):
+                start = time.process_time()
+                body = await render()
+                timings.append(time.process_time() - start)
+            per_thousand = statistics.median(timings) * 1000 * 1000 / count
+            print(f"{name:<9} {mode:<9} {per_thousand:>10.2f} {len(body):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Issue response serialization")
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.issues, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
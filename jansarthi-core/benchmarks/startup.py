@@ -0,0 +1,121 @@
+"""
+Benchmark: worker startup time
+
+Measures, in fresh interpreters:
+
+- import: ``import app.main`` timed with ``-X importtime``, with the
+          slowest third-party packages listed
+- lifespan: running the app's startup and shutdown once with
+          ``STARTUP_MODE=create`` (create_all) and ``STARTUP_MODE=check``
+          (Alembic revision check); needs a migrated Postgres reachable
+          through the POSTGRES_* settings
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--top 10] [--lifespan]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LIFESPAN_SCRIPT = """
+import asyncio, time
+start = time.perf_counter()
+from app.main import app, lifespan
+async def run():
+    async with lifespan(app):
+        print(f"ready {time.perf_counter() - start:.6f}", flush=True)
+asyncio.run(run())
+"""
+
+
+def run_python(args: list[str], env: dict | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=CORE_DIR,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time(runs: int, top: int) -> None:
+    totals = []
+    by_package: dict[str, list[int]] = defaultdict(list)
+    for _ in range(runs):
+        result = run_python(["-X", "importtime", "-c", "import app.main"])
+        run_packages: dict[str, int] = {}
+        lines = [
+            line[len("import time:"):].split("|")
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "cumulative" not in line
+        ]
+        # Modules are listed after the imports they trigger; walking the
+        # list backwards gives each module's importers before it
+        importers: list[str] = []
+        for _, cumulative, name in reversed(lines):
+            depth = (len(name) - len(name.lstrip())) // 2
+            module = name.strip()
+            package = module.split(".")[0]
+            if module == "app.main":
+                totals.append(int(cumulative))
+            del importers[depth:]
+            # Count a package where it's first entered from another one
+            if package not in importers:
+                run_packages[package] = run_packages.get(package, 0) + int(cumulative)
+            importers.append(package)
+        for package, microseconds in run_packages.items():
+            by_package[package].append(microseconds)
+
+    print(f"import app.main: median {statistics.median(totals) / 1000:.0f}ms over {runs} runs")
+    print(f"{'package':<24} {'ms':>8}")
+    slowest = sorted(
+        by_package.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    slowest = [(package, samples) for package, samples in slowest if package != "app"]
+    for package, samples in slowest[:top]:
+        print(f"{package:<24} {statistics.median(samples) / 1000:>8.1f}")
+
+
+def lifespan_time(runs: int) -> None:
+    print(f"\n{'startup mode':<14} {'ready ms':>9} {'process ms':>11}")
+    for mode in ("create", "check"):
+        ready, process = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = run_python(["-c", LIFESPAN_SCRIPT], {"STARTUP_MODE": mode})
+            process.append(time.perf_counter() - start)
+            for line in result.stdout.splitlines():
+                if line.startswith("ready "):
+                    ready.append(float(line.split()[1]))
+        print(
+            f"{mode:<14} {statistics.median(ready) * 1000:>9.0f} "
+            f"{statistics.median(process) * 1000:>11.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    parser.add_argument(
+        "--lifespan",
+        action="store_true",
+        help="Also time app startup per STARTUP_MODE (needs Postgres)",
+    )
+    args = parser.parse_args()
+
+    import_time(args.runs, args.top)
+    if args.lifespan:
+        lifespan_time(args.runs)
+
+
+if __name__ == "__main__":
+    main()